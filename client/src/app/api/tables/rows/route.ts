@@ -0,0 +1,44 @@
+import { NextResponse } from "next/server";
+
+export async function POST(request: Request) {
+  try {
+    const backendUrl = process.env.BACKEND_URL;
+
+    if (!backendUrl) {
+      return NextResponse.json(
+        {
+          error: "Backend URL not configured.",
+        },
+        {
+          status: 500,
+        }
+      );
+    }
+
+    const body = await request.json();
+
+    const response = await fetch(`${backendUrl}/tables/rows`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify(body),
+    });
+
+    if (!response.ok) {
+      console.error("Failed to fetch table rows:", response.statusText);
+      return NextResponse.json(
+        { error: "Failed to fetch table rows." },
+        { status: response.status }
+      );
+    }
+
+    const data = await response.json();
+
+    return NextResponse.json({ data });
+  } catch (err) {
+    console.error("Error in table rows API:", err);
+    return NextResponse.json(
+      { error: "Internal server error" },
+      { status: 500 }
+    );
+  }
+}
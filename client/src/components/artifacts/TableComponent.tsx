@@ -1,10 +1,56 @@
 "use client";
-import { TableDescriptor } from "@/schemas/ui";
+import { getTableRows } from "@/lib/data";
+import { TableDescriptor, TableRow, TableSort } from "@/schemas/ui";
 import { motion } from "framer-motion";
+import { useState } from "react";
 
 type TableProps = TableDescriptor["props"];
 
-export function TableComponent({ title, columns, rows, loading }: TableProps) {
+export function TableComponent({
+  title,
+  columns,
+  rows,
+  loading,
+  query,
+  totalRows,
+  pageSize = 25,
+  pageCount = 1,
+}: TableProps) {
+  const [page, setPage] = useState(1);
+  const [pageRows, setPageRows] = useState<TableRow[] | undefined>(rows);
+  const [sort, setSort] = useState<TableSort[] | undefined>(undefined);
+  const [fetching, setFetching] = useState(false);
+
+  // Tables backed by a server-side query fetch further pages on demand
+  const loadPage = async (nextPage: number, nextSort = sort) => {
+    if (!query) return;
+
+    setFetching(true);
+    try {
+      const data = await getTableRows(query, nextPage, pageSize, nextSort);
+      if (data) {
+        setPage(nextPage);
+        setSort(nextSort);
+        setPageRows(data.rows);
+      }
+    } finally {
+      setFetching(false);
+    }
+  };
+
+  const toggleSort = (column: string) => {
+    if (!query) return;
+
+    const current = sort?.[0];
+    const direction =
+      current?.column === column && current.direction === "asc"
+        ? "desc"
+        : "asc";
+    loadPage(1, [{ column, direction }]);
+  };
+
+  const visibleRows = query ? pageRows : rows;
+
   return (
     <motion.div
       layout
@@ -48,16 +94,21 @@ export function TableComponent({ title, columns, rows, loading }: TableProps) {
                   columns.map((col) => (
                     <th
                       key={col.key}
-                      className="text-left px-3 py-2 font-medium text-gray-700"
+                      onClick={() => toggleSort(col.key)}
+                      className={`text-left px-3 py-2 font-medium text-gray-700 ${
+                        query ? "cursor-pointer select-none" : ""
+                      }`}
                     >
                       {col.label}
+                      {sort?.[0]?.column === col.key &&
+                        (sort[0].direction === "asc" ? " ▲" : " ▼")}
                     </th>
                   ))}
               </tr>
             </thead>
             <tbody>
-              {rows &&
-                rows.map((row, i) => (
+              {visibleRows &&
+                visibleRows.map((row, i) => (
                   <tr
                     key={i}
                     className="border-b border-gray-100 hover:bg-gray-50"
@@ -72,6 +123,31 @@ export function TableComponent({ title, columns, rows, loading }: TableProps) {
                 ))}
             </tbody>
           </table>
+
+          {query && pageCount > 1 && (
+            <div className="flex items-center justify-between pt-3 text-sm text-gray-600">
+              <span>
+                Page {page} of {pageCount}
+                {totalRows !== undefined && ` · ${totalRows} rows`}
+              </span>
+              <div className="flex gap-2">
+                <button
+                  className="px-2 py-1 rounded border border-gray-200 disabled:opacity-40"
+                  disabled={fetching || page <= 1}
+                  onClick={() => loadPage(page - 1)}
+                >
+                  Prev
+                </button>
+                <button
+                  className="px-2 py-1 rounded border border-gray-200 disabled:opacity-40"
+                  disabled={fetching || page >= pageCount}
+                  onClick={() => loadPage(page + 1)}
+                >
+                  Next
+                </button>
+              </div>
+            </div>
+          )}
         </div>
       )}
     </motion.div>
@@ -11,16 +11,12 @@ const ChartContainer = ({ option }: { option: ECBasicOption }) => {
   useEffect(() => {
     if (!chartRef.current) return;
 
-    // Initialize the chart
+    // Initialize the chart once, streamed updates only change its option
     chartInstance.current = echarts.init(chartRef.current, null, {
       renderer: "canvas",
       useDirtyRect: false,
     });
 
-    const chartOption = option;
-
-    chartInstance.current.setOption(chartOption);
-
     // Handle window resize
     const handleResize = () => {
       chartInstance.current?.resize();
@@ -32,7 +28,13 @@ const ChartContainer = ({ option }: { option: ECBasicOption }) => {
     return () => {
       window.removeEventListener("resize", handleResize);
       chartInstance.current?.dispose();
+      chartInstance.current = null;
     };
+  }, []);
+
+  useEffect(() => {
+    // notMerge: the final option replaces the streamed skeleton entirely
+    chartInstance.current?.setOption(option, { notMerge: true });
   }, [option]);
 
   return (
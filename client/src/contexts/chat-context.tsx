@@ -245,6 +245,31 @@ export const ChatProvider = ({ children }: ChatProviderProps) => {
               );
             }
 
+            // Append streamed data points to the chart skeleton
+            if (parsed.series_append) {
+              setMessages((prev) =>
+                prev.map((msg) => {
+                  if (msg.id !== aiResponseId || !msg.option) return msg;
+
+                  const series = [...((msg.option as any).series || [])];
+                  parsed.series_append.forEach(
+                    ({ index, data, ...stub }: any) => {
+                      while (series.length < index) {
+                        series.push({ data: [] });
+                      }
+                      const existing = series[index] || { ...stub, data: [] };
+                      series[index] = {
+                        ...existing,
+                        data: [...existing.data, ...data],
+                      };
+                    }
+                  );
+
+                  return { ...msg, option: { ...msg.option, series } };
+                })
+              );
+            }
+
             // Handle component data
             if (parsed.component) {
               setMessages((prev) =>
@@ -1,3 +1,5 @@
+import { TableQuery, TableSort } from "@/schemas/ui";
+
 export async function getMessages(slug: string) {
   const res = await fetch(
     `http://localhost:3000/api/chat/messages?slug=${slug}`
@@ -57,3 +59,44 @@ export async function isServerOnline() {
 
   return res.online;
 }
+
+export async function getTableRows(
+  query: TableQuery,
+  page: number,
+  pageSize: number,
+  sort?: TableSort[]
+) {
+  const res = await fetch("http://localhost:3000/api/tables/rows", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ query, page, page_size: pageSize, sort }),
+  });
+
+  const data = await res.json();
+
+  return data.data || null;
+}
+
+export async function getDatasetAggregate(request: {
+  group_by?: ("product_name" | "year" | "month" | "period")[];
+  metrics: { column: string; func?: "sum" | "avg" | "min" | "max" | "count" }[];
+  filters?: {
+    product_names?: string[];
+    years?: number[];
+    period_from?: string;
+    period_to?: string;
+  };
+  order_by?: string;
+  descending?: boolean;
+  limit?: number;
+}) {
+  const res = await fetch("http://localhost:3000/api/dataset/aggregate", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(request),
+  });
+
+  const data = await res.json();
+
+  return data.data || null;
+}
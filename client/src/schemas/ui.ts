@@ -25,6 +25,26 @@ export interface TableRow {
   [key: string]: string | number | boolean | null;
 }
 
+export interface TableFilter {
+  column: string;
+  op: "eq" | "ne" | "gt" | "gte" | "lt" | "lte" | "contains" | "in";
+  value: unknown;
+}
+
+export interface TableSort {
+  column: string;
+  direction: "asc" | "desc";
+}
+
+/* Server-side query backing a paginated table */
+export interface TableQuery {
+  session_id?: string | null;
+  table: string;
+  columns: string[];
+  filters: TableFilter[];
+  sort: TableSort[];
+}
+
 export interface TableDescriptor extends BaseDescriptor {
   type: "table";
   props: {
@@ -32,6 +52,10 @@ export interface TableDescriptor extends BaseDescriptor {
     loading?: boolean;
     columns?: TableColumn[];
     rows?: TableRow[];
+    query?: TableQuery;
+    totalRows?: number;
+    pageSize?: number;
+    pageCount?: number;
     children?: UIDescriptor[];
   };
 }
@@ -5,6 +5,9 @@ from sqlalchemy import engine_from_config, pool
 from alembic import context
 from app.db.database import Base, connection_string
 from app.models.chat_session import ChatSession, FileRecord, Message  # noqa: F401
+from app.models.llm_response_cache import LlmResponseCacheEntry  # noqa: F401
+from app.models.research_cache import ResearchCacheEntry  # noqa: F401
+from app.models.response_replay_cache import ResponseReplayEntry  # noqa: F401
 from app.models.test_dataset import Dataset  # noqa: F401
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,35 @@
+"""dataset period
+
+Revision ID: 3f8a2c6d1e57
+Revises: 9c1d7e4b2a6f
+Create Date: 2025-10-21 10:04:52.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a2c6d1e57'
+down_revision: Union[str, Sequence[str], None] = '9c1d7e4b2a6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('dataset', sa.Column('period', sa.Date(), nullable=True))
+    # Backfill the typed date from the string year / month name columns
+    op.execute("UPDATE dataset SET period = to_date(year || ' ' || month, 'YYYY FMMonth')")
+    op.alter_column('dataset', 'period', nullable=False)
+    op.create_index('ix_dataset_period', 'dataset', ['period'], unique=False)
+    op.create_index('ix_dataset_product_name_period', 'dataset', ['product_name', 'period'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_dataset_product_name_period', table_name='dataset')
+    op.drop_index('ix_dataset_period', table_name='dataset')
+    op.drop_column('dataset', 'period')
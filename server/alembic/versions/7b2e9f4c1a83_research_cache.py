@@ -0,0 +1,38 @@
+"""research cache
+
+Revision ID: 7b2e9f4c1a83
+Revises: 3f8a2c6d1e57
+Create Date: 2025-10-23 14:37:09.512846
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b2e9f4c1a83'
+down_revision: Union[str, Sequence[str], None] = '3f8a2c6d1e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('research_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('kind', sa.String(length=16), nullable=False),
+    sa.Column('query', sa.Text(), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index('ix_research_cache_expires_at', 'research_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_research_cache_expires_at', table_name='research_cache')
+    op.drop_table('research_cache')
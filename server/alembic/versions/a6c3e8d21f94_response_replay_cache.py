@@ -0,0 +1,38 @@
+"""response replay cache
+
+Revision ID: a6c3e8d21f94
+Revises: d41f7a9e2c05
+Create Date: 2025-10-24 16:48:03.771920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c3e8d21f94'
+down_revision: Union[str, Sequence[str], None] = 'd41f7a9e2c05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('response_replay_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('input', sa.Text(), nullable=False),
+    sa.Column('frames', sa.JSON(), nullable=False),
+    sa.Column('message', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index('ix_response_replay_cache_expires_at', 'response_replay_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_response_replay_cache_expires_at', table_name='response_replay_cache')
+    op.drop_table('response_replay_cache')
@@ -0,0 +1,39 @@
+"""llm response cache
+
+Revision ID: d41f7a9e2c05
+Revises: 7b2e9f4c1a83
+Create Date: 2025-10-24 09:12:41.208337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41f7a9e2c05'
+down_revision: Union[str, Sequence[str], None] = '7b2e9f4c1a83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('llm_response_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('agent', sa.String(length=64), nullable=False),
+    sa.Column('model', sa.String(length=64), nullable=False),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('latency_seconds', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index('ix_llm_response_cache_expires_at', 'llm_response_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_llm_response_cache_expires_at', table_name='llm_response_cache')
+    op.drop_table('llm_response_cache')
@@ -1,28 +1,53 @@
-import json
 import logging
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from pydantic_core import to_json
 
 from app.models.bar_chart_model import ChartConfig
 from app.models.state_model import MultiAgentState
+from app.services.chart_builder_service import ChartBuilder
+from app.services.chart_postprocess_service import fold_bar_categories, to_dataset
+from app.services.data_source_service import DataSourceService, reads_dataset
 from app.services.env_config_service import EnvConfigService
+from app.services.json_repair_service import repair_chart_option
+from app.services.model_cascade_service import chart_validator, model_cascade
+from app.services.sql_query_service import compact_result
 
 logger = logging.getLogger(__name__)
 
 
 class BarChartAgent:
-  def __init__(self, env_config: EnvConfigService):
+  def __init__(self, env_config: EnvConfigService, data_source: DataSourceService):
     self.env_config = env_config
-    self.llm = ChatOpenAI(
-      model="gpt-4o-mini",
-      api_key=env_config.OPENAI_API_KEY,
+    self.data_source = data_source
+    self.llm_cascade = model_cascade(env_config, "bar_chart", "gpt-4o-mini")
+    self.chart_builder = ChartBuilder(
+      llm=self.llm_cascade, max_categories=env_config.BAR_CHART_MAX_CATEGORIES
     )
-    self.llm_with_structured_output = self.llm.with_structured_output(method="json_mode")
+
+  def _chart_ready(self, option: dict, used_dataset: bool = False):
+    # Model-written charts can carry hundreds of bars; tabular ones are already folded
+    option = fold_bar_categories(option, self.env_config.BAR_CHART_MAX_CATEGORIES) or option
+    if self.env_config.BAR_CHART_DATASET_ENCODING:
+      option = to_dataset(option)
+    # Serialized by pydantic-core, several times faster than json.dumps on long series
+    return {
+      "messages": [AIMessage(content=to_json(option).decode())],
+      "current_agent": "END",
+      "used_dataset": used_dataset,
+    }
 
   async def chart(self, state: MultiAgentState):
     last_message = state["messages"][-1].content
 
+    # Tabular sources are charted deterministically, the LLM only sees raw text as a fallback
+    tables = await self.data_source.get_tables(
+      state.get("session_id"), last_message, state.get("dataset_result")
+    )
+    option = await self.chart_builder.build(last_message, tables, chart_type="bar")
+    if option:
+      return self._chart_ready(option, used_dataset=reads_dataset(tables))
+
     system_prompt = """
     You are an expert data analyst and bar chart visualization specialist.
     Your task is to create bar charts from user's specific data requests for categorical comparisons.
@@ -108,6 +133,8 @@ class BarChartAgent:
         
         Research data: {state["research_data"]}
         
+        Dataset query result: {compact_result(state.get("dataset_result"))}
+        
         User file attachment data: {state["attachment_contents"]}
         """
       ),
@@ -115,19 +142,14 @@ class BarChartAgent:
 
     try:
       logger.debug("Generating bar chart response.")
-      response = await self.llm_with_structured_output.ainvoke(bar_chart_messages)
-
-      try:
-        # Validate the response and save to the messages state
-        validated_response = ChartConfig.model_validate(response)
-        validated_dict = validated_response.model_dump()
-
-        chart_message = AIMessage(content=json.dumps(validated_dict))
+      # Escalates to the larger model when the result is not a valid chart option
+      response = await self.llm_cascade.ainvoke(
+        bar_chart_messages,
+        validate=chart_validator(ChartConfig),
+        repair=repair_chart_option,
+      )
 
-        return {"messages": [chart_message], "current_agent": "END"}
-      except Exception as e:
-        logger.error(f"Bar chart model validation failed: {e}")
-        return {"messages": [], "current_agent": "END"}
+      return self._chart_ready(response)
     except Exception as e:
       logger.error(f"Bar chart generation failed: {e}")
       return {"messages": [], "current_agent": "END"}
@@ -2,19 +2,78 @@ import json
 import logging
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from app.models.state_model import MultiAgentState
+from app.models.ui_descriptor_model import CardDescriptor
+from app.services.data_source_service import DataSourceService, reads_dataset
 from app.services.env_config_service import EnvConfigService
+from app.services.json_repair_service import repair_descriptor
+from app.services.kpi_service import KpiEngine
+from app.services.model_cascade_service import descriptor_validator, model_cascade
+from app.services.sql_query_service import compact_result
 
 logger = logging.getLogger(__name__)
 
 
 class CardAgent:
-  def __init__(self, env_config: EnvConfigService):
+  def __init__(self, env_config: EnvConfigService, data_source: DataSourceService):
     self.env_config = env_config
-    self.llm = ChatOpenAI(model="gpt-4.1", api_key=env_config.OPENAI_API_KEY)
-    self.llm_with_structured_output = self.llm.with_structured_output(method="json_mode")
+    self.data_source = data_source
+    self.kpi_engine = KpiEngine()
+    self.llm_cascade = model_cascade(env_config, "card", "gpt-4.1")
+
+  def _next_card_step(self, todo: dict, card_components: list) -> str | None:
+    produced_ids = {card.get("id") for card in card_components if isinstance(card, dict)}
+
+    for step in todo.values():
+      if not isinstance(step, dict) or step.get("fulfilled"):
+        continue
+      description = str(step.get("description", ""))
+      if "card" not in description.lower():
+        continue
+      if any(card_id and card_id in description for card_id in produced_ids):
+        continue
+      return description
+
+    return None
+
+  async def _compute_card(self, state: MultiAgentState, plan_text: str, todo: dict):
+    """Render the next card straight from columnar data when its KPI can be computed.
+
+    Returns the card and whether live `dataset` rows were among the tables it computed over.
+    """
+    step = self._next_card_step(todo, state.get("card_component", []))
+    if not step:
+      return None
+
+    # Steps explicitly sourced from web research are left to the model
+    if "research_data" in step and "attachment" not in step.lower():
+      return None
+
+    last_message = state["messages"][-1].content
+    tables = await self.data_source.get_tables(
+      state.get("session_id"), f"{last_message} {plan_text} {step}", state.get("dataset_result")
+    )
+    card = self.kpi_engine.card_for_step(step, tables)
+    return (card, reads_dataset(tables)) if card else None
+
+  def _card_ready(self, state: MultiAgentState, card: dict, used_dataset: bool = False):
+    ui_event = {"type": "ui_event", "target": "loading_card", "component": card}
+
+    card_message = AIMessage(content=json.dumps(ui_event))
+    messages = state.get("messages", [])
+    messages.append(card_message)
+
+    card_state = state.get("card_component", [])
+    card_state.append(card)
+
+    return {
+      "card_component": card_state,
+      "current_agent": "component_supervisor",
+      "messages": messages,
+      "card_ready": True,
+      "used_dataset": used_dataset,
+    }
 
   async def generate(self, state: MultiAgentState):
     dashboard_plan_state = state.get("dashboard_plan", {})
@@ -26,6 +85,11 @@ class CardAgent:
       plan_text = str(dashboard_plan_state)
       todo = {}
 
+    computed = await self._compute_card(state, plan_text, todo)
+    if computed:
+      computed_card, used_dataset = computed
+      return self._card_ready(state, computed_card, used_dataset)
+
     card_prompt = """
     You are the Card Agent.
 
@@ -142,6 +206,8 @@ class CardAgent:
     1. Researched data: {state["research_data"]}
     
     2. Attachment data: {state["attachment_contents"]}
+    
+    3. Dataset query result: {compact_result(state.get("dataset_result"))}
     """
     )
 
@@ -149,26 +215,14 @@ class CardAgent:
 
     try:
       logger.debug("Generating card response.")
-      response = await self.llm_with_structured_output.ainvoke(message)
+      response = await self.llm_cascade.ainvoke(
+        message, validate=descriptor_validator(CardDescriptor), repair=repair_descriptor
+      )
 
       dict_response = response if isinstance(response, dict) else json.loads(response)
 
       if dict_response and dict_response.get("id"):
-        ui_event = {"type": "ui_event", "target": "loading_card", "component": dict_response}
-
-        card_message = AIMessage(content=json.dumps(ui_event))
-        messages = state.get("messages", [])
-        messages.append(card_message)
-
-        card_state = state.get("card_component", [])
-        card_state.append(dict_response)
-
-        return {
-          "card_component": card_state,
-          "current_agent": "component_supervisor",
-          "messages": messages,
-          "card_ready": True,
-        }
+        return self._card_ready(state, dict_response)
       else:
         logger.error("Card model validation failed.")
 
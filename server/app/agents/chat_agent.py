@@ -1,10 +1,10 @@
 import logging
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from app.models.state_model import MultiAgentState
 from app.services.env_config_service import EnvConfigService
+from app.services.llm_client_service import chat_model
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +12,7 @@ logger = logging.getLogger(__name__)
 class ChatAgent:
   def __init__(self, env_config: EnvConfigService):
     self.env_config = env_config
-    self.llm = ChatOpenAI(
-      model="gpt-4o-mini",
-      api_key=env_config.OPENAI_API_KEY,
-    )
+    self.llm = chat_model(env_config, "gpt-4o-mini")
 
   async def chat(self, state: MultiAgentState):
     messages = state["messages"]
@@ -0,0 +1,90 @@
+import logging
+
+from app.models.state_model import MultiAgentState
+from app.services.env_config_service import EnvConfigService
+from app.services.plan_service import UI_BUILDER, execution_order, steps_from_state, to_todo
+
+logger = logging.getLogger(__name__)
+
+
+class ComponentExecutorAgent:
+  """Drives a dashboard plan to completion without going back to the planner.
+
+  The component supervisor plans once; this node then dispatches every step in dependency
+  order (sections before the cards/tables they wrap), records whether each worker produced
+  a component, optionally re-dispatches empty results once, and finishes with the UI builder.
+  No model calls happen here, so cost per dashboard is fixed by the plan.
+  """
+
+  def __init__(self, env_config: EnvConfigService):
+    self.env_config = env_config
+
+  def _produced(self, state: MultiAgentState, step_type: str, before: int) -> bool:
+    if step_type == "section":
+      section = state.get("section_component")
+      return isinstance(section, dict) and bool(section.get("id"))
+
+    components = state.get(f"{step_type}_component", [])
+    new_components = components[before:]
+    return any(isinstance(component, dict) and component.get("id") for component in new_components)
+
+  def _component_count(self, state: MultiAgentState, step_type: str) -> int:
+    if step_type == "section":
+      return 0
+    return len(state.get(f"{step_type}_component", []))
+
+  async def execute(self, state: MultiAgentState):
+    dashboard_plan = dict(state.get("dashboard_plan") or {})
+    steps = steps_from_state(dashboard_plan)
+    steps_by_key = {step.key: step for step in steps}
+
+    execution = dict(
+      dashboard_plan.get("execution")
+      or {"queue": execution_order(steps), "results": {}, "pending": None, "verified": False}
+    )
+    results = dict(execution["results"])
+    queue = list(execution["queue"])
+
+    # Record the outcome of the worker that just ran
+    pending = execution.get("pending")
+    if pending:
+      step = steps_by_key[pending["key"]]
+      produced = self._produced(state, step.type, pending["count"])
+      results[step.key] = "done" if produced else "empty"
+      if not produced:
+        logger.warning(f"Dashboard step {step.key} ({step.type}) produced no component.")
+
+    if execution.get("assembling"):
+      # The UI builder came back without finishing, do not loop on it
+      logger.error("UI assembly did not complete, ending dashboard execution.")
+      return {"current_agent": "END"}
+
+    if not queue and self.env_config.DASHBOARD_VERIFY_PASS and not execution["verified"]:
+      # Single verification pass: give steps that came back empty one more try
+      queue = [key for key in execution_order(steps) if results.get(key) == "empty"]
+      execution["verified"] = True
+      for key in queue:
+        results.pop(key, None)
+
+    for step in steps:
+      step.fulfilled = step.key in results
+
+    if queue:
+      key = queue.pop(0)
+      step = steps_by_key[key]
+      execution["pending"] = {"key": key, "count": self._component_count(state, step.type)}
+      next_agent = step.type
+    else:
+      execution["pending"] = None
+      execution["assembling"] = True
+      next_agent = UI_BUILDER
+
+    execution["queue"] = queue
+    execution["results"] = results
+
+    dashboard_plan["todo"] = to_todo(steps)
+    dashboard_plan["steps"] = [step.to_dict() for step in steps]
+    dashboard_plan["execution"] = execution
+
+    logger.debug(f"Component executor dispatching {next_agent}.")
+    return {"dashboard_plan": dashboard_plan, "current_agent": next_agent}
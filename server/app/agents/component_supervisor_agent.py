@@ -3,10 +3,20 @@ import logging
 import uuid
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from app.models.state_model import MultiAgentState
 from app.services.env_config_service import EnvConfigService
+from app.services.llm_cache_service import structured_output
+from app.services.llm_client_service import chat_model
+from app.services.plan_service import (
+  COMPONENT_TYPES,
+  mark_fulfilled,
+  next_agent,
+  parse_todo,
+  steps_from_state,
+  to_todo,
+)
+from app.services.sql_query_service import compact_result
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +24,35 @@ logger = logging.getLogger(__name__)
 class ComponentSupervisorAgent:
   def __init__(self, env_config: EnvConfigService):
     self.env_config = env_config
-    self.llm = ChatOpenAI(model="gpt-4.1", api_key=env_config.OPENAI_API_KEY)
-    self.llm_with_structured_output = self.llm.with_structured_output(method="json_mode")
+    self.llm = chat_model(env_config, "gpt-4.1")
+    self.llm_with_structured_output = structured_output(
+      self.llm, "component_supervisor", env_config
+    )
+
+  def _produced_components(self, state: MultiAgentState) -> dict:
+    section = state.get("section_component")
+    return {
+      "section": [section] if isinstance(section, dict) and section else [],
+      "card": state.get("card_component", []),
+      "table": state.get("table_component", []),
+    }
+
+  def _route(self, state: MultiAgentState, plan_text: str, steps: list, dispatched: dict):
+    """Track fulfillment in code and dispatch the earliest open step's agent."""
+    mark_fulfilled(steps, self._produced_components(state), dispatched)
+    agent = next_agent(steps)
+
+    dispatched = dict(dispatched)
+    if agent in COMPONENT_TYPES:
+      dispatched[agent] = dispatched.get(agent, 0) + 1
+
+    dashboard_plan = {
+      "dashboard_plan": plan_text,
+      "todo": to_todo(steps),
+      "steps": [step.to_dict() for step in steps],
+      "dispatched": dispatched,
+    }
+    return dashboard_plan, agent
 
   async def supervise(self, state: MultiAgentState):
     last_message = state["messages"][-1].content
@@ -25,6 +62,28 @@ class ComponentSupervisorAgent:
     )
     is_initial_planning = not has_existing_plan
 
+    # The plan is parsed once, afterwards progress is tracked without another model call
+    if has_existing_plan:
+      steps = steps_from_state(existing_plan_data)
+      if any(step.type in COMPONENT_TYPES for step in steps):
+        dashboard_plan, next_agent_name = self._route(
+          state,
+          existing_plan_data["dashboard_plan"],
+          steps,
+          existing_plan_data.get("dispatched", {}),
+        )
+        logger.debug(f"Component supervisor routed deterministically to {next_agent_name}.")
+
+        if state.get("iteration_count", 0) > 5:
+          next_agent_name = "END"
+
+        return {
+          "dashboard_plan": dashboard_plan,
+          "current_agent": next_agent_name,
+          "is_initial_planning": False,
+          "ui_descriptor_target": state.get("ui_descriptor_target", ""),
+        }
+
     supervisor_prompt = """
     You are the Component Supervisor Agent.
 
@@ -49,7 +108,7 @@ class ComponentSupervisorAgent:
       - ui_builder → assemble when all components are complete.
 
     Data reasoning:
-      - Map component ids to available data (research_data, attachment_contents).
+      - Map component ids to available data (research_data, attachment_contents, dataset_result).
       - Add clarifications if required data is missing.
       - Never invent data sources.
 
@@ -122,6 +181,8 @@ class ComponentSupervisorAgent:
     
     2. Attachment data: {state["attachment_contents"]}
     
+    3. Dataset query result: {compact_result(state.get("dataset_result"))}
+    
     Existing dashboard_plan (if any): {existing_plan_data}
 
     Available component descriptors:
@@ -148,13 +209,27 @@ class ComponentSupervisorAgent:
           plan = original_plan_text
       todo = dict_response["todo"]
 
-      dashboard_plan = {"dashboard_plan": plan, "todo": todo}
-      next_agent = dict_response["next_agent"]
-
-      logger.debug(f"Component supervisor agent decision: {next_agent}")
-
-      if state.get("iteration_count", 0) > 5:
-        next_agent = "END"
+      steps = parse_todo(todo)
+      if any(step.type in COMPONENT_TYPES for step in steps):
+        dashboard_plan, next_agent_name = self._route(state, plan, steps, {})
+      else:
+        # Unstructured TODOs: keep the model's own bookkeeping
+        dashboard_plan = {"dashboard_plan": plan, "todo": todo}
+        next_agent_name = dict_response["next_agent"]
+
+      logger.debug(f"Component supervisor agent decision: {next_agent_name}")
+
+      component_dispatcher = "component_supervisor"
+      if (
+        is_initial_planning
+        and self.env_config.DASHBOARD_EXECUTION_MODE == "plan_execute"
+        and "steps" in dashboard_plan
+      ):
+        # Plan-then-execute: the executor runs the whole plan, workers report back to it
+        dashboard_plan = {**dashboard_plan, "dispatched": {}}
+        component_dispatcher = next_agent_name = "component_executor"
+      elif state.get("iteration_count", 0) > 5:
+        next_agent_name = "END"
 
       if is_initial_planning:
         ui_descriptor_target = f"component-{str(uuid.uuid4().int)[:5]}"
@@ -163,9 +238,10 @@ class ComponentSupervisorAgent:
 
       return {
         "dashboard_plan": dashboard_plan,
-        "current_agent": next_agent,
+        "current_agent": next_agent_name,
         "is_initial_planning": is_initial_planning,
         "ui_descriptor_target": ui_descriptor_target,
+        "component_dispatcher": component_dispatcher,
       }
     except Exception as e:
       logger.error(f"Failed to generate component supervisor response: {e}")
@@ -1,28 +1,49 @@
-import json
 import logging
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from pydantic_core import to_json
 
 from app.models.line_chart_model import ChartConfig
 from app.models.state_model import MultiAgentState
+from app.services.chart_builder_service import ChartBuilder
+from app.services.chart_postprocess_service import downsample_line_option
+from app.services.data_source_service import DataSourceService, reads_dataset
 from app.services.env_config_service import EnvConfigService
+from app.services.json_repair_service import repair_chart_option
+from app.services.model_cascade_service import chart_validator, model_cascade
+from app.services.sql_query_service import compact_result
 
 logger = logging.getLogger(__name__)
 
 
 class LineChartAgent:
-  def __init__(self, env_config: EnvConfigService):
+  def __init__(self, env_config: EnvConfigService, data_source: DataSourceService):
     self.env_config = env_config
-    self.llm = ChatOpenAI(
-      model="gpt-4o-mini",
-      api_key=env_config.OPENAI_API_KEY,
-    )
-    self.llm_with_structured_output = self.llm.with_structured_output(method="json_mode")
+    self.data_source = data_source
+    self.llm_cascade = model_cascade(env_config, "line_chart", "gpt-4o-mini")
+    self.chart_builder = ChartBuilder(llm=self.llm_cascade)
+
+  def _chart_ready(self, option: dict, used_dataset: bool = False):
+    # Long series are sent and kept downsampled; the full data stays with the stored message
+    downsampled = downsample_line_option(option, self.env_config.LINE_CHART_MAX_POINTS)
+    return {
+      "messages": [AIMessage(content=to_json(downsampled or option).decode())],
+      "full_chart_option": option if downsampled else None,
+      "current_agent": "END",
+      "used_dataset": used_dataset,
+    }
 
   async def chart(self, state: MultiAgentState):
     last_message = state["messages"][-1].content
 
+    # Tabular sources are charted deterministically, the LLM only sees raw text as a fallback
+    tables = await self.data_source.get_tables(
+      state.get("session_id"), last_message, state.get("dataset_result")
+    )
+    option = await self.chart_builder.build(last_message, tables, chart_type="line")
+    if option:
+      return self._chart_ready(option, used_dataset=reads_dataset(tables))
+
     system_prompt = """
     You are an expert data analyst and line chart visualization specialist.
     Your task is to create line charts from user's specific data requests.
@@ -101,6 +122,8 @@ class LineChartAgent:
       
       Research data: {state["research_data"]}
       
+      Dataset query result: {compact_result(state.get("dataset_result"))}
+      
       User file attachment data: {state["attachment_contents"]}
       """
       ),
@@ -108,19 +131,14 @@ class LineChartAgent:
 
     try:
       logger.debug("Generating line chart response.")
-      response = await self.llm_with_structured_output.ainvoke(line_chart_messages)
-
-      try:
-        # Validate the response and save to the messages state
-        validated_response = ChartConfig.model_validate(response)
-        validated_dict = validated_response.model_dump()
-
-        chart_message = AIMessage(content=json.dumps(validated_dict))
+      # Escalates to the larger model when the result is not a valid chart option
+      response = await self.llm_cascade.ainvoke(
+        line_chart_messages,
+        validate=chart_validator(ChartConfig),
+        repair=repair_chart_option,
+      )
 
-        return {"messages": [chart_message], "current_agent": "END"}
-      except Exception as e:
-        logger.error(f"Line chart model validation failed: {e}")
-        return {"messages": [], "current_agent": "END"}
+      return self._chart_ready(response)
     except Exception as e:
       logger.error(f"Line chart response generation failed: {e}")
       return {"messages": [], "current_agent": "END"}
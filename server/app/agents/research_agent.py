@@ -1,40 +1,161 @@
+import asyncio
+import json
 import logging
+import re
+import time
 
+from langchain_core.callbacks import get_usage_metadata_callback
 from langchain_core.messages import SystemMessage, ToolMessage
 from langchain_core.tools import tool
-from langchain_openai import ChatOpenAI
-from langchain_tavily import TavilySearch
 
 from app.models.state_model import MultiAgentState
 from app.services.env_config_service import EnvConfigService
+from app.services.llm_client_service import chat_model
+from app.services.metrics_service import metrics
+from app.services.research_cache_service import RESEARCH, SEARCH, get_research_cache
+from app.services.research_memory_service import remember
+from app.services.search_client_service import compact_results, get_search_client
 
 logger = logging.getLogger(__name__)
 
+# Cheap pre-router for speculative research: phrases that almost always need web data
+WEB_RESEARCH_PATTERN = re.compile(
+  r"\b(latest|current|today|news|recent|this (?:week|month|year)|market|industry|benchmark|"
+  r"competitors?|stock|price|trends?|search|look up|research|on the web|online|20\d{2})\b",
+  re.I,
+)
+LOCAL_DATA_PATTERN = re.compile(
+  r"\b(attach\w*|uploaded|file|excel|csv|pdf|dataset|database)\b", re.I
+)
+
+
+def needs_web_research(request: str) -> bool:
+  return bool(WEB_RESEARCH_PATTERN.search(request)) and not LOCAL_DATA_PATTERN.search(request)
+
 
 class ResearchAgent:
   def __init__(self, env_config: EnvConfigService):
     self.env_config = env_config
     self.tools = [self._create_tavily_tool()]
-    self.llm = ChatOpenAI(
-      model="gpt-4o",
-      api_key=env_config.OPENAI_API_KEY,
-    )
+    self.llm = chat_model(env_config, "gpt-4o")
+    self._speculation: asyncio.Task | None = None
+    self._speculation_started_at = 0.0
+    self._speculation_usage: dict = {}
 
   def _create_tavily_tool(self):
     @tool
     async def tavily_search_tool(input: str) -> str:
-      """Web search tool for gathering information."""
+      """Web search tool for gathering information. Call it once per focused sub-query."""
       try:
-        tool = TavilySearch(api_key=self.env_config.TAVILY_API_KEY, max_results=1)
-        result = tool.invoke(input)
-        return result["results"][0]["content"]
+        cached = await get_research_cache().get(SEARCH, input)
+        if cached is not None:
+          return cached
+
+        results = await get_search_client().search(
+          input, max_results=self.env_config.SEARCH_MAX_RESULTS
+        )
+        payload = json.dumps(results)
+        await get_research_cache().set(SEARCH, input, payload)
+        return payload
       except Exception as e:
         logger.error(f"Failed to generato tool call: {e}")
         return f"Search error: {str(e)}"
 
     return tavily_search_tool
 
+  def speculate(self, state: MultiAgentState) -> None:
+    """Start researching before the supervisor has decided, see `resolve_speculation`."""
+    if self._speculation is not None:
+      return
+
+    metrics.increment("research.speculation.started")
+    self._speculation_started_at = time.monotonic()
+    self._speculation = asyncio.create_task(self._speculative_research(state))
+
+  async def _speculative_research(self, state: MultiAgentState):
+    with get_usage_metadata_callback() as usage_callback:
+      # Live view of the tokens spent so far, read if the speculation gets cancelled
+      self._speculation_usage = usage_callback.usage_metadata
+      return await self._research(state)
+
+  def resolve_speculation(self, next_agent: str) -> None:
+    """Keep the speculative research if the supervisor picked the researcher, cancel it otherwise."""
+    if self._speculation is None:
+      return
+
+    if next_agent == "researcher":
+      metrics.increment("research.speculation.hits")
+      return
+
+    self._speculation.cancel()
+    self._speculation = None
+
+    metrics.increment("research.speculation.misses")
+    metrics.increment(
+      "research.speculation.wasted_seconds", time.monotonic() - self._speculation_started_at
+    )
+    wasted_tokens = sum(usage.get("total_tokens", 0) for usage in self._speculation_usage.values())
+    metrics.increment("research.speculation.wasted_tokens", wasted_tokens)
+
   async def research(self, state: MultiAgentState):
+    if self._speculation is not None:
+      speculation, self._speculation = self._speculation, None
+      metrics.increment(
+        "research.speculation.head_start_seconds",
+        time.monotonic() - self._speculation_started_at,
+      )
+      try:
+        result = await speculation
+        logger.debug("Using speculative research result.")
+        return result
+      except Exception as e:
+        logger.warning(f"Speculative research failed, researching again: {e}")
+
+    return await self._research(state)
+
+  async def _call_tool(self, tool_map: dict, tool_call: dict) -> str:
+    tool = tool_map.get(tool_call["name"])
+    if tool is None:
+      return f"Unknown tool: {tool_call['name']}"
+    return str(await tool.ainvoke(tool_call["args"]))
+
+  def _tool_messages(self, tool_calls: list, tool_results: list) -> list:
+    """Deduplicate and trim search results across all calls before the synthesis call."""
+    batches = []
+    for result in tool_results:
+      try:
+        parsed = json.loads(result)
+      except ValueError:
+        parsed = None
+      batches.append(parsed if isinstance(parsed, list) else None)
+
+    compacted = compact_results(
+      [batch or [] for batch in batches], self.env_config.SEARCH_RESULT_MAX_CHARS
+    )
+
+    messages = []
+    for tool_call, raw, batch, kept in zip(tool_calls, tool_results, batches, compacted):
+      if batch is None:
+        content = raw
+      elif kept:
+        content = "\n\n".join(
+          f"{item['title']} ({item['url']})\n{item['content']}" for item in kept
+        )
+      else:
+        content = "No additional results (duplicates of other searches)."
+      messages.append(ToolMessage(content=content, tool_call_id=tool_call["id"]))
+
+    return messages
+
+  def _findings(self, state: MultiAgentState, request: str, findings: str) -> dict:
+    update = {"research_data": findings, "current_agent": "supervisor"}
+    if findings:
+      update["research_memory"] = remember(
+        state.get("research_memory"), request, findings, self.env_config.RESEARCH_MEMORY_MAX_TOPICS
+      )
+    return update
+
+  async def _research(self, state: MultiAgentState):
     system_message = SystemMessage(
       content=(
         "You are a research agent specialized in gathering external information to complement user data. "
@@ -50,6 +171,8 @@ class ResearchAgent:
         "- Include numerical data when available (revenue, growth rates, statistics)\n"
         "- Always search for the most recent 2025 data\n"
         "- If exact numbers unavailable, provide best available estimates with source context\n"
+        f"- For multi-faceted requests, split the question into at most {self.env_config.RESEARCH_MAX_SUB_QUERIES} "
+        "focused sub-queries and call the search tool once per sub-query in the SAME turn (parallel tool calls)\n"
         "RESPONSE FORMAT:\n"
         "- Return raw findings in structured text format\n"
         "- Do NOT provide analysis instructions or chart-generation steps\n"
@@ -68,6 +191,13 @@ class ResearchAgent:
       state["current_agent"] = "supervisor"
       return state
 
+    request = str(state["messages"][-1].content)
+    scope = state.get("session_id") if self.env_config.RESEARCH_CACHE_PER_SESSION else None
+    cached = await get_research_cache().get(RESEARCH, request, scope)
+    if cached is not None:
+      logger.debug("Using cached research result.")
+      return self._findings(state, request, cached)
+
     tool_map = {tool.name: tool for tool in self.tools}
 
     research_messages = [system_message] + [state["messages"][-1]]
@@ -81,14 +211,19 @@ class ResearchAgent:
       final_research_response = ""
       if response.tool_calls:
         logger.debug("Tools were called.")
-        for tool_call in response.tool_calls:
-          if tool_call["name"] in tool_map:
-            tool = tool_map[tool_call["name"]]
-            tool_result = await tool.ainvoke(tool_call["args"])
+        tool_calls = response.tool_calls[: self.env_config.RESEARCH_MAX_SUB_QUERIES]
+
+        # Searches run concurrently: latency is the slowest search, not their sum
+        tool_results = await asyncio.gather(
+          *[self._call_tool(tool_map, tool_call) for tool_call in tool_calls]
+        )
+        research_messages.extend(self._tool_messages(tool_calls, tool_results))
 
-            # Add tool result to messages
-            tool_message = ToolMessage(content=str(tool_result), tool_call_id=tool_call["id"])
-            research_messages.append(tool_message)
+        # Every tool call needs an answer, even the ones over the sub-query limit
+        for tool_call in response.tool_calls[len(tool_calls) :]:
+          research_messages.append(
+            ToolMessage(content="Skipped: sub-query limit reached.", tool_call_id=tool_call["id"])
+          )
 
         # Get final response after tool execution
         final_response = await client_with_tools.ainvoke(research_messages)
@@ -98,7 +233,10 @@ class ResearchAgent:
         # No tools were called, use the initial response
         final_research_response = response.content
 
-      return {"research_data": final_research_response, "current_agent": "supervisor"}
+      if final_research_response:
+        await get_research_cache().set(RESEARCH, request, final_research_response, scope)
+
+      return self._findings(state, request, final_research_response)
 
     except Exception as e:
       logger.error(f"Failed to generate research response: {e}")
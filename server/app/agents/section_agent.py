@@ -2,10 +2,13 @@ import json
 import logging
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from app.models.state_model import MultiAgentState
+from app.models.ui_descriptor_model import SectionDescriptor
 from app.services.env_config_service import EnvConfigService
+from app.services.json_repair_service import repair_descriptor
+from app.services.model_cascade_service import descriptor_validator, model_cascade
+from app.services.sql_query_service import compact_result
 
 logger = logging.getLogger(__name__)
 
@@ -13,8 +16,7 @@ logger = logging.getLogger(__name__)
 class SectionAgent:
   def __init__(self, env_config: EnvConfigService):
     self.env_config = env_config
-    self.llm = ChatOpenAI(model="gpt-4.1", api_key=env_config.OPENAI_API_KEY)
-    self.llm_with_structured_output = self.llm.with_structured_output(method="json_mode")
+    self.llm_cascade = model_cascade(env_config, "section", "gpt-4.1")
 
   async def generate(self, state: MultiAgentState):
     dashboard_plan_state = state.get("dashboard_plan", {})
@@ -94,6 +96,8 @@ class SectionAgent:
     1. Researched data: {state["research_data"]}
     
     2. Attachment data: {state["attachment_contents"]}
+    
+    3. Dataset query result: {compact_result(state.get("dataset_result"))}
     """
     )
 
@@ -101,7 +105,9 @@ class SectionAgent:
 
     try:
       logger.debug("Generating section response.")
-      response = await self.llm_with_structured_output.ainvoke(message)
+      response = await self.llm_cascade.ainvoke(
+        message, validate=descriptor_validator(SectionDescriptor), repair=repair_descriptor
+      )
 
       dict_response = response if isinstance(response, dict) else json.loads(response)
 
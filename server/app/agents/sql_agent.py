@@ -0,0 +1,82 @@
+import json
+import logging
+from typing import Optional
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from app.models.state_model import MultiAgentState
+from app.services.env_config_service import EnvConfigService
+from app.services.llm_client_service import chat_model
+from app.services.sql_query_service import SqlQueryService
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 2
+
+
+class SqlAgent:
+  def __init__(self, env_config: EnvConfigService, sql_query: Optional[SqlQueryService]):
+    self.env_config = env_config
+    self.sql_query = sql_query
+    self.llm = chat_model(env_config, "gpt-4.1")
+    self.llm_with_structured_output = self.llm.with_structured_output(method="json_mode")
+
+  async def query(self, state: MultiAgentState):
+    if self.sql_query is None:
+      logger.warning("SQL agent called without a dedicated read-only role, refusing to query.")
+      return {
+        "dataset_result": {"error": "Dataset queries are disabled on this server."},
+        "current_agent": "supervisor",
+      }
+
+    last_message = state["messages"][-1].content
+
+    system_message = SystemMessage(
+      content=f"""
+    You are the SQL Agent. Translate the user's question into ONE read-only PostgreSQL SELECT
+    statement over the schema below.
+
+    Schema:
+    {self.sql_query.describe_schema()}
+
+    Rules:
+    - Only SELECT (CTEs allowed). No comments, no semicolons, no other tables.
+    - Aggregate in SQL (SUM/AVG/MIN/MAX/COUNT with GROUP BY) and return only the rows needed
+      to answer the question, not raw records.
+    - Filter and group on period (date) for time ranges; order time series by period.
+    - Use readable column aliases, e.g. total_revenue.
+
+    Respond with ONLY a JSON object: {{"sql": "<query>"}}
+    If the question cannot be answered from this schema, respond with {{}}.
+    """
+    )
+    messages = [system_message, HumanMessage(content=f"User question: {last_message}")]
+
+    for attempt in range(MAX_ATTEMPTS):
+      try:
+        response = await self.llm_with_structured_output.ainvoke(messages)
+      except Exception as e:
+        logger.error(f"Failed to generate SQL: {e}")
+        break
+
+      sql = response.get("sql") if isinstance(response, dict) else None
+      if not sql:
+        logger.info("SQL agent found no query for the request.")
+        break
+
+      try:
+        result = await self.sql_query.run(sql)
+        return {"dataset_result": result, "current_agent": "supervisor"}
+      except Exception as e:
+        logger.warning(f"Dataset query attempt {attempt + 1} failed: {e}")
+        # Give the model one chance to fix its own query
+        messages = messages + [
+          HumanMessage(
+            content=f"The query {json.dumps(sql)} failed: {e}. Return a corrected query."
+          )
+        ]
+
+    return {
+      "dataset_result": {"error": "The dataset could not answer this request."},
+      "current_agent": "supervisor",
+    }
@@ -1,10 +1,11 @@
 import logging
 
 from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from app.models.state_model import MultiAgentState
 from app.services.env_config_service import EnvConfigService
+from app.services.llm_client_service import chat_model
+from app.services.sql_query_service import compact_result
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +13,7 @@ logger = logging.getLogger(__name__)
 class SummaryAgent:
   def __init__(self, env_config: EnvConfigService):
     self.env_config = env_config
-    self.llm = ChatOpenAI(
-      model="gpt-4o",
-      api_key=env_config.OPENAI_API_KEY,
-    )
+    self.llm = chat_model(env_config, "gpt-4o")
 
   async def summary(self, state: MultiAgentState):
     last_message = state["messages"][-1].content
@@ -51,7 +49,17 @@ class SummaryAgent:
       content=f"User file attachment data: {state['attachment_contents']}"
     )
 
-    summary_messages = [system_prompt, user_message, research_message, attachment_contents_message]
+    dataset_message = HumanMessage(
+      content=f"Dataset query result: {compact_result(state.get('dataset_result'))}"
+    )
+
+    summary_messages = [
+      system_prompt,
+      user_message,
+      research_message,
+      attachment_contents_message,
+      dataset_message,
+    ]
 
     try:
       logger.debug("Generating summary response.")
@@ -1,18 +1,22 @@
 import logging
 
 from langchain_core.messages import SystemMessage
-from langchain_openai import ChatOpenAI
 
+from app.agents.research_agent import ResearchAgent, needs_web_research
 from app.models.state_model import MultiAgentState
 from app.services.env_config_service import EnvConfigService
+from app.services.llm_client_service import chat_model
+from app.services.metrics_service import metrics
+from app.services.research_memory_service import recall
 
 logger = logging.getLogger(__name__)
 
 
 class SupervisorAgent:
-  def __init__(self, env_config: EnvConfigService):
+  def __init__(self, env_config: EnvConfigService, research_agent: ResearchAgent | None = None):
     self.env_config = env_config
-    self.llm = ChatOpenAI(model="gpt-4o-mini", api_key=env_config.OPENAI_API_KEY)
+    self.research_agent = research_agent
+    self.llm = chat_model(env_config, "gpt-4o-mini")
 
   async def supervise(self, state: MultiAgentState):
     messages = state["messages"]
@@ -21,11 +25,14 @@ class SupervisorAgent:
     if not last_message:
       return {"current_agent": "supervisor"}
 
+    request = str(getattr(last_message, "content", last_message))
+    research_data = state.get("research_data") or self._recall_research(state, request)
+
     supervisor_prompt = f"""
     You are a supervisor agent managing a multi-agent system. 
     Analyze the following user request and determine the best workflow:
     
-    User request: {last_message.content if hasattr(last_message, "content") else str(last_message)}
+    User request: {request}
     
     Available agents:
     1. researcher - For web searches and information gathering
@@ -34,10 +41,12 @@ class SupervisorAgent:
     4. line_chart - For generating eChart options for a line chart
     5. bar_chart - For generating eChart options for a bar chart
     6. component_supervisor - For supervising the building process of component generation
+    7. sql - For questions about internal business metrics in the dataset table (products, revenue, expenses, employees by year/month)
     
     Current state:
-    - Research data {"IS available" if state.get("research_data") else "is NOT available"}
+    - Research data {"IS available" if research_data else "is NOT available"}
     - User attached file data {"IS available" if state.get("attachment_contents") else "is NOT available"}
+    - Dataset query result {"IS available" if state.get("dataset_result") else "is NOT available"}
     - Iteration: {state.get("iteration_count", 0)}
     
     ENHANCED ANALYSIS RULES:
@@ -50,6 +59,9 @@ class SupervisorAgent:
     
     2. ROUTING LOGIC:
        - If research data IS available → do NOT send to researcher again
+       - If the request refers to the dataset/database or internal product revenue, expenses or employees:
+         * Dataset query result is NOT available → sql
+         * Dataset query result IS available → do NOT send to sql again, continue with the visualization, component or summary agent
        - If research data is NOT available and request requires external information → researcher
        - If user attached file data IS available:
          * For analysis/summary requests (keywords: analyze, summarize, extract, insights, explain, interpret) → summary
@@ -66,11 +78,26 @@ class SupervisorAgent:
        - If request is ambiguous about which files to use → default to summary for clarification
        - When all processing complete → END
     
-    Respond with ONLY the next agent name: researcher, summary, chat, line_chart, bar_chart, component_supervisor or END.
+    Respond with ONLY the next agent name: researcher, summary, chat, line_chart, bar_chart, component_supervisor, sql or END.
     """
 
+    speculating = (
+      self.env_config.SPECULATIVE_RESEARCH
+      and self.research_agent is not None
+      and not research_data
+      and needs_web_research(request)
+    )
+    if speculating:
+      # Research runs concurrently with the routing call, kept only if routed to researcher
+      self.research_agent.speculate(state)
+
     system_message = SystemMessage(content=supervisor_prompt)
-    response = await self.llm.ainvoke([system_message])
+    try:
+      response = await self.llm.ainvoke([system_message])
+    except BaseException:
+      if speculating:
+        self.research_agent.resolve_speculation("END")
+      raise
 
     next_agent = response.content.strip().lower()
 
@@ -80,7 +107,27 @@ class SupervisorAgent:
     if state.get("iteration_count", 0) > 5:
       next_agent = "END"
 
-    return {
+    if speculating:
+      self.research_agent.resolve_speculation(next_agent)
+
+    update = {
       "current_agent": next_agent,
       "iteration_count": state.get("iteration_count", 0) + 1,
     }
+    if research_data and not state.get("research_data"):
+      update["research_data"] = research_data
+    return update
+
+  def _recall_research(self, state: MultiAgentState, request: str) -> str:
+    """Findings of an earlier turn this request follows up on, so it skips the researcher."""
+    if not state.get("research_memory") or self.env_config.RESEARCH_MEMORY_TTL_SECONDS <= 0:
+      return ""
+
+    entry = recall(state["research_memory"], request, self.env_config.RESEARCH_MEMORY_TTL_SECONDS)
+    if entry is None:
+      metrics.increment("research.memory.misses")
+      return ""
+
+    logger.debug(f"Reusing research from an earlier turn: {entry['request']}")
+    metrics.increment("research.memory.hits")
+    return entry["findings"]
@@ -2,19 +2,154 @@ import json
 import logging
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from app.models.state_model import MultiAgentState
+from app.models.table_query_model import TableQuery
+from app.models.ui_descriptor_model import TableDescriptor
+from app.services.data_source_service import DataSourceService, reads_dataset
 from app.services.env_config_service import EnvConfigService
+from app.services.json_repair_service import repair_descriptor
+from app.services.model_cascade_service import descriptor_validator, model_cascade
+from app.services.sql_query_service import compact_result
+from app.services.table_query_service import TableQueryService, to_python
 
 logger = logging.getLogger(__name__)
 
+SAMPLE_VALUES = 3
+
 
 class TableAgent:
-  def __init__(self, env_config: EnvConfigService):
+  def __init__(self, env_config: EnvConfigService, data_source: DataSourceService):
     self.env_config = env_config
-    self.llm = ChatOpenAI(model="gpt-4.1", api_key=env_config.OPENAI_API_KEY)
-    self.llm_with_structured_output = self.llm.with_structured_output(method="json_mode")
+    self.data_source = data_source
+    self.table_query = TableQueryService(data_source)
+    self.llm_cascade = model_cascade(env_config, "table", "gpt-4.1")
+
+  def _next_table_step(self, todo: dict, table_components: list) -> str | None:
+    produced_ids = {table.get("id") for table in table_components if isinstance(table, dict)}
+
+    for step in todo.values():
+      if not isinstance(step, dict) or step.get("fulfilled"):
+        continue
+      description = str(step.get("description", ""))
+      if "table" not in description.lower():
+        continue
+      if any(table_id and table_id in description for table_id in produced_ids):
+        continue
+      return description
+
+    return None
+
+  async def _query_table(self, state: MultiAgentState, plan_text: str, todo: dict):
+    """Describe the next table as a server-side query; the model never writes rows.
+
+    Returns the component and whether it reads live `dataset` rows.
+    """
+    step = self._next_table_step(todo, state.get("table_component", []))
+    if not step:
+      return None
+
+    # Steps explicitly sourced from web research are left to the model
+    if "research_data" in step and "attachment" not in step.lower():
+      return None
+
+    last_message = state["messages"][-1].content
+    tables = await self.data_source.get_tables(
+      state.get("session_id"), f"{last_message} {plan_text} {step}", state.get("dataset_result")
+    )
+    if not tables:
+      return None
+
+    schema = [
+      {
+        "table": table.name,
+        "row_count": table.row_count,
+        "columns": [
+          {
+            "name": column,
+            "type": table.column_type(column),
+            "sample": to_python(table.columns[column][:SAMPLE_VALUES]),
+          }
+          for column in table.columns
+        ],
+      }
+      for table in tables
+    ]
+
+    system_message = SystemMessage(
+      content="""
+    You are the Table Agent. Map the table step onto one of the available tables.
+    You only choose the query: rows are fetched and paginated by the server.
+
+    Respond with ONLY a JSON object:
+    {
+      "id": "<snake_case_id ending in _table, reuse the id named in the step if any>",
+      "title": "<Title>",
+      "table": "<table name>",
+      "columns": ["<column>", ...],
+      "filters": [{"column": "<column>", "op": "eq|ne|gt|gte|lt|lte|contains|in", "value": <value>}],
+      "sort": [{"column": "<column>", "direction": "asc|desc"}]
+    }
+
+    Use only table and column names from the schema. If the step cannot be served from these
+    tables, respond with {}.
+    """
+    )
+    human_message = HumanMessage(
+      content=f"Table step: {step}\n\nUser request: {last_message}\n\nSchema: {json.dumps(schema)}"
+    )
+
+    try:
+      response = await self.llm_cascade.ainvoke([system_message, human_message])
+    except Exception as e:
+      logger.error(f"Table query selection failed: {e}")
+      return None
+
+    if not isinstance(response, dict) or not response.get("table"):
+      return None
+
+    table = next((table for table in tables if table.name == response["table"]), None)
+    if table is None:
+      return None
+
+    try:
+      query = TableQuery(
+        session_id=state.get("session_id"),
+        table=table.name,
+        columns=[column for column in response.get("columns") or [] if column in table.columns],
+        filters=response.get("filters") or [],
+        sort=response.get("sort") or [],
+      )
+      component = self.table_query.build_component(
+        component_id=response.get("id") or "data_table",
+        title=response.get("title") or "",
+        table=table,
+        query=query,
+      )
+    except Exception as e:
+      logger.error(f"Table query for step '{step}' is not valid: {e}")
+      return None
+
+    logger.info(f"Built paginated table {component['id']} over {table.name}.")
+    return component, reads_dataset([table])
+
+  def _table_ready(self, state: MultiAgentState, table: dict, used_dataset: bool = False):
+    ui_event = {"type": "ui_event", "target": "loading_table", "component": table}
+
+    table_message = AIMessage(content=json.dumps(ui_event))
+    messages = state.get("messages", [])
+    messages.append(table_message)
+
+    table_state = state.get("table_component", [])
+    table_state.append(table)
+
+    return {
+      "table_component": table_state,
+      "current_agent": "component_supervisor",
+      "messages": messages,
+      "table_ready": True,
+      "used_dataset": used_dataset,
+    }
 
   async def generate(self, state: MultiAgentState):
     dashboard_plan_state = state.get("dashboard_plan", {})
@@ -26,6 +161,11 @@ class TableAgent:
       plan_text = str(dashboard_plan_state)
       todo = {}
 
+    queried = await self._query_table(state, plan_text, todo)
+    if queried:
+      queried_table, used_dataset = queried
+      return self._table_ready(state, queried_table, used_dataset)
+
     table_prompt = """
     You are the Table Agent.
     Task: From plan_text and TODO list, generate a single table component JSON descriptor for the next unfulfilled table-related step.
@@ -112,6 +252,8 @@ class TableAgent:
     1. Researched data: {state["research_data"]}
     
     2. Attachment data: {state["attachment_contents"]}
+    
+    3. Dataset query result: {compact_result(state.get("dataset_result"))}
     """
     )
 
@@ -119,26 +261,14 @@ class TableAgent:
 
     try:
       logger.debug("Generating table response.")
-      response = await self.llm_with_structured_output.ainvoke(message)
+      response = await self.llm_cascade.ainvoke(
+        message, validate=descriptor_validator(TableDescriptor), repair=repair_descriptor
+      )
 
       dict_response = response if isinstance(response, (dict, list)) else json.loads(response)
 
       if dict_response and dict_response.get("id"):
-        ui_event = {"type": "ui_event", "target": "loading_table", "component": dict_response}
-
-        table_message = AIMessage(content=json.dumps(ui_event))
-        messages = state.get("messages", [])
-        messages.append(table_message)
-
-        table_state = state.get("table_component", [])
-        table_state.append(dict_response)
-
-        return {
-          "table_component": table_state,
-          "current_agent": "component_supervisor",
-          "messages": messages,
-          "table_ready": True,
-        }
+        return self._table_ready(state, dict_response)
 
       # Handle empty response
       table_state = state.get("table_component", [])
@@ -2,10 +2,12 @@ import json
 import logging
 
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
 
 from app.models.state_model import MultiAgentState
 from app.services.env_config_service import EnvConfigService
+from app.services.llm_cache_service import structured_output
+from app.services.llm_client_service import chat_model
+from app.services.ui_assembler_service import UiAssembler
 
 logger = logging.getLogger(__name__)
 
@@ -13,13 +15,31 @@ logger = logging.getLogger(__name__)
 class UiBuilderAgent:
   def __init__(self, env_config: EnvConfigService):
     self.env_config = env_config
-    self.llm = ChatOpenAI(model="gpt-4.1", api_key=env_config.OPENAI_API_KEY)
-    self.llm_with_structured_output = self.llm.with_structured_output(method="json_mode")
+    self.llm = chat_model(env_config, "gpt-4.1")
+    self.llm_with_structured_output = structured_output(self.llm, "ui_builder", env_config)
+    self.assembler = UiAssembler()
+
+  def _ui_ready(self, ui_descriptor: dict):
+    ui_message = AIMessage(content=json.dumps(ui_descriptor))
+    return {"ui_descriptor": ui_descriptor, "messages": [ui_message], "current_agent": "END"}
 
   async def generate(self, state: MultiAgentState):
     dashboard_plan_state = state.get("dashboard_plan", {})
     ui_descriptor_target = state.get("ui_descriptor_target", "assembled_dashboard_section")
 
+    if not self.env_config.UI_BUILDER_USE_LLM:
+      try:
+        ui_descriptor = self.assembler.assemble(
+          section=state.get("section_component"),
+          cards=state.get("card_component", []),
+          tables=state.get("table_component", []),
+          target=ui_descriptor_target,
+        )
+        logger.debug("Assembled UI descriptor deterministically.")
+        return self._ui_ready(ui_descriptor)
+      except Exception as e:
+        logger.error(f"Deterministic UI assembly failed, falling back to the LLM: {e}")
+
     if isinstance(dashboard_plan_state, dict):
       plan_text = dashboard_plan_state.get("dashboard_plan", "")
       todo = dashboard_plan_state.get("todo", {})
@@ -198,9 +218,7 @@ class UiBuilderAgent:
 
       dict_response = response if isinstance(response, dict) else json.loads(response)
 
-      ui_message = AIMessage(content=json.dumps(dict_response))
-
-      return {"ui_descriptor": dict_response, "messages": [ui_message], "current_agent": "END"}
+      return self._ui_ready(dict_response)
     except Exception as e:
       logger.error(f"Failed to generate UI builder response: {e}")
       return {"current_agent": "component_supervisor"}
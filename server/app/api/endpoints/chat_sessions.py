@@ -47,6 +47,21 @@ async def get_messages_by_sessions_id(
     )
 
 
+@router.get("/message_option")
+async def get_message_option(
+  session_id: str, message_id: int, service: Annotated[ChatSessionService, Depends(get_db_session)]
+):
+  try:
+    return await service.get_message_option(session_id, message_id)
+  except HTTPException:
+    raise
+  except Exception as e:
+    logger.error(f"Couldn't retrieve chart of message {message_id} in session {session_id}: {e}")
+    raise HTTPException(
+      status_code=500, detail=f"Retrieving chart of message {message_id} has failed. {e}"
+    )
+
+
 @router.get("/files")
 async def get_files_by_session_id(
   session_id: str, service: Annotated[FileService, Depends(get_file_service_db_session)]
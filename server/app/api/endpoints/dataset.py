@@ -0,0 +1,24 @@
+import logging
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.models.dataset_aggregate_model import DatasetAggregateRequest, DatasetAggregateResponse
+from app.services.dataset_service import DatasetService, get_dataset_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post("/aggregate", response_model=DatasetAggregateResponse)
+async def aggregate_dataset(
+  req: DatasetAggregateRequest, service: Annotated[DatasetService, Depends(get_dataset_service)]
+):
+  try:
+    return service.aggregate(req)
+  except HTTPException:
+    raise
+  except Exception as e:
+    logger.error(f"Dataset aggregation failed: {e}")
+    raise HTTPException(status_code=500, detail=f"Dataset aggregation has failed. {e}")
@@ -0,0 +1,35 @@
+import logging
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+
+from app.services.metrics_service import MetricsService, get_metrics_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.get("")
+async def get_metrics(service: Annotated[MetricsService, Depends(get_metrics_service)]):
+  counters = service.snapshot()
+  new_connection_rate = service.ratio("llm.http.connections_opened", "llm.http.requests")
+  cascade_agents = [
+    name.split(".")[1]
+    for name in counters
+    if name.startswith("cascade.") and name.endswith(".calls")
+  ]
+  return {
+    "counters": counters,
+    "research_speculation_hit_rate": service.ratio(
+      "research.speculation.hits", "research.speculation.started"
+    ),
+    "llm_cache_hit_rate": service.ratio("llm.cache.hits", "llm.cache.lookups"),
+    # Share of model API requests served over an already open connection
+    "llm_connection_reuse_rate": (None if new_connection_rate is None else 1 - new_connection_rate),
+    # Share of an agent's calls the cheap model could not settle on its own
+    "model_cascade_escalation_rates": {
+      agent: service.ratio(f"cascade.{agent}.escalations", f"cascade.{agent}.calls")
+      for agent in cascade_agents
+    },
+  }
@@ -11,6 +11,7 @@ from app.services.multi_agent_orchestrator_service import (
   MultiAgentOrchestratorService,
   get_db_session,
 )
+from app.services.replay_cache_service import ReplayCacheService, get_replay_cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -58,3 +59,15 @@ async def multi_agent_generate(
   except Exception as e:
     logger.error(f"ENDPOINT: multi-agent -> Generating response failed: {e}")
     raise HTTPException(status_code=500, detail=f"Multi agent generation have failed, {e}")
+
+
+@router.delete("/replay-cache")
+async def invalidate_replay_cache(
+  service: Annotated[ReplayCacheService, Depends(get_replay_cache_service)],
+):
+  try:
+    deleted = await service.invalidate()
+    return {"deleted": deleted}
+  except Exception as e:
+    logger.error(f"ENDPOINT: multi-agent -> Invalidating the replay cache failed: {e}")
+    raise HTTPException(status_code=500, detail=f"Invalidating the replay cache failed: {e}")
@@ -0,0 +1,26 @@
+import logging
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.models.table_query_model import TableRowsRequest, TableRowsResponse
+from app.services.table_query_service import TableQueryService, get_table_query_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+@router.post("/rows", response_model=TableRowsResponse)
+async def get_table_rows(
+  req: TableRowsRequest, service: Annotated[TableQueryService, Depends(get_table_query_service)]
+):
+  try:
+    return await service.get_rows(req)
+  except HTTPException:
+    raise
+  except Exception as e:
+    logger.error(f"Couldn't retrieve rows for table {req.query.table}: {e}")
+    raise HTTPException(
+      status_code=500, detail=f"Retrieving rows for table {req.query.table} has failed. {e}"
+    )
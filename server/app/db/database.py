@@ -1,17 +1,47 @@
+import logging
+
+from pydantic_core import to_json
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.services.env_config_service import get_env_configs
 
+logger = logging.getLogger(__name__)
+
 settings = get_env_configs()
 base_url = settings.postgres_url.unicode_string()
 connection_string = f"{base_url}?options=-c%20search_path%3D{settings.PSQL_CHAT_SESSIONS_SCHEMA}"
 
-engine = create_engine(connection_string)
+# JSON columns (chart options, components) are encoded by pydantic-core instead of json.dumps
+engine = create_engine(connection_string, json_serializer=lambda value: to_json(value).decode())
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Separate small pool for agent-generated SQL: every transaction is read-only and time-boxed.
+# It only exists with a dedicated read-only role, never with the main credentials.
+readonly_engine = None
+ReadOnlySessionLocal = None
+if settings.readonly_postgres_url is None:
+  logger.warning(
+    "PSQL_READONLY_USERNAME/PSQL_READONLY_PASSWORD are not set to a dedicated role, "
+    "the SQL agent is disabled."
+  )
+else:
+  readonly_engine = create_engine(
+    settings.readonly_postgres_url.unicode_string(),
+    pool_size=settings.SQL_POOL_SIZE,
+    max_overflow=0,
+    connect_args={
+      "options": (
+        f"-c search_path={settings.PSQL_CHAT_SESSIONS_SCHEMA} "
+        "-c default_transaction_read_only=on "
+        f"-c statement_timeout={settings.SQL_STATEMENT_TIMEOUT_MS}"
+      )
+    },
+  )
+  ReadOnlySessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=readonly_engine)
+
 Base = declarative_base()
 
 
@@ -21,3 +51,15 @@ def get_db():
     yield db
   finally:
     db.close()
+
+
+def get_readonly_db():
+  if ReadOnlySessionLocal is None:
+    yield None
+    return
+
+  db = ReadOnlySessionLocal()
+  try:
+    yield db
+  finally:
+    db.close()
@@ -5,10 +5,15 @@ from fastapi.concurrency import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
 from langgraph.checkpoint.postgres.aio import AsyncPostgresSaver
 
-from app.api.endpoints import chat_sessions, multi_agent
+from app.api.endpoints import chat_sessions, dataset, metrics, multi_agent, tables
 from app.models.chat_session import ChatSession, FileRecord, Message  # noqa: F401
+from app.models.llm_response_cache import LlmResponseCacheEntry  # noqa: F401
+from app.models.research_cache import ResearchCacheEntry  # noqa: F401
+from app.models.response_replay_cache import ResponseReplayEntry  # noqa: F401
 from app.models.test_dataset import Dataset  # noqa: F401
 from app.services.env_config_service import get_env_configs
+from app.services.llm_client_service import close_llm_http_client
+from app.services.search_client_service import close_search_client
 
 logging.basicConfig(
   level=logging.INFO,
@@ -35,6 +40,9 @@ async def lifespan(_app: FastAPI):
     _app.state.checkpointer = saver
     yield
 
+  await close_search_client()
+  await close_llm_http_client()
+
 
 app = FastAPI(lifespan=lifespan)
 
@@ -51,6 +59,9 @@ app.add_middleware(
 
 app.include_router(multi_agent.router, prefix="/agent", tags=["Multi Agent"])
 app.include_router(chat_sessions.router, prefix="/chat_sessions", tags=["Chat Sessions"])
+app.include_router(tables.router, prefix="/tables", tags=["Tables"])
+app.include_router(dataset.router, prefix="/dataset", tags=["Dataset"])
+app.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
 
 
 @app.get("/health")
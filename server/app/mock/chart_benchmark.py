@@ -0,0 +1,95 @@
+"""
+Benchmark of the chart post-model pipeline on large series.
+
+Times, per stage and for line and bar charts, what happens to a chart option between the
+model (or the chart builder) and the client: ChartConfig validation, LTTB downsampling,
+top-N category folding and serialization (json.dumps against pydantic-core), e.g.:
+
+  python -m app.mock.chart_benchmark --points 100000 --series 2
+  python -m app.mock.chart_benchmark --points 100000 --dirty
+
+`--dirty` mixes nulls and numeric strings into the series, as models sometimes write them,
+which exercises the slower conversion path of the validators.
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+from pydantic_core import to_json
+
+from app.models.bar_chart_model import ChartConfig as BarChartConfig
+from app.models.line_chart_model import ChartConfig as LineChartConfig
+from app.services.chart_postprocess_service import downsample_line_option, fold_bar_categories
+
+
+def build_option(points: int, series: int, chart_type: str, dirty: bool) -> dict:
+  rng = np.random.default_rng(0)
+  data = []
+  for index in range(series):
+    values = np.round(np.cumsum(rng.normal(size=points)) + 100 * (index + 1), 2).tolist()
+    if dirty:
+      values[::7] = [str(value) for value in values[::7]]
+      values[::11] = [None] * len(values[::11])
+    data.append({"name": f"series_{index}", "type": chart_type, "data": values})
+
+  return {
+    "title": {"text": "Benchmark"},
+    "toolbox": {"feature": {"saveAsImage": {}}},
+    "legend": {"data": [item["name"] for item in data]},
+    "xAxis": {"type": "category", "data": [f"label_{index}" for index in range(points)]},
+    "yAxis": {"type": "value"},
+    "tooltip": {"trigger": "axis", "axisPointer": {"label": {"backgroundColor": "#6a7985"}}},
+    "series": data,
+  }
+
+
+def timed(function, repeat: int):
+  """Best wall time of `repeat` runs in ms, with the last result."""
+  best, result = float("inf"), None
+  for _ in range(repeat):
+    started_at = time.perf_counter()
+    result = function()
+    best = min(best, time.perf_counter() - started_at)
+  return best * 1000, result
+
+
+def main(args: argparse.Namespace) -> None:
+  print(f"{args.points} points x {args.series} series{' (dirty)' if args.dirty else ''}")
+
+  for chart_type, chart_config in (("line", LineChartConfig), ("bar", BarChartConfig)):
+    option = build_option(args.points, args.series, chart_type, args.dirty)
+
+    validate_ms, validated = timed(
+      lambda: chart_config.model_validate(option).model_dump(), args.repeat
+    )
+    if chart_type == "line":
+      reduce_ms, reduced = timed(
+        lambda: downsample_line_option(validated, args.max_points), args.repeat
+      )
+    else:
+      reduce_ms, reduced = timed(
+        lambda: fold_bar_categories(validated, args.max_categories), args.repeat
+      )
+    dumps_ms, encoded = timed(lambda: json.dumps(validated), args.repeat)
+    to_json_ms, _ = timed(lambda: to_json(validated), args.repeat)
+
+    reduced_points = len((reduced or validated)["series"][0]["data"])
+    print(
+      f"{chart_type:>5}: validate {validate_ms:7.1f} ms | "
+      f"{'lttb' if chart_type == 'line' else 'fold'} {reduce_ms:6.1f} ms "
+      f"(-> {reduced_points} points) | json.dumps {dumps_ms:6.1f} ms | "
+      f"to_json {to_json_ms:6.1f} ms | {len(encoded) / 1e6:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+  parser.add_argument("--points", type=int, default=100_000)
+  parser.add_argument("--series", type=int, default=2)
+  parser.add_argument("--repeat", type=int, default=5)
+  parser.add_argument("--max-points", type=int, default=1000)
+  parser.add_argument("--max-categories", type=int, default=20)
+  parser.add_argument("--dirty", action="store_true", help="mix nulls and numeric strings in")
+  main(parser.parse_args())
@@ -0,0 +1,137 @@
+"""
+Load generator for the `/agent/` SSE endpoint.
+
+Sends `--requests` requests at `--concurrency` in flight, each in its own chat session, and
+reports time to first byte, time to first component (first content frame carrying a
+component or chart option), total latency percentiles and frames per second. Pair it with
+`openai_stub_server` to measure the server's own overhead without network access, e.g.:
+
+  python -m app.mock.load_test --concurrency 8 --requests 64 --input "Build a sales dashboard"
+
+Replay caching is bypassed unless `--allow-replay` is given, so every request runs the graph.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+import httpx
+
+
+@dataclass
+class RequestResult:
+  ttfb: Optional[float] = None
+  first_component: Optional[float] = None
+  total: Optional[float] = None
+  frames: int = 0
+  error: Optional[str] = None
+
+
+def percentile(values: List[float], percent: float) -> float:
+  ordered = sorted(values)
+  index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+  return ordered[index]
+
+
+async def run_request(
+  client: httpx.AsyncClient, args: argparse.Namespace, session_id: int
+) -> RequestResult:
+  result = RequestResult()
+  payload = {"input": args.input, "session_id": str(session_id)}
+  if not args.allow_replay:
+    payload["no_cache"] = True
+
+  started_at = time.perf_counter()
+  try:
+    async with client.stream("POST", "/agent/", json=payload) as response:
+      response.raise_for_status()
+      async for line in response.aiter_lines():
+        if result.ttfb is None:
+          result.ttfb = time.perf_counter() - started_at
+        if not line.startswith("data: "):
+          continue
+
+        result.frames += 1
+        frame = json.loads(line[len("data: ") :])
+        is_component = frame.get("type") == "content" and (
+          frame.get("option")
+          or any(
+            not (event.get("component") or {}).get("props", {}).get("loading")
+            for event in frame.get("component") or []
+          )
+        )
+        if is_component and result.first_component is None:
+          result.first_component = time.perf_counter() - started_at
+    result.total = time.perf_counter() - started_at
+  except Exception as e:
+    result.error = str(e)
+
+  if args.cleanup:
+    try:
+      await client.delete("/chat_sessions/delete_session", params={"session_id": session_id})
+    except httpx.HTTPError:
+      pass
+  return result
+
+
+async def run(args: argparse.Namespace) -> List[RequestResult]:
+  semaphore = asyncio.Semaphore(args.concurrency)
+  limits = httpx.Limits(max_connections=args.concurrency)
+
+  async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+
+    async def bounded(index: int) -> RequestResult:
+      async with semaphore:
+        return await run_request(client, args, args.session_base + index)
+
+    return await asyncio.gather(*[bounded(index) for index in range(args.requests)])
+
+
+def report(results: List[RequestResult], elapsed: float) -> None:
+  succeeded = [result for result in results if result.error is None]
+  failed = len(results) - len(succeeded)
+
+  print(f"requests: {len(results)} ({failed} failed) in {elapsed:.2f}s")
+  print(f"throughput: {len(succeeded) / elapsed:.2f} req/s")
+  print(f"frames/sec: {sum(result.frames for result in succeeded) / elapsed:.1f}")
+
+  for name in ("ttfb", "first_component", "total"):
+    values = [getattr(result, name) for result in succeeded if getattr(result, name) is not None]
+    if not values:
+      print(f"{name:>16}: n/a")
+      continue
+    print(
+      f"{name:>16}: p50 {percentile(values, 50) * 1000:8.1f} ms | "
+      f"p90 {percentile(values, 90) * 1000:8.1f} ms | "
+      f"p99 {percentile(values, 99) * 1000:8.1f} ms | "
+      f"mean {statistics.mean(values) * 1000:8.1f} ms"
+    )
+
+  errors = sorted({result.error for result in results if result.error})
+  for error in errors[:5]:
+    print(f"error: {error}")
+
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+  parser.add_argument("--url", default="http://127.0.0.1:8000")
+  parser.add_argument("--input", default="Build a sales overview dashboard")
+  parser.add_argument("--concurrency", type=int, default=4)
+  parser.add_argument("--requests", type=int, default=16)
+  parser.add_argument("--timeout", type=float, default=300)
+  parser.add_argument("--session-base", type=int, default=900_000)
+  parser.add_argument("--allow-replay", action="store_true")
+  parser.add_argument("--cleanup", action="store_true", help="delete the load-test sessions")
+  args = parser.parse_args()
+
+  started_at = time.perf_counter()
+  results = asyncio.run(run(args))
+  report(results, time.perf_counter() - started_at)
+
+
+if __name__ == "__main__":
+  main()
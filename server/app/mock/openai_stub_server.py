@@ -0,0 +1,248 @@
+"""
+Local stand-in for the OpenAI chat completions API (plus the Tavily search API of
+`tavily_stub_server`), so the whole agent graph runs offline and for free.
+
+Run `python -m app.mock.openai_stub_server`, then start the server with
+OPENAI_BASE_URL=http://127.0.0.1:8766/v1 and TAVILY_BASE_URL=http://127.0.0.1:8766.
+
+Responses are canned per agent (recognised from its system prompt) and support streaming,
+json_mode and tool calls. Tuning:
+- STUB_LLM_LATENCY_MS: delay before the first token.
+- STUB_TOKENS_PER_SECOND: generation speed, 0 returns everything at once.
+- STUB_ROUTE: first agent the supervisor routes to (e.g. chat, component_supervisor).
+- STUB_RESPONSES_FILE: JSON object of agent name -> response (object for JSON agents, string
+  otherwise) overriding the canned ones.
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+import uuid
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+from app.mock.tavily_stub_server import search
+
+STUB_LLM_LATENCY_MS = int(os.getenv("STUB_LLM_LATENCY_MS", "300"))
+STUB_TOKENS_PER_SECOND = float(os.getenv("STUB_TOKENS_PER_SECOND", "80"))
+STUB_ROUTE = os.getenv("STUB_ROUTE", "component_supervisor")
+STUB_RESPONSES_FILE = os.getenv("STUB_RESPONSES_FILE")
+
+# Agent name -> phrase unique to its system prompt, checked in order
+AGENT_MARKERS = [
+  ("supervisor", "supervisor agent managing a multi-agent system"),
+  ("component_supervisor", "You are the Component Supervisor Agent"),
+  ("table_query", "Map the table step onto one of the available tables"),
+  ("section", "You are the Section Agent"),
+  ("card", "You are the Card Agent"),
+  ("table", "You are the Table Agent"),
+  ("ui_builder", "You are the UI Builder Agent"),
+  ("sql", "You are the SQL Agent"),
+  ("research", "You are a research agent"),
+  ("line_chart", "line chart visualization specialist"),
+  ("bar_chart", "bar chart visualization specialist"),
+  ("summary", "expert data analyst and summarizer"),
+  ("chat", "file-aware assistant"),
+]
+
+LOREM = (
+  "Revenue grew steadily across the period, driven mainly by the two largest products. "
+  "Expenses stayed flat while headcount increased slightly, so margins improved quarter over "
+  "quarter. The strongest month was November and the weakest was February."
+)
+
+CANNED_RESPONSES = {
+  "component_supervisor": {
+    "interpretation": "Sales overview dashboard.",
+    "dashboard_plan": "One section holding a revenue card and a product table.",
+    "todo": {
+      "step1": {"description": "Create section sales_overview_section", "fulfilled": False},
+      "step2": {"description": "Create card total_revenue_card", "fulfilled": False},
+      "step3": {"description": "Create table product_table", "fulfilled": False},
+      "step4": {"description": "Assemble the dashboard with ui_builder", "fulfilled": False},
+    },
+    "next_agent": "section",
+  },
+  "table_query": {},
+  "section": {
+    "id": "sales_overview_section",
+    "type": "section",
+    "props": {"title": "Sales overview", "subtitle": "", "loading": False, "children": []},
+  },
+  "card": {
+    "id": "total_revenue_card",
+    "type": "card",
+    "props": {
+      "title": "Total revenue",
+      "value": "1,204,500",
+      "unit": "USD",
+      "trend": "up",
+      "loading": False,
+      "size": "md",
+      "bordered": True,
+      "shadow": True,
+      "rounded": True,
+      "children": [],
+    },
+  },
+  "table": {
+    "id": "product_table",
+    "type": "table",
+    "props": {
+      "title": "Revenue by product",
+      "loading": False,
+      "columns": [{"key": "product", "label": "Product"}, {"key": "revenue", "label": "Revenue"}],
+      "rows": [{"product": "Alpha", "revenue": 704500}, {"product": "Beta", "revenue": 500000}],
+    },
+  },
+  "ui_builder": {},
+  "sql": {},
+  "line_chart": {},
+  "bar_chart": {},
+  "research": LOREM,
+  "summary": LOREM,
+  "chat": LOREM,
+}
+
+if STUB_RESPONSES_FILE:
+  with open(STUB_RESPONSES_FILE) as responses_file:
+    CANNED_RESPONSES.update(json.load(responses_file))
+
+app = FastAPI()
+app.post("/search")(search)
+
+
+def detect_agent(messages: list) -> str:
+  system_prompt = " ".join(
+    str(message.get("content") or "") for message in messages if message.get("role") == "system"
+  )
+  for agent, marker in AGENT_MARKERS:
+    if marker in system_prompt:
+      return agent
+  return "chat"
+
+
+def build_reply(body: dict) -> dict:
+  """Content or tool calls the stub answers with, as an assistant message."""
+  messages = body.get("messages", [])
+  agent = detect_agent(messages)
+
+  if agent == "supervisor":
+    iteration = re.search(r"Iteration: (\d+)", str(messages[0].get("content")))
+    return {"content": STUB_ROUTE if iteration and iteration.group(1) == "0" else "END"}
+
+  has_tool_results = any(message.get("role") == "tool" for message in messages)
+  if body.get("tools") and not has_tool_results:
+    query = str(messages[-1].get("content") or "")[:120]
+    return {
+      "tool_calls": [
+        {
+          "id": f"call_{uuid.uuid4().hex[:12]}",
+          "type": "function",
+          "function": {
+            "name": body["tools"][0]["function"]["name"],
+            "arguments": json.dumps({"input": query}),
+          },
+        }
+      ]
+    }
+
+  response = CANNED_RESPONSES.get(agent, LOREM)
+  return {"content": response if isinstance(response, str) else json.dumps(response)}
+
+
+def token_count(text: str) -> int:
+  return max(1, len(text) // 4)
+
+
+def usage(body: dict, completion_text: str) -> dict:
+  prompt_tokens = token_count(json.dumps(body.get("messages", [])))
+  completion_tokens = token_count(completion_text)
+  return {
+    "prompt_tokens": prompt_tokens,
+    "completion_tokens": completion_tokens,
+    "total_tokens": prompt_tokens + completion_tokens,
+  }
+
+
+def chunks_of(text: str):
+  """~4-character pieces, roughly one token each."""
+  return [text[index : index + 4] for index in range(0, len(text), 4)] or [""]
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+  body = await request.json()
+  reply = build_reply(body)
+  content = reply.get("content") or ""
+  completion_text = content or json.dumps(reply.get("tool_calls"))
+  finish_reason = "tool_calls" if reply.get("tool_calls") else "stop"
+
+  completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+  created = int(time.time())
+  model = body.get("model", "stub")
+
+  await asyncio.sleep(STUB_LLM_LATENCY_MS / 1000)
+
+  if not body.get("stream"):
+    if STUB_TOKENS_PER_SECOND > 0:
+      await asyncio.sleep(token_count(completion_text) / STUB_TOKENS_PER_SECOND)
+    return {
+      "id": completion_id,
+      "object": "chat.completion",
+      "created": created,
+      "model": model,
+      "choices": [
+        {
+          "index": 0,
+          "message": {"role": "assistant", "content": content or None, **reply},
+          "finish_reason": finish_reason,
+        }
+      ],
+      "usage": usage(body, completion_text),
+    }
+
+  def frame(delta: dict, finish: str | None = None) -> str:
+    chunk = {
+      "id": completion_id,
+      "object": "chat.completion.chunk",
+      "created": created,
+      "model": model,
+      "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+  async def stream():
+    yield frame({"role": "assistant", "content": ""})
+
+    if reply.get("tool_calls"):
+      tool_calls = [{"index": index, **call} for index, call in enumerate(reply["tool_calls"])]
+      yield frame({"tool_calls": tool_calls})
+    else:
+      for piece in chunks_of(content):
+        if STUB_TOKENS_PER_SECOND > 0:
+          await asyncio.sleep(1 / STUB_TOKENS_PER_SECOND)
+        yield frame({"content": piece})
+
+    yield frame({}, finish_reason)
+    if (body.get("stream_options") or {}).get("include_usage"):
+      usage_chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": created,
+        "model": model,
+        "choices": [],
+        "usage": usage(body, completion_text),
+      }
+      yield f"data: {json.dumps(usage_chunk)}\n\n"
+    yield "data: [DONE]\n\n"
+
+  return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+  uvicorn.run(app, host="127.0.0.1", port=int(os.getenv("STUB_PORT", "8766")))
@@ -4,6 +4,7 @@ This script populates the database with realistic business data for testing purp
 """
 
 import random
+from datetime import date
 
 from sqlalchemy.orm import Session
 
@@ -141,6 +142,7 @@ def generate_mock_dataset(db: Session, num_products: int = 10):
           product_name=product_name,
           year=year,
           month=month,
+          period=date(int(year), month_idx + 1, 1),
           revenue=metrics["revenue"],
           expenses=metrics["expenses"],
           current_employees=metrics["current_employees"],
@@ -0,0 +1,47 @@
+"""
+Local stand-in for the Tavily search API.
+Run it and point TAVILY_BASE_URL at it to exercise research without network access or API
+credits, e.g. `python -m app.mock.tavily_stub_server` then TAVILY_BASE_URL=http://127.0.0.1:8765.
+STUB_LATENCY_MS / STUB_FAILURE_RATE simulate slow or flaky upstreams for retry testing.
+"""
+
+import asyncio
+import os
+import random
+
+import uvicorn
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+STUB_LATENCY_MS = int(os.getenv("STUB_LATENCY_MS", "200"))
+STUB_FAILURE_RATE = float(os.getenv("STUB_FAILURE_RATE", "0"))
+
+app = FastAPI()
+
+
+class SearchRequest(BaseModel):
+  query: str
+  max_results: int = 1
+
+
+@app.post("/search")
+async def search(req: SearchRequest):
+  await asyncio.sleep(STUB_LATENCY_MS / 1000)
+
+  if random.random() < STUB_FAILURE_RATE:
+    raise HTTPException(status_code=503, detail="Stubbed upstream failure.")
+
+  results = [
+    {
+      "title": f"Stub result {index + 1} for {req.query}",
+      "url": f"https://example.com/{index + 1}",
+      "content": f"Stubbed findings about {req.query}: revenue grew 12% year over year in 2025.",
+      "score": round(1 - index * 0.1, 2),
+    }
+    for index in range(req.max_results)
+  ]
+  return {"query": req.query, "results": results}
+
+
+if __name__ == "__main__":
+  uvicorn.run(app, host="127.0.0.1", port=int(os.getenv("STUB_PORT", "8765")))
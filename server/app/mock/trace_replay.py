@@ -0,0 +1,67 @@
+"""
+Replays a recorded graph trace (see TRACE_RECORDING_DIR) through the SSE translation layer.
+
+No model, search or database is involved: the recorded events are fed to SseTranslator
+exactly as the live stream would, at their original pace (`--realtime`) or back to back.
+Reports events/sec and translation time per event, and can write the produced frames to a
+file for diffing stream output between versions, e.g.:
+
+  python -m app.mock.trace_replay traces/20251024T101500-session-12.jsonl.gz --repeat 200
+  python -m app.mock.trace_replay trace.jsonl.gz --frames-out frames.txt
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.services.sse_translator_service import SseTranslator
+from app.services.trace_service import read_trace, replay
+
+
+async def replay_once(events, realtime: bool):
+  translator = SseTranslator()
+  frames = []
+  translate_seconds = 0.0
+
+  async for event in replay(events, realtime=realtime):
+    started_at = time.perf_counter()
+    frames.extend(translator.translate(event))
+    translate_seconds += time.perf_counter() - started_at
+
+  return frames, translator.message(), translate_seconds
+
+
+async def main(args: argparse.Namespace) -> None:
+  header, events = read_trace(args.trace)
+  recorded_seconds = events[-1][0] if events else 0.0
+  print(f"trace: {header.get('input')!r} (session {header.get('session_id')})")
+  print(f"events: {len(events)} recorded over {recorded_seconds:.2f}s")
+
+  translate_seconds = 0.0
+  started_at = time.perf_counter()
+  for _ in range(args.repeat):
+    frames, message, run_seconds = await replay_once(events, args.realtime)
+    translate_seconds += run_seconds
+  elapsed = time.perf_counter() - started_at
+
+  total_events = len(events) * args.repeat
+  print(
+    f"frames: {len(frames)} per run, persisted: {[key for key, value in message.items() if value]}"
+  )
+  print(f"replayed {args.repeat} run(s) in {elapsed:.3f}s ({total_events / elapsed:.0f} events/s)")
+  if total_events:
+    print(f"translation: {translate_seconds / total_events * 1e6:.1f} µs/event")
+
+  if args.frames_out:
+    with open(args.frames_out, "w") as frames_file:
+      frames_file.writelines(frames)
+    print(f"frames written to {args.frames_out}")
+
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+  parser.add_argument("trace")
+  parser.add_argument("--realtime", action="store_true", help="keep the recorded pacing")
+  parser.add_argument("--repeat", type=int, default=1)
+  parser.add_argument("--frames-out")
+  asyncio.run(main(parser.parse_args()))
@@ -2,6 +2,8 @@ from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.models.chart_data import clean_labels, clean_numbers
+
 
 class Title(BaseModel):
   text: str
@@ -21,16 +23,8 @@ class Legend(BaseModel):
   @field_validator("data", mode="before")
   @classmethod
   def clean_data(cls, v):
-    if not v or v is None:
-      return []
-
     # Filter out None/null values and convert to strings
-    cleaned_data = []
-    for item in v:
-      if item is not None and str(item).strip():
-        cleaned_data.append(str(item).strip())
-
-    return cleaned_data
+    return clean_labels(v)
 
 
 class XAxis(BaseModel):
@@ -51,16 +45,8 @@ class XAxis(BaseModel):
   @field_validator("data", mode="before")
   @classmethod
   def clean_data(cls, v):
-    if not v or v is None:
-      return []
-
     # Filter out None/null values and convert to strings
-    cleaned_data = []
-    for item in v:
-      if item is not None and str(item).strip():
-        cleaned_data.append(str(item).strip())
-
-    return cleaned_data
+    return clean_labels(v)
 
 
 class AxisLabel(BaseModel):
@@ -106,7 +92,8 @@ class DataItem(BaseModel):
 
 class SeriesItem(BaseModel):
   name: str = Field(default=None, description="Series name")
-  data: List[Union[int, float, DataItem]] = Field(default_factory=list, description="Series data")
+  # Numbers are floats after clean_data, so int is left out of the union
+  data: List[Union[float, DataItem]] = Field(default_factory=list, description="Series data")
   type: str = Field(default="bar", description="Chart type")
   barWidth: str = Field(default="60%", description="Bar width as percentage or absolute value")
 
@@ -125,6 +112,10 @@ class SeriesItem(BaseModel):
     if not v or v is None:
       return []
 
+    # Plain numeric series are converted in bulk, styled items need the per-item path
+    if dict not in set(map(type, v)):
+      return clean_numbers(v)
+
     cleaned_data = []
     for item in v:
       if item is None:
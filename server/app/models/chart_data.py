@@ -0,0 +1,52 @@
+from typing import Any, List
+
+import numpy as np
+
+
+def clean_labels(values: Any) -> List[str]:
+  """Labels as stripped, non-empty strings with nulls dropped.
+
+  All-string input (the usual case) is stripped with one C-level map instead of converting
+  and stripping every item twice.
+  """
+  if not values:
+    return []
+
+  if set(map(type, values)) == {str}:
+    stripped = list(map(str.strip, values))
+    return stripped if all(stripped) else [label for label in stripped if label]
+
+  cleaned = []
+  for item in values:
+    if item is not None:
+      label = str(item).strip()
+      if label:
+        cleaned.append(label)
+  return cleaned
+
+
+def clean_numbers(values: Any) -> List[float]:
+  """Series values as floats, nulls and unparsable items becoming 0.
+
+  Numbers, nulls and numeric strings are converted as one NumPy array; only input NumPy
+  cannot take as a whole (e.g. text mixed in) falls back to converting item by item.
+  """
+  if not values:
+    return []
+
+  try:
+    array = np.asarray(values, dtype=np.float64)
+  except (ValueError, TypeError):
+    array = None
+
+  if array is not None and array.ndim == 1:
+    return np.nan_to_num(array, nan=0.0, posinf=0.0, neginf=0.0).tolist()
+
+  cleaned = []
+  for item in values:
+    try:
+      number = 0.0 if item is None else float(item)
+    except (ValueError, TypeError):
+      number = 0.0
+    cleaned.append(number if np.isfinite(number) else 0.0)
+  return cleaned
@@ -8,11 +8,12 @@ from sqlalchemy import (
   ForeignKey,
   Identity,
   Integer,
+  LargeBinary,
   String,
   Text,
   func,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 
 from app.db.database import Base
 
@@ -37,6 +38,8 @@ class Message(Base):
   content = Column(String, nullable=True)
   option = Column(JSON, nullable=True)
   component = Column(JSON, nullable=True)
+  # Full-resolution chart behind a downsampled `option`, loaded only when asked for
+  full_option = deferred(Column(JSON, nullable=True))
 
   session = relationship("ChatSession", back_populates="messages")
 
@@ -68,6 +71,8 @@ class FileRecord(Base):
   content_type = Column(String, nullable=False)
   upload_time = Column(DateTime(timezone=True), server_default=func.now())
   content = Column(Text, nullable=True)
+  columnar_data = Column(LargeBinary, nullable=True)
+  table_schema = Column(JSON, nullable=True)
 
   session = relationship("ChatSession", back_populates="files")
 
@@ -80,4 +85,5 @@ class FileRecord(Base):
       "content_type": self.content_type,
       "upload_time": self.upload_time.isoformat() if self.upload_time else None,
       "content": self.content,
+      "table_schema": self.table_schema,
     }
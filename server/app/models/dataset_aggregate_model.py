@@ -0,0 +1,41 @@
+from datetime import date
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+DatasetDimension = Literal["product_name", "year", "month", "period"]
+DatasetMeasure = Literal["revenue", "expenses", "current_employees"]
+AggregateFunction = Literal["sum", "avg", "min", "max", "count"]
+
+
+class DatasetMetric(BaseModel):
+  column: DatasetMeasure
+  func: AggregateFunction = "sum"
+
+  @property
+  def alias(self) -> str:
+    return f"{self.func}_{self.column}"
+
+
+class DatasetFilters(BaseModel):
+  product_names: List[str] = Field(default_factory=list)
+  years: List[int] = Field(default_factory=list)
+  period_from: Optional[date] = Field(default=None, description="Inclusive, first of month")
+  period_to: Optional[date] = Field(default=None, description="Inclusive, first of month")
+
+
+class DatasetAggregateRequest(BaseModel):
+  group_by: List[DatasetDimension] = Field(default_factory=list)
+  metrics: List[DatasetMetric] = Field(min_length=1)
+  filters: DatasetFilters = Field(default_factory=DatasetFilters)
+  order_by: Optional[str] = Field(
+    default=None, description="Metric alias (e.g. 'sum_revenue') or group_by column"
+  )
+  descending: bool = True
+  limit: Optional[int] = Field(default=None, ge=1, le=1000, description="Top-N rows")
+
+
+class DatasetAggregateResponse(BaseModel):
+  columns: List[str]
+  rows: List[dict]
+  cached: bool = False
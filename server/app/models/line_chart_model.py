@@ -1,7 +1,9 @@
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.models.chart_data import clean_labels, clean_numbers
+
 
 class Title(BaseModel):
   text: str
@@ -21,16 +23,8 @@ class Legend(BaseModel):
   @field_validator("data", mode="before")
   @classmethod
   def clean_data(cls, v):
-    if not v or v is None:
-      return []
-
     # Filter out None/null values and convert to strings
-    cleaned_data = []
-    for item in v:
-      if item is not None and str(item).strip():
-        cleaned_data.append(str(item).strip())
-
-    return cleaned_data
+    return clean_labels(v)
 
 
 class XAxis(BaseModel):
@@ -51,16 +45,8 @@ class XAxis(BaseModel):
   @field_validator("data", mode="before")
   @classmethod
   def clean_data(cls, v):
-    if not v or v is None:
-      return []
-
     # Filter out None/null values and convert to strings
-    cleaned_data = []
-    for item in v:
-      if item is not None and str(item).strip():
-        cleaned_data.append(str(item).strip())
-
-    return cleaned_data
+    return clean_labels(v)
 
 
 class AxisLabel(BaseModel):
@@ -102,7 +88,8 @@ class Tooltip(BaseModel):
 
 class SeriesItem(BaseModel):
   name: str = Field(default=None, description="Series name")
-  data: List[Union[int, float]] = Field(default_factory=list, description="Series data")
+  # Always floats after clean_data; a plain float list validates far faster than a union
+  data: List[float] = Field(default_factory=list, description="Series data")
   type: str = Field(default="bar", description="Chart type")
 
   @field_validator("type", mode="before")
@@ -117,20 +104,8 @@ class SeriesItem(BaseModel):
   @field_validator("data", mode="before")
   @classmethod
   def clean_data(cls, v):
-    if not v or v is None:
-      return []
-
-    cleaned_data = []
-    for item in v:
-      if item is None:
-        cleaned_data.append(0)
-      else:
-        try:
-          cleaned_data.append(float(item))
-        except (ValueError, TypeError):
-          cleaned_data.append(0)
-
-    return cleaned_data
+    # None/null and unparsable values become 0
+    return clean_numbers(v)
 
 
 class ChartConfig(BaseModel):
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, DateTime, Float, Index, String, Text, func
+
+from app.db.database import Base
+
+
+class LlmResponseCacheEntry(Base):
+  __tablename__ = "llm_response_cache"
+  __table_args__ = (Index("ix_llm_response_cache_expires_at", "expires_at"),)
+
+  # sha256 of model, call parameters and rendered messages, see llm_cache_service.cache_key
+  cache_key = Column(String(64), primary_key=True)
+
+  agent = Column(String(64), nullable=False)
+  model = Column(String(64), nullable=False)
+  # JSON-encoded structured output
+  response = Column(Text, nullable=False)
+  # Duration of the original model call, credited as saved time on every hit
+  latency_seconds = Column(Float, nullable=False)
+  created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+  expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, Index, String, Text, func
+
+from app.db.database import Base
+
+
+class ResearchCacheEntry(Base):
+  __tablename__ = "research_cache"
+  __table_args__ = (Index("ix_research_cache_expires_at", "expires_at"),)
+
+  # sha256 of kind, scope and normalized query, see research_cache_service.cache_key
+  cache_key = Column(String(64), primary_key=True)
+
+  kind = Column(String(16), nullable=False)
+  query = Column(Text, nullable=False)
+  # JSON-encoded search results or research text
+  payload = Column(Text, nullable=False)
+  created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+  expires_at = Column(DateTime(timezone=True), nullable=False)
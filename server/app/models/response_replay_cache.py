@@ -0,0 +1,20 @@
+from sqlalchemy import JSON, Column, DateTime, Index, String, Text, func
+
+from app.db.database import Base
+
+
+class ResponseReplayEntry(Base):
+  __tablename__ = "response_replay_cache"
+  __table_args__ = (Index("ix_response_replay_cache_expires_at", "expires_at"),)
+
+  # sha256 of graph version, session, thread history, normalized input and attachment hashes,
+  # see replay_cache_key
+  cache_key = Column(String(64), primary_key=True)
+
+  input = Column(Text, nullable=False)
+  # SSE frames of the original run, in order, without the closing "end" frame
+  frames = Column(JSON, nullable=False)
+  # Assistant message persisted for the run (content / option / component)
+  message = Column(JSON, nullable=False)
+  created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+  expires_at = Column(DateTime(timezone=True), nullable=False)
@@ -6,9 +6,13 @@ from pydantic import BaseModel
 
 
 class MultiAgentState(TypedDict):
+  session_id: NotRequired[str]
   current_agent: str
   research_data: str
+  # Findings of earlier turns by topic, kept across turns by the thread checkpoint
+  research_memory: NotRequired[dict[str, dict]]
   attachment_contents: NotRequired[str | None]
+  dataset_result: NotRequired[dict]
   dashboard_plan: dict[str, Any]
   section_component: dict
   card_component: list[dict]
@@ -17,12 +21,19 @@ class MultiAgentState(TypedDict):
   ui_descriptor_target: str
   is_initial_planning: bool
   iteration_count: int
+  component_dispatcher: NotRequired[str]
   section_ready: NotRequired[bool]
   card_ready: NotRequired[bool]
   table_ready: NotRequired[bool]
+  # Set by component and chart nodes whose engines computed over live `dataset` rows
+  used_dataset: NotRequired[bool]
+  # Full-resolution line chart option when the one in messages was downsampled
+  full_chart_option: NotRequired[dict | None]
   messages: Annotated[Sequence[AnyMessage], operator.add]
 
 
 class MultiAgentRequest(BaseModel):
   input: str
   session_id: str
+  # Run the graph even when a recorded response for this exact request exists
+  no_cache: bool = False
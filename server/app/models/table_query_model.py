@@ -0,0 +1,42 @@
+from typing import Any, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+FilterOperator = Literal["eq", "ne", "gt", "gte", "lt", "lte", "contains", "in"]
+
+
+class TableFilter(BaseModel):
+  column: str
+  op: FilterOperator = "eq"
+  value: Any = None
+
+
+class TableSort(BaseModel):
+  column: str
+  direction: Literal["asc", "desc"] = "asc"
+
+
+class TableQuery(BaseModel):
+  """Server-side table reference embedded in table component props instead of literal rows."""
+
+  session_id: Optional[str] = Field(default=None, description="Owning chat session (attachments)")
+  table: str = Field(description="Columnar table name, e.g. 'sales.xlsx:Sheet1' or 'dataset'")
+  columns: List[str] = Field(default_factory=list, description="Projected columns, all if empty")
+  filters: List[TableFilter] = Field(default_factory=list)
+  sort: List[TableSort] = Field(default_factory=list)
+
+
+class TableRowsRequest(BaseModel):
+  query: TableQuery
+  page: int = Field(default=1, ge=1)
+  page_size: int = Field(default=25, ge=1, le=500)
+  sort: Optional[List[TableSort]] = Field(default=None, description="Overrides query.sort")
+  filters: List[TableFilter] = Field(default_factory=list, description="Added to query.filters")
+
+
+class TableRowsResponse(BaseModel):
+  columns: List[dict]
+  rows: List[dict]
+  total_rows: int
+  page: int
+  page_size: int
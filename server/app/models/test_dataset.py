@@ -1,16 +1,22 @@
-from sqlalchemy import Column, Identity, Integer, String
+from sqlalchemy import Column, Date, Identity, Index, Integer, String
 
 from app.db.database import Base
 
 
 class Dataset(Base):
   __tablename__ = "dataset"
+  __table_args__ = (
+    Index("ix_dataset_period", "period"),
+    Index("ix_dataset_product_name_period", "product_name", "period"),
+  )
 
   id = Column(Integer, Identity(start=1, increment=1), nullable=False, primary_key=True)
 
   product_name = Column(String, nullable=False)
   year = Column(String, nullable=False)
   month = Column(String, nullable=False)
+  # Typed first-of-month date derived from year/month, used for filtering and grouping
+  period = Column(Date, nullable=False)
   revenue = Column(Integer, nullable=False)
   expenses = Column(Integer, nullable=False)
   current_employees = Column(Integer, nullable=False)
@@ -0,0 +1,63 @@
+from typing import Any, Dict, List, Literal, Union
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SectionProps(BaseModel):
+  model_config = ConfigDict(extra="allow")
+
+  title: str = ""
+  subtitle: str = ""
+  loading: bool = False
+  children: List["ComponentDescriptor"] = Field(default_factory=list)
+
+
+class CardProps(BaseModel):
+  model_config = ConfigDict(extra="allow")
+
+  title: str = ""
+  value: Any = ""
+  description: str = ""
+  loading: bool = False
+
+
+class TableColumn(BaseModel):
+  key: str
+  label: str
+
+
+class TableProps(BaseModel):
+  model_config = ConfigDict(extra="allow")
+
+  title: str = ""
+  loading: bool = False
+  columns: List[TableColumn] = Field(default_factory=list)
+  rows: List[Dict[str, Any]] = Field(default_factory=list)
+
+
+class SectionDescriptor(BaseModel):
+  id: str
+  type: Literal["section"]
+  props: SectionProps = Field(default_factory=SectionProps)
+
+
+class CardDescriptor(BaseModel):
+  id: str
+  type: Literal["card"]
+  props: CardProps = Field(default_factory=CardProps)
+
+
+class TableDescriptor(BaseModel):
+  id: str
+  type: Literal["table"]
+  props: TableProps = Field(default_factory=TableProps)
+
+
+ComponentDescriptor = Union[SectionDescriptor, CardDescriptor, TableDescriptor]
+SectionProps.model_rebuild()
+
+
+class UiEvent(BaseModel):
+  type: Literal["ui_event"] = "ui_event"
+  target: str
+  component: ComponentDescriptor = Field(discriminator="type")
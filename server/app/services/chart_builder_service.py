@@ -0,0 +1,542 @@
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from app.models.bar_chart_model import ChartConfig as BarChartConfig
+from app.models.line_chart_model import ChartConfig as LineChartConfig
+from app.services.chart_postprocess_service import OTHER_LABEL
+from app.services.tabular_service import (
+  AGGREGATIONS,
+  ColumnarTable,
+  calendar_keys,
+  category_order,
+  format_labels,
+  group_aggregate,
+  mentioned_names,
+  tokenize,
+)
+
+logger = logging.getLogger(__name__)
+
+MAX_MEASURES = 5
+MAX_SERIES = 12
+TITLE_MAX_LENGTH = 20
+
+TEMPORAL_WORDS = {"date", "year", "month", "quarter", "period", "week", "day", "time"}
+DIMENSION_MARKERS = ["by", "per", "over", "across", "each"]
+AGGREGATION_KEYWORDS = {
+  "mean": ["average", "avg", "mean"],
+  "max": ["max", "maximum", "highest", "peak"],
+  "min": ["min", "minimum", "lowest"],
+  "count": ["count"],
+}
+# Derived metrics and rankings the builder cannot compute, such requests go to the chart LLM
+UNSUPPORTED_WORDS = set(
+  tokenize(
+    "growth rate ratio margin share percent percentage proportion cumulative running "
+    "difference change delta yoy mom top bottom best worst"
+  )
+)
+# Words of a chart request that name neither a column nor a filter
+FILLER_WORDS = set(
+  tokenize(
+    "chart graph plot bar line visualize visualise visualization show display draw create make "
+    "generate give me can you please of the an and as from for with in on to my our all each "
+    "data file attached attachment sheet table excel csv xlsx dataset using based trend "
+    "compare comparison breakdown value amount total sum distribution vs versus only just "
+    "what is are how it this that monthly yearly annual quarterly weekly daily"
+  )
+)
+# String columns with more distinct values than this are not scanned for filter values
+MAX_FILTER_CATEGORIES = 1000
+
+_YEAR_PATTERN = re.compile(r"(?<!\d)(19\d{2}|20\d{2})(?!\d)")
+
+
+@dataclass
+class ChartSpec:
+  """Resolved chart request: which table/columns to aggregate and how."""
+
+  table: ColumnarTable
+  dimension: str
+  measures: List[str]
+  aggregation: str = "sum"
+  series_by: Optional[str] = None
+  # Row filters named in the request: column -> accepted values (years for datetime columns)
+  filters: Dict[str, list] = field(default_factory=dict)
+  resolved_by: str = "keywords"
+
+
+class ChartBuilder:
+  """Deterministic chart engine producing ChartConfig-valid ECharts options from columnar data.
+
+  Measures and dimensions are resolved by matching the request against column names, category
+  values and years named in the request become row filters ("North region only", "in 2023").
+  When a word of the request stays unresolved an optional LLM picks columns from the schema
+  only, the aggregation itself is always computed with NumPy. Derived metrics (growth, ratios,
+  top N) are left to the chart LLM entirely.
+  """
+
+  def __init__(self, llm=None, max_categories: Optional[int] = None):
+    self.llm = llm
+    # Bar charts keep this many categories at most, the rest is aggregated into "Other"
+    self.max_categories = max_categories
+
+  async def build(
+    self, request: str, tables: List[ColumnarTable], chart_type: str
+  ) -> Optional[dict]:
+    if not tables:
+      return None
+
+    unsupported = set(tokenize(request)) & UNSUPPORTED_WORDS
+    if unsupported or "/" in request or "%" in request:
+      logger.info(
+        f"Chart request needs a derived metric ({sorted(unsupported)}), skipping builder."
+      )
+      return None
+
+    spec = self.resolve(request, tables, chart_type)
+    if spec is None and self.llm is not None:
+      spec = await self._pick_columns_with_llm(request, tables, chart_type)
+
+    if spec is None:
+      return None
+
+    try:
+      option = self.render(spec, chart_type)
+    except Exception as e:
+      logger.error(f"Deterministic {chart_type} chart rendering failed: {e}")
+      return None
+
+    logger.info(
+      f"Built {chart_type} chart from {spec.table.name} "
+      f"({spec.aggregation} of {spec.measures} by {spec.dimension}, "
+      f"filters {spec.filters or 'none'}, via {spec.resolved_by})."
+    )
+    return option
+
+  def resolve(
+    self, request: str, tables: List[ColumnarTable], chart_type: str
+  ) -> Optional[ChartSpec]:
+    words = tokenize(request)
+    request_tokens = set(words)
+    dimension_tokens = {
+      words[index + 1]
+      for index, word in enumerate(words[:-1])
+      if word in DIMENSION_MARKERS and words[index + 1] not in DIMENSION_MARKERS
+    }
+
+    best: Optional[ChartSpec] = None
+    best_score = 0.0
+
+    for table in tables:
+      table_bonus = 0.5 if set(tokenize(table.name)) & request_tokens else 0.0
+
+      column_tokens_by_name = {column: set(tokenize(column)) for column in table.columns}
+      known_tokens = set().union(*column_tokens_by_name.values())
+      if dimension_tokens - known_tokens - TEMPORAL_WORDS:
+        # The request names a grouping we cannot find in this table
+        continue
+
+      dimensions = self._mentioned_dimensions(table, words, dimension_tokens)
+
+      candidates = [
+        column
+        for column in table.columns
+        if column not in dimensions
+        and table.column_type(column) in ("integer", "float")
+        and column_tokens_by_name[column]
+        and not column_tokens_by_name[column] & TEMPORAL_WORDS
+      ]
+
+      # Columns named in full ("Product C", "total revenue") are charted as asked; a column
+      # only partially matched has to be the single best match, ties are left to the LLM
+      measures = mentioned_names(request, candidates)
+      top_score = 2.0
+      if not measures:
+        scored_measures = []
+        for column in candidates:
+          column_tokens = column_tokens_by_name[column]
+          matched = column_tokens & (request_tokens - dimension_tokens)
+          if matched:
+            scored_measures.append((len(matched) / len(column_tokens), column))
+        if not scored_measures:
+          continue
+
+        top_score = max(score for score, _ in scored_measures)
+        measures = [column for score, column in scored_measures if score == top_score]
+        if len(measures) > 1:
+          logger.info(f"Ambiguous chart measure in {table.name}: {measures}.")
+          continue
+
+      dimension = self._pick_dimension(table, dimensions, chart_type)
+      if dimension is None:
+        continue
+
+      series_by = next(
+        (
+          column
+          for column in dimensions
+          if column != dimension and table.column_type(column) == "string"
+        ),
+        None,
+      )
+
+      filters, filter_tokens = self._row_filters(table, request)
+      if filters is None:
+        # The request names years this table cannot filter on
+        continue
+      mask = self._row_mask(table, filters)
+      if mask is not None and not mask.any():
+        continue
+      if series_by is None:
+        # Several named categories ("Product A and Product B", "2023 vs 2024") become series
+        series_by = next(
+          (
+            column
+            for column, accepted in filters.items()
+            if len(accepted) > 1 and column != dimension and table.column_type(column) != "datetime"
+          ),
+          None,
+        )
+
+      resolved_tokens = (
+        FILLER_WORDS
+        | TEMPORAL_WORDS
+        | set(DIMENSION_MARKERS)
+        | {keyword for keywords in AGGREGATION_KEYWORDS.values() for keyword in keywords}
+        | set(tokenize(table.name))
+        | set().union(*(column_tokens_by_name[column] for column in measures + dimensions))
+        | column_tokens_by_name[dimension]
+        | filter_tokens
+      )
+      unresolved = request_tokens - resolved_tokens
+      if unresolved:
+        # A qualifier we cannot apply would silently widen the chart to all rows
+        logger.info(f"Unresolved chart request words for {table.name}: {sorted(unresolved)}.")
+        continue
+
+      # Tables that resolve the requested grouping beat tables that merely contain the measure
+      resolved_dimensions = dimension_tokens & known_tokens
+      score = top_score + table_bonus + len(resolved_dimensions)
+      if score > best_score:
+        best_score = score
+        best = ChartSpec(
+          table=table,
+          dimension=dimension,
+          measures=measures[:MAX_MEASURES],
+          aggregation=self._detect_aggregation(request_tokens),
+          series_by=series_by,
+          filters=filters,
+        )
+
+    return best
+
+  def render(self, spec: ChartSpec, chart_type: str) -> dict:
+    table = spec.table
+    used = {spec.dimension, *spec.measures, *([spec.series_by] if spec.series_by else [])}
+    mask = self._row_mask(table, spec.filters)
+    columns = {
+      column: table.columns[column] if mask is None else table.columns[column][mask]
+      for column in used
+    }
+
+    dimension_values = columns[spec.dimension]
+    if chart_type == "bar" and table.column_type(spec.dimension) == "string":
+      dimension_values = self._fold_categories(dimension_values, columns[spec.measures[0]], spec)
+
+    series: List[dict] = []
+    if spec.series_by:
+      measure = spec.measures[0]
+      (categories, series_names), grid = group_aggregate(
+        [dimension_values, columns[spec.series_by]], columns[measure], spec.aggregation
+      )
+      order = self._order(categories, chart_type, np.nansum(grid, axis=1))
+      for index, series_name in enumerate(series_names[:MAX_SERIES]):
+        series.append({"name": str(series_name), "data": grid[order, index]})
+      measure_label = measure
+    else:
+      categories, values = None, []
+      for measure in spec.measures:
+        (categories,), aggregated = group_aggregate(
+          [dimension_values], columns[measure], spec.aggregation
+        )
+        values.append(aggregated)
+      order = self._order(categories, chart_type, values[0])
+      for measure, aggregated in zip(spec.measures, values):
+        series.append({"name": measure, "data": aggregated[order]})
+      measure_label = spec.measures[0] if len(spec.measures) == 1 else "Value"
+
+    if categories.dtype.kind == "U" and OTHER_LABEL in categories:
+      # "Other" closes the ranking whatever its value
+      other_position = np.flatnonzero(categories[order] == OTHER_LABEL)
+      order = np.append(np.delete(order, other_position), order[other_position])
+
+    labels = format_labels(categories[order])
+    for item in series:
+      data = np.round(np.nan_to_num(item["data"].astype(np.float64)), 2)
+      item["data"] = data.tolist()
+      item["type"] = chart_type
+
+    option = {
+      "title": {"text": self._title(measure_label, spec.dimension)},
+      "toolbox": {"feature": {"saveAsImage": {}}},
+      "legend": {"data": [item["name"] for item in series]},
+      "xAxis": {"type": "category", "data": labels},
+      "yAxis": {"type": "value", "name": measure_label},
+      "series": series,
+    }
+
+    if chart_type == "line":
+      option["tooltip"] = {
+        "trigger": "axis",
+        "axisPointer": {"type": "cross", "label": {"backgroundColor": "#6a7985"}},
+      }
+      return LineChartConfig.model_validate(option).model_dump()
+
+    option["tooltip"] = {"trigger": "axis", "axisPointer": {"type": "shadow"}}
+    return BarChartConfig.model_validate(option).model_dump()
+
+  def _fold_categories(
+    self, dimension_values: np.ndarray, measure_values: np.ndarray, spec: ChartSpec
+  ):
+    """Relabel every category outside the top `max_categories - 1` as "Other".
+
+    Folding happens on the raw rows, so "Other" is aggregated with the chart's own aggregation
+    (an average stays an average) instead of summing already aggregated bars.
+    """
+    if not self.max_categories or self.max_categories < 2:
+      return dimension_values
+
+    (categories,), totals = group_aggregate([dimension_values], measure_values, spec.aggregation)
+    if categories.size <= self.max_categories or calendar_keys(categories) is not None:
+      # Periods ("May 2023", "Q1 2019") are an axis, not a ranking: never fold them
+      return dimension_values
+
+    ranked = np.argsort(-np.nan_to_num(totals, nan=-np.inf), kind="stable")
+    top = categories[ranked[: self.max_categories - 1]]
+    logger.info(
+      f"Folding {categories.size - top.size} {spec.dimension} categories into '{OTHER_LABEL}'."
+    )
+    return np.where(np.isin(dimension_values, top), dimension_values, OTHER_LABEL)
+
+  def _row_filters(
+    self, table: ColumnarTable, request: str
+  ) -> Tuple[Optional[Dict[str, list]], set]:
+    """Category values and years the request names, as filters with the tokens they resolve.
+
+    Filters are None when the request names a year the table has no year or date column for.
+    """
+    lowered = request.lower()
+    filters: Dict[str, list] = {}
+    tokens: set = set()
+
+    for column, values in table.columns.items():
+      if table.column_type(column) != "string":
+        continue
+      categories = np.unique(values)
+      if categories.size > MAX_FILTER_CATEGORIES:
+        continue
+      matched = [
+        category
+        for category in categories.tolist()
+        if len(category.strip()) > 1
+        and re.search(rf"(?<![a-z0-9]){re.escape(category.strip().lower())}(?![a-z0-9])", lowered)
+      ]
+      if not matched:
+        continue
+      tokens |= set(tokenize(" ".join(matched))) | set(tokenize(column))
+      if len(matched) < categories.size:
+        filters[column] = matched
+
+    years = {int(year) for year in _YEAR_PATTERN.findall(request)} - {
+      int(token) for token in tokens if token.isdigit()
+    }
+    if years:
+      year_column = self._year_column(table)
+      if year_column is None:
+        return None, tokens
+      filters[year_column] = sorted(years)
+      tokens |= {str(year) for year in years} | set(tokenize(year_column))
+
+    return filters, tokens
+
+  def _year_column(self, table: ColumnarTable) -> Optional[str]:
+    for column in table.columns:
+      if table.column_type(column) == "datetime":
+        return column
+    for column, values in table.columns.items():
+      if "year" in tokenize(column) and table.column_type(column) == "integer":
+        if values.size and 1900 <= values.min() and values.max() <= 2100:
+          return column
+    return None
+
+  def _row_mask(self, table: ColumnarTable, filters: Dict[str, list]) -> Optional[np.ndarray]:
+    mask = None
+    for column, accepted in filters.items():
+      values = table.columns[column]
+      if table.column_type(column) == "datetime":
+        values = values.astype("datetime64[Y]").astype(np.int64) + 1970
+      column_mask = np.isin(values, accepted)
+      mask = column_mask if mask is None else mask & column_mask
+    return mask
+
+  def _title(self, measure: str, dimension: str) -> str:
+    measure = re.sub(r"\s*\(.*?\)", "", measure).strip() or measure
+    title = f"{measure} by {dimension}"
+    if len(title) > TITLE_MAX_LENGTH:
+      title = measure
+    return title[:TITLE_MAX_LENGTH]
+
+  def _mentioned_dimensions(
+    self, table: ColumnarTable, words: List[str], dimension_tokens: set
+  ) -> List[str]:
+    """Columns named right after a grouping marker ("by month", "per product"), in request order."""
+    mentioned = []
+    for word in words:
+      if word not in dimension_tokens:
+        continue
+      for column in table.columns:
+        if word in tokenize(column) and column not in mentioned:
+          mentioned.append(column)
+          break
+
+    return mentioned
+
+  def _pick_dimension(
+    self, table: ColumnarTable, dimensions: List[str], chart_type: str
+  ) -> Optional[str]:
+    def is_temporal(column: str) -> bool:
+      return table.column_type(column) == "datetime" or bool(set(tokenize(column)) & TEMPORAL_WORDS)
+
+    if dimensions:
+      if chart_type == "line":
+        temporal = [column for column in dimensions if is_temporal(column)]
+        if temporal:
+          return temporal[0]
+      return dimensions[0]
+
+    temporal_columns = [column for column in table.columns if is_temporal(column)]
+    string_columns = [column for column in table.columns if table.column_type(column) == "string"]
+
+    # Prefer a real datetime column ("period") over name-based temporal guesses ("month")
+    temporal_columns.sort(key=lambda column: table.column_type(column) != "datetime")
+
+    if chart_type == "line":
+      candidates = temporal_columns + string_columns
+    else:
+      candidates = [column for column in string_columns if not is_temporal(column)]
+      candidates += temporal_columns + string_columns
+
+    return candidates[0] if candidates else None
+
+  def _detect_aggregation(self, request_tokens: set) -> str:
+    for aggregation, keywords in AGGREGATION_KEYWORDS.items():
+      if request_tokens & set(keywords):
+        return aggregation
+    return "sum"
+
+  def _order(self, categories: np.ndarray, chart_type: str, values) -> np.ndarray:
+    if calendar_keys(categories) is not None:
+      return category_order(categories)
+
+    # Rank plain categories by value on bar charts, keep natural order otherwise
+    if chart_type == "bar" and categories.dtype.kind == "U" and values is not None:
+      return np.argsort(-np.nan_to_num(values, nan=-np.inf), kind="stable")
+
+    return np.arange(categories.size)
+
+  async def _pick_columns_with_llm(
+    self, request: str, tables: List[ColumnarTable], chart_type: str
+  ) -> Optional[ChartSpec]:
+    schema = [
+      {
+        "table": table.name,
+        "columns": [
+          {"name": column, "type": table.column_type(column)} for column in table.columns
+        ],
+      }
+      for table in tables
+    ]
+
+    system_message = SystemMessage(
+      content=f"""
+    You map a {chart_type} chart request onto tabular data. You only see the schema, never values.
+
+    Respond with ONLY a JSON object:
+    {{
+      "table": "<table name>",
+      "dimension": "<column for the x axis>",
+      "measures": ["<numeric column>", ...],
+      "aggregation": "sum|mean|min|max|count",
+      "series_by": "<optional string column splitting the data into series, or null>",
+      "filters": {{"<string column>": ["<value exactly as the request names it>", ...]}}
+    }}
+
+    Add a filter for every category the request restricts the chart to (e.g. a region or a
+    product), use {{}} when it names none.
+
+    If the request cannot be answered from these tables, respond with {{}}.
+    """
+    )
+    human_message = HumanMessage(content=f"User request: {request}\n\nSchema: {json.dumps(schema)}")
+
+    try:
+      response = await self.llm.ainvoke([system_message, human_message])
+    except Exception as e:
+      logger.error(f"Chart column selection failed: {e}")
+      return None
+
+    if not isinstance(response, dict) or not response.get("table"):
+      return None
+
+    table = next((table for table in tables if table.name == response["table"]), None)
+    if table is None:
+      return None
+
+    dimension = response.get("dimension")
+    measures = [
+      measure
+      for measure in response.get("measures") or []
+      if measure in table.columns and table.column_type(measure) in ("integer", "float")
+    ]
+    if dimension not in table.columns or not measures:
+      return None
+
+    series_by = response.get("series_by")
+    if series_by not in table.columns or series_by == dimension:
+      series_by = None
+
+    filters, _ = self._row_filters(table, request)
+    if filters is None:
+      return None
+    picked_filters = response.get("filters")
+    for column, requested in (picked_filters if isinstance(picked_filters, dict) else {}).items():
+      if column not in table.columns or table.column_type(column) != "string":
+        return None
+      categories = {category.lower(): category for category in np.unique(table.columns[column])}
+      values = requested if isinstance(requested, list) else [requested]
+      if any(str(value).strip().lower() not in categories for value in values):
+        # A filter the data cannot apply would chart every row instead
+        return None
+      filters[column] = [categories[str(value).strip().lower()] for value in values]
+
+    mask = self._row_mask(table, filters)
+    if mask is not None and not mask.any():
+      return None
+
+    aggregation = response.get("aggregation")
+    return ChartSpec(
+      table=table,
+      dimension=dimension,
+      measures=measures[:MAX_MEASURES],
+      aggregation=aggregation if aggregation in AGGREGATIONS else "sum",
+      series_by=series_by,
+      filters=filters,
+      resolved_by="llm",
+    )
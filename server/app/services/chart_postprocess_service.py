@@ -0,0 +1,177 @@
+import logging
+from typing import Optional
+
+import numpy as np
+
+from app.services.tabular_service import calendar_keys
+
+logger = logging.getLogger(__name__)
+
+OTHER_LABEL = "Other"
+
+
+def lttb_indices(values: np.ndarray, threshold: int) -> np.ndarray:
+  """Indices of the points Largest-Triangle-Three-Buckets keeps out of evenly spaced `values`.
+
+  The first and last points are always kept; the points in between are split into
+  `threshold - 2` buckets and each bucket keeps the point spanning the largest triangle with
+  the previously kept point and the next bucket's average. Bucket averages come from one
+  cumulative sum and each bucket's areas are computed as one array operation, only the walk
+  from bucket to bucket is sequential.
+  """
+  size = values.size
+  if threshold < 3 or size <= threshold:
+    return np.arange(size)
+
+  values = np.nan_to_num(values.astype(np.float64))
+  edges = np.linspace(1, size - 1, threshold - 1).astype(np.int64)
+  starts, ends = edges[:-1], edges[1:]
+
+  cumulative = np.concatenate(([0.0], np.cumsum(values)))
+  average_y = (cumulative[ends] - cumulative[starts]) / (ends - starts)
+  average_x = (starts + ends - 1) / 2
+  # The last bucket looks ahead to the final point instead of an average
+  average_x = np.append(average_x[1:], size - 1)
+  average_y = np.append(average_y[1:], values[-1])
+
+  positions = np.arange(size, dtype=np.float64)
+  selected = np.empty(threshold, dtype=np.int64)
+  selected[0], selected[-1] = 0, size - 1
+
+  anchor = 0
+  for bucket, (start, end) in enumerate(zip(starts, ends)):
+    anchor_x, anchor_y = positions[anchor], values[anchor]
+    areas = np.abs(
+      (anchor_x - average_x[bucket]) * (values[start:end] - anchor_y)
+      - (anchor_x - positions[start:end]) * (average_y[bucket] - anchor_y)
+    )
+    anchor = start + int(np.argmax(areas))
+    selected[bucket + 1] = anchor
+
+  return selected
+
+
+def downsample_line_option(option: dict, max_points: int) -> Optional[dict]:
+  """Copy of a line chart option reduced to about `max_points` points, None when not needed.
+
+  All series share the category axis, so each series gets an equal share of the budget and
+  the union of their LTTB picks is kept for every series and the axis labels. Options whose
+  series and axis lengths disagree are left alone rather than misaligned.
+  """
+  series = option.get("series") or []
+  labels = (option.get("xAxis") or {}).get("data") or []
+  lengths = {len(item.get("data") or []) for item in series}
+  if max_points < 3 or len(lengths) != 1:
+    return None
+
+  size = lengths.pop()
+  if size <= max_points or (labels and len(labels) != size):
+    return None
+
+  per_series = max(3, max_points // len(series))
+  data = [np.asarray(item["data"], dtype=np.float64) for item in series]
+  keep = np.unique(np.concatenate([lttb_indices(values, per_series) for values in data]))
+
+  downsampled = {**option, "series": []}
+  for item, values in zip(series, data):
+    downsampled["series"].append({**item, "data": values[keep].tolist()})
+  if labels:
+    downsampled["xAxis"] = {**option["xAxis"], "data": [labels[index] for index in keep]}
+
+  logger.info(f"Downsampled line chart from {size} to {keep.size} points per series.")
+  return downsampled
+
+
+def _category_axis(option: dict) -> Optional[str]:
+  """Axis holding the categories: xAxis for vertical bars, yAxis for horizontal ones."""
+  for axis in ("xAxis", "yAxis"):
+    settings = option.get(axis)
+    if isinstance(settings, dict) and settings.get("type") == "category" and settings.get("data"):
+      return axis
+  return None
+
+
+def _series_values(data: list) -> np.ndarray:
+  """Series data as floats (NaN for nulls), styled {value, itemStyle} items included."""
+  if dict not in set(map(type, data)):
+    return np.asarray(data, dtype=np.float64)
+  values = [point.get("value") if isinstance(point, dict) else point for point in data]
+  return np.asarray(values, dtype=np.float64)
+
+
+def fold_bar_categories(
+  option: dict, max_categories: int, other_label: str = OTHER_LABEL
+) -> Optional[dict]:
+  """Copy of a bar chart option with at most `max_categories` bars, None when not needed.
+
+  Categories are ranked by their total over all series; the top `max_categories - 1` are kept
+  in that order and every other category is summed into a trailing "Other" bar per series.
+  Period labels (months, "May 2023", "Q1 2019", years) are never folded.
+  """
+  axis = _category_axis(option)
+  series = option.get("series") or []
+  if axis is None or not series or max_categories < 2:
+    return None
+
+  labels = option[axis]["data"]
+  if len(labels) <= max_categories or any(
+    len(item.get("data") or []) != len(labels) for item in series
+  ):
+    return None
+  if calendar_keys(np.asarray([str(label) for label in labels])) is not None:
+    return None
+
+  # (series, category) matrix of the plain values, styled data items included
+  values = np.vstack([_series_values(item["data"]) for item in series])
+  order = np.argsort(-np.nan_to_num(np.nansum(values, axis=0), nan=-np.inf), kind="stable")
+  kept, folded = order[: max_categories - 1], order[max_categories - 1 :]
+  other = np.round(np.nansum(values[:, folded], axis=1), 2)
+
+  downsized = {
+    **option,
+    axis: {**option[axis], "data": [labels[index] for index in kept] + [other_label]},
+  }
+  downsized["series"] = [
+    {**item, "data": [item["data"][index] for index in kept] + [float(other[row])]}
+    for row, item in enumerate(series)
+  ]
+
+  logger.info(f"Folded {folded.size} of {len(labels)} bar categories into '{other_label}'.")
+  return downsized
+
+
+def to_dataset(option: dict) -> dict:
+  """Move categories and series values into an ECharts `dataset`, one row per category.
+
+  Series then only `encode` their column, so each value is sent once in a compact table.
+  Options with styled data items are returned unchanged since a dataset cannot carry them.
+  """
+  axis = _category_axis(option)
+  series = option.get("series") or []
+  if axis is None or not series:
+    return option
+
+  labels = option[axis]["data"]
+  if any(
+    len(item.get("data") or []) != len(labels)
+    or any(isinstance(point, dict) for point in item["data"])
+    for item in series
+  ):
+    return option
+
+  header = ["category"] + [
+    item.get("name") or f"series_{index}" for index, item in enumerate(series)
+  ]
+  rows = [list(row) for row in zip(labels, *[item["data"] for item in series])]
+  value_axis = "x" if axis == "yAxis" else "y"
+
+  converted = {**option, "dataset": {"source": [header] + rows}}
+  converted[axis] = {key: value for key, value in option[axis].items() if key != "data"}
+  converted["series"] = [
+    {
+      **{key: value for key, value in item.items() if key != "data"},
+      "encode": {axis[0]: 0, value_axis: index + 1},
+    }
+    for index, item in enumerate(series)
+  ]
+  return converted
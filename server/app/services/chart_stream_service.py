@@ -0,0 +1,74 @@
+from typing import Dict, List, Optional
+
+from langchain_core.utils.json import parse_partial_json
+
+# Re-parse only after the buffer grew by this share (plus a floor), so parsing a long stream
+# stays linear overall instead of quadratic
+REPARSE_GROWTH = 0.25
+REPARSE_MIN_CHARS = 200
+
+
+class ChartStreamer:
+  """Turns the token stream of one chart model call into progressive chart frames.
+
+  The partial JSON is parsed as it grows. Once the model reaches `series`, everything before
+  it (title, axes, tooltip, legend) is complete and goes out as a skeleton option with empty
+  series; data points then follow as `series_append` frames. The last point of the series
+  being written is held back since it may still be cut mid-number. Output that never reaches
+  `series` (e.g. a column selection) produces no frames.
+  """
+
+  def __init__(self, run_id: Optional[str] = None):
+    self.run_id = run_id
+    self.buffer = ""
+    self.parsed_length = 0
+    self.skeleton_sent = False
+    # Data points already sent per series index
+    self.sent_points: Dict[int, int] = {}
+
+  def feed(self, text: str) -> List[dict]:
+    self.buffer += text
+    if len(self.buffer) < self.parsed_length * (1 + REPARSE_GROWTH) + REPARSE_MIN_CHARS:
+      return []
+    self.parsed_length = len(self.buffer)
+
+    start = self.buffer.find("{")
+    if start < 0:
+      return []
+    partial = parse_partial_json(self.buffer[start:])
+    if not isinstance(partial, dict) or not isinstance(partial.get("series"), list):
+      return []
+
+    payloads = []
+    if not self.skeleton_sent:
+      skeleton = {key: value for key, value in partial.items() if key != "series"}
+      skeleton["series"] = []
+      payloads.append({"type": "content", "option": skeleton, "partial": True})
+      self.skeleton_sent = True
+
+    appends = self._appends(partial["series"])
+    if appends:
+      payloads.append({"type": "content", "series_append": appends})
+    return payloads
+
+  def _appends(self, series: list) -> List[dict]:
+    appends = []
+    for index, item in enumerate(series):
+      if not isinstance(item, dict) or not isinstance(item.get("data"), list):
+        continue
+
+      data = item["data"]
+      if index == len(series) - 1:
+        data = data[:-1]
+
+      if index not in self.sent_points:
+        if not data:
+          continue
+        # First points of a new series carry its name and type
+        stub = {key: value for key, value in item.items() if key != "data"}
+        appends.append({"index": index, **stub, "data": data})
+      elif len(data) > self.sent_points[index]:
+        appends.append({"index": index, "data": data[self.sent_points[index] :]})
+
+      self.sent_points[index] = len(data)
+    return appends
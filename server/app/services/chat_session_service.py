@@ -4,7 +4,7 @@ from typing import Optional
 from fastapi import HTTPException
 from langgraph.checkpoint.base import BaseCheckpointSaver
 from sqlalchemy import delete, select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 
 from app.models.chat_session import ChatSession, Message
 
@@ -53,6 +53,26 @@ class ChatSessionService:
         status_code=500, detail=f"Couldn't retrieve messages for session {session_id}: {e}"
       )
 
+  async def get_message_option(self, session_id: str, message_id: int):
+    """Chart option of a message at full resolution, the stored one if it was not downsampled."""
+    stmt = (
+      select(Message)
+      .options(undefer(Message.full_option))
+      .where(Message.session_id == session_id, Message.id == message_id)
+    )
+    message = self.session.scalars(stmt).first()
+
+    if not message or not message.option:
+      logger.error(f"Chart message {message_id} of session {session_id} not found.")
+      raise HTTPException(
+        status_code=404, detail=f"Chart message {message_id} of session {session_id} not found."
+      )
+
+    return {
+      "option": message.full_option or message.option,
+      "downsampled": message.full_option is not None,
+    }
+
   async def add_chat_session(self, session_id: str):
     title = f"Session id: {session_id}"
     try:
@@ -102,7 +122,12 @@ class ChatSessionService:
       raise HTTPException(status_code=500, detail=f"New user message insertion failed: {e}")
 
   async def add_assistant_message(
-    self, session_id: str, option: Optional[str], content: Optional[str], component: Optional[str]
+    self,
+    session_id: str,
+    option: Optional[str],
+    content: Optional[str],
+    component: Optional[str],
+    full_option: Optional[dict] = None,
   ):
     try:
       stmt = select(Message.id).where(Message.session_id == session_id).order_by(Message.id.desc())
@@ -115,6 +140,7 @@ class ChatSessionService:
         content=content,
         option=option,
         component=component,
+        full_option=full_option,
       )
       self.session.add(new_message)
       self.session.commit()
@@ -0,0 +1,169 @@
+import logging
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.models.chat_session import FileRecord
+from app.models.test_dataset import Dataset
+from app.services.file_service import FileService
+from app.services.tabular_service import ColumnarTable, build_table
+
+logger = logging.getLogger(__name__)
+
+DATASET_TABLE_NAME = "dataset"
+DATASET_CACHE_TTL_SECONDS = 300
+DATASET_KEYWORDS = ["dataset", "database", "db"]
+DATASET_QUERY_TABLE_NAME = "dataset_query"
+ATTACHMENT_CACHE_SIZE = 32
+
+_dataset_cache: Dict[str, object] = {"table": None, "loaded_at": 0.0}
+# Decoded attachment tables keyed by (session_id, file hashes), shared across requests so paging
+# through a large table does not decompress the .npz payload on every page
+_attachment_cache: "OrderedDict[tuple, List[ColumnarTable]]" = OrderedDict()
+
+
+def reads_dataset(tables: List[ColumnarTable]) -> bool:
+  """Whether any of the tables holds live `dataset` rows, loaded directly or by the SQL agent."""
+  return any(table.name in (DATASET_TABLE_NAME, DATASET_QUERY_TABLE_NAME) for table in tables)
+
+
+def wants_dataset(request: str) -> bool:
+  words = re.findall(r"[a-z]+", request.lower())
+  return any(keyword in words for keyword in DATASET_KEYWORDS)
+
+
+class DataSourceService:
+  """Resolves the columnar tables deterministic engines may compute over for a session.
+
+  Sources are the SQL agent's query result, the session's parsed tabular attachments and, when
+  the request refers to it, the `dataset` table. Tables are memoized for the lifetime of the service (one request).
+  """
+
+  def __init__(self, db: Session):
+    self.session = db
+    self.file_service = FileService(db)
+    self._attachment_tables: Dict[str, List[ColumnarTable]] = {}
+
+  async def get_tables(
+    self, session_id: Optional[str], request: str = "", dataset_result: Optional[dict] = None
+  ) -> List[ColumnarTable]:
+    tables = []
+
+    # Rows already aggregated by the SQL agent are the most specific source for this turn
+    if dataset_result and dataset_result.get("rows"):
+      query_table = build_table(
+        DATASET_QUERY_TABLE_NAME, [dataset_result["columns"], *dataset_result["rows"]]
+      )
+      if query_table is not None:
+        tables.append(query_table)
+
+    if session_id:
+      tables.extend(await self.get_attachment_tables(session_id))
+
+    if wants_dataset(request):
+      dataset_table = self.get_dataset_table()
+      if dataset_table is not None:
+        tables.append(dataset_table)
+
+    return tables
+
+  async def get_table(self, session_id: Optional[str], name: str) -> Optional[ColumnarTable]:
+    if name == DATASET_TABLE_NAME:
+      return self.get_dataset_table()
+
+    if not session_id:
+      return None
+
+    tables = await self.get_attachment_tables(session_id)
+    return next((table for table in tables if table.name == name), None)
+
+  async def get_attachment_tables(self, session_id: str) -> List[ColumnarTable]:
+    if session_id not in self._attachment_tables:
+      try:
+        self._attachment_tables[session_id] = await self._load_attachment_tables(session_id)
+      except Exception as e:
+        logger.warning(f"Columnar tables unavailable for session {session_id}: {e}")
+        self._attachment_tables[session_id] = []
+
+    return self._attachment_tables[session_id]
+
+  async def _load_attachment_tables(self, session_id: str) -> List[ColumnarTable]:
+    stmt = (
+      select(FileRecord.file_hash)
+      .where(FileRecord.session_id == int(session_id), FileRecord.columnar_data.is_not(None))
+      .order_by(FileRecord.file_id)
+    )
+    file_hashes = tuple(self.session.scalars(stmt).all())
+    if not file_hashes:
+      return []
+
+    cache_key = (session_id, file_hashes)
+    if cache_key in _attachment_cache:
+      _attachment_cache.move_to_end(cache_key)
+      return _attachment_cache[cache_key]
+
+    tables = await self.file_service.retrieve_tables_by_session_id(int(session_id))
+
+    _attachment_cache[cache_key] = tables
+    if len(_attachment_cache) > ATTACHMENT_CACHE_SIZE:
+      _attachment_cache.popitem(last=False)
+
+    return tables
+
+  def get_dataset_table(self) -> Optional[ColumnarTable]:
+    cached = _dataset_cache["table"]
+    if (
+      cached is not None
+      and time.monotonic() - _dataset_cache["loaded_at"] < DATASET_CACHE_TTL_SECONDS
+    ):
+      return cached
+
+    try:
+      rows = self.session.execute(
+        select(
+          Dataset.product_name,
+          Dataset.year,
+          Dataset.month,
+          Dataset.period,
+          Dataset.revenue,
+          Dataset.expenses,
+          Dataset.current_employees,
+        )
+      ).all()
+    except Exception as e:
+      logger.error(f"Failed to load dataset table: {e}")
+      return None
+
+    if not rows:
+      return None
+
+    product_name, year, month, period, revenue, expenses, current_employees = zip(*rows)
+
+    table = ColumnarTable(
+      name=DATASET_TABLE_NAME,
+      columns={
+        "product_name": np.asarray(product_name, dtype=str),
+        "year": np.asarray(year, dtype=np.int64),
+        "month": np.asarray(month, dtype=str),
+        # Typed period column so time series sort chronologically instead of by month name
+        "period": np.asarray(period, dtype="datetime64[D]"),
+        "revenue": np.asarray(revenue, dtype=np.int64),
+        "expenses": np.asarray(expenses, dtype=np.int64),
+        "current_employees": np.asarray(current_employees, dtype=np.int64),
+      },
+    )
+
+    _dataset_cache["table"] = table
+    _dataset_cache["loaded_at"] = time.monotonic()
+    return table
+
+
+def get_data_source_service(db: Session = Depends(get_db)) -> DataSourceService:
+  return DataSourceService(db)
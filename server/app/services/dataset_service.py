@@ -0,0 +1,129 @@
+import logging
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Tuple
+
+from fastapi import Depends, HTTPException
+from sqlalchemy import and_, extract, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.db.database import get_db
+from app.models.dataset_aggregate_model import (
+  DatasetAggregateRequest,
+  DatasetAggregateResponse,
+)
+from app.models.test_dataset import Dataset
+from app.services.tabular_service import MONTH_NAMES
+
+logger = logging.getLogger(__name__)
+
+RESULT_CACHE_SIZE = 128
+RESULT_CACHE_TTL_SECONDS = 300
+
+SQL_FUNCTIONS = {
+  "sum": func.sum,
+  "avg": func.avg,
+  "min": func.min,
+  "max": func.max,
+  "count": func.count,
+}
+
+# Aggregate results keyed by the canonical request JSON, shared across requests
+_result_cache: "OrderedDict[str, Tuple[float, DatasetAggregateResponse]]" = OrderedDict()
+
+
+class DatasetService:
+  """Read-only aggregation over the `dataset` table, executed as a single GROUP BY query."""
+
+  def __init__(self, db: Session):
+    self.session = db
+
+  def aggregate(self, req: DatasetAggregateRequest) -> DatasetAggregateResponse:
+    cache_key = req.model_dump_json()
+    cached = _result_cache.get(cache_key)
+    if cached and time.monotonic() - cached[0] < RESULT_CACHE_TTL_SECONDS:
+      _result_cache.move_to_end(cache_key)
+      return cached[1].model_copy(update={"cached": True})
+
+    dimensions = {
+      "product_name": Dataset.product_name,
+      "year": extract("year", Dataset.period),
+      "month": extract("month", Dataset.period),
+      "period": Dataset.period,
+    }
+    group_columns = [dimensions[name].label(name) for name in req.group_by]
+    metric_columns = [
+      SQL_FUNCTIONS[metric.func](getattr(Dataset, metric.column)).label(metric.alias)
+      for metric in req.metrics
+    ]
+
+    stmt = select(*group_columns, *metric_columns)
+
+    filters = req.filters
+    if filters.product_names:
+      stmt = stmt.where(Dataset.product_name.in_(filters.product_names))
+    if filters.years:
+      # Ranges on the indexed period column instead of EXTRACT(year), which cannot use the index
+      stmt = stmt.where(
+        or_(
+          *[
+            and_(Dataset.period >= date(year, 1, 1), Dataset.period < date(year + 1, 1, 1))
+            for year in filters.years
+          ]
+        )
+      )
+    if filters.period_from:
+      stmt = stmt.where(Dataset.period >= filters.period_from)
+    if filters.period_to:
+      stmt = stmt.where(Dataset.period <= filters.period_to)
+
+    if group_columns:
+      stmt = stmt.group_by(*[dimensions[name] for name in req.group_by])
+
+    orderable = {column.name: column for column in group_columns + metric_columns}
+    if req.order_by:
+      if req.order_by not in orderable:
+        raise HTTPException(
+          status_code=400,
+          detail=f"Cannot order by {req.order_by}, expected one of {list(orderable)}.",
+        )
+      order_column = orderable[req.order_by]
+      stmt = stmt.order_by(order_column.desc() if req.descending else order_column.asc())
+    elif group_columns:
+      stmt = stmt.order_by(*[dimensions[name] for name in req.group_by])
+
+    if req.limit:
+      stmt = stmt.limit(req.limit)
+
+    result = self.session.execute(stmt)
+    columns = list(result.keys())
+    rows = [self._to_row(row._mapping) for row in result]
+
+    response = DatasetAggregateResponse(columns=columns, rows=rows)
+
+    _result_cache[cache_key] = (time.monotonic(), response)
+    _result_cache.move_to_end(cache_key)
+    if len(_result_cache) > RESULT_CACHE_SIZE:
+      _result_cache.popitem(last=False)
+
+    return response
+
+  def _to_row(self, mapping) -> dict:
+    row = {}
+    for key, value in mapping.items():
+      if key in ("year", "month"):
+        value = int(value)
+        if key == "month":
+          value = MONTH_NAMES[value - 1].title()
+      elif key == "period":
+        value = value.isoformat()
+      elif value is not None and not isinstance(value, int):
+        # avg() comes back as Decimal
+        value = round(float(value), 2)
+      row[key] = value
+    return row
+
+
+def get_dataset_service(db: Session = Depends(get_db)) -> DatasetService:
+  return DatasetService(db)
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import ClassVar
+from typing import ClassVar, Literal
 
 from dotenv import load_dotenv
 from pydantic import SecretStr, computed_field
@@ -15,7 +15,72 @@ class EnvConfigService(BaseSettings):
   )
 
   OPENAI_API_KEY: SecretStr
+  # OpenAI-compatible endpoint override, e.g. a local stub; None uses the OpenAI default
+  OPENAI_BASE_URL: str | None = None
+
+  # Shared HTTP pool used by every model client
+  LLM_TIMEOUT_SECONDS: float = 120.0
+  LLM_CONNECT_TIMEOUT_SECONDS: float = 10.0
+  LLM_MAX_CONNECTIONS: int = 50
+  LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+  LLM_KEEPALIVE_EXPIRY_SECONDS: float = 90.0
+  LLM_HTTP2: bool = True
+
+  # Exact-match cache of structured-output model calls: in-process LRU plus a Postgres tier.
+  # Only agents listed in LLM_CACHE_AGENTS are cached; a TTL of 0 disables the cache
+  LLM_CACHE_TTL_SECONDS: int = 86400
+  LLM_CACHE_MEMORY_ENTRIES: int = 256
+  LLM_CACHE_MAX_ENTRIES: int = 5000
+  LLM_CACHE_PERSISTENT: bool = True
+  LLM_CACHE_AGENTS: set[str] = {
+    "card",
+    "table",
+    "section",
+    "line_chart",
+    "bar_chart",
+    "component_supervisor",
+    "ui_builder",
+  }
   TAVILY_API_KEY: SecretStr
+  TAVILY_BASE_URL: str = "https://api.tavily.com"
+
+  SEARCH_TIMEOUT_SECONDS: float = 10.0
+  SEARCH_MAX_CONCURRENCY: int = 8
+  SEARCH_MAX_RETRIES: int = 2
+  SEARCH_MAX_RESULTS: int = 3
+  SEARCH_RESULT_MAX_CHARS: int = 1200
+  RESEARCH_MAX_SUB_QUERIES: int = 4
+
+  # Per-agent model cascade, cheapest first: a result failing validation escalates to the
+  # next model. Agents without an entry (or with the cascade disabled) use their default model
+  MODEL_CASCADE_ENABLED: bool = True
+  MODEL_CASCADE: dict[str, list[str]] = {
+    "card": ["gpt-4.1-mini", "gpt-4.1"],
+    "section": ["gpt-4.1-mini", "gpt-4.1"],
+    "table": ["gpt-4.1-mini", "gpt-4.1"],
+    "line_chart": ["gpt-4o-mini", "gpt-4.1"],
+    "bar_chart": ["gpt-4o-mini", "gpt-4.1"],
+  }
+
+  # Recorded SSE responses replayed for identical requests (same input and attachments).
+  # A TTL of 0 disables it; REPLAY_PACE_SECONDS spaces out replayed progress events
+  REPLAY_CACHE_TTL_SECONDS: int = 86400
+  REPLAY_CACHE_MAX_ENTRIES: int = 1000
+  REPLAY_PACE_SECONDS: float = 0.0
+
+  # Directory receiving a gzip JSON-lines trace of every graph run's raw event stream
+  # (replay with app/mock/trace_replay.py); unset disables recording
+  TRACE_RECORDING_DIR: str | None = None
+
+  # Postgres-backed cache of search results and research answers, shared across workers.
+  # A TTL of 0 disables it; per-session scoping keeps one session's research out of others
+  RESEARCH_CACHE_TTL_SECONDS: int = 21600
+  RESEARCH_CACHE_MAX_ENTRIES: int = 5000
+  RESEARCH_CACHE_PER_SESSION: bool = False
+
+  # Research findings remembered per session so on-topic follow-up turns skip the researcher
+  RESEARCH_MEMORY_TTL_SECONDS: int = 3600
+  RESEARCH_MEMORY_MAX_TOPICS: int = 8
 
   PSQL_USERNAME: str
   PSQL_PASSWORD: SecretStr
@@ -25,11 +90,40 @@ class EnvConfigService(BaseSettings):
   PSQL_SSLMODE: str = "disable"
   PSQL_CHAT_SESSIONS_SCHEMA: str = "chat_sessions"
 
-  def __get_postgres_url(self, scheme: str) -> MultiHostUrl:
+  # Dedicated read-only role (SELECT on dataset only) for agent-generated SQL; the SQL agent
+  # stays disabled without it and never runs queries with the main credentials
+  PSQL_READONLY_USERNAME: str | None = None
+  PSQL_READONLY_PASSWORD: SecretStr | None = None
+  SQL_STATEMENT_TIMEOUT_MS: int = 5000
+  SQL_ROW_CAP: int = 200
+  SQL_POOL_SIZE: int = 2
+
+  # Assemble the final dashboard with the UI builder LLM instead of the deterministic assembler
+  UI_BUILDER_USE_LLM: bool = False
+
+  # "plan_execute": plan a dashboard once and let the executor drive every component,
+  # "supervised": return to the component supervisor after each component
+  DASHBOARD_EXECUTION_MODE: Literal["plan_execute", "supervised"] = "plan_execute"
+  DASHBOARD_VERIFY_PASS: bool = True
+
+  # Line series longer than this are downsampled with LTTB before sending (0 disables)
+  LINE_CHART_MAX_POINTS: int = 1000
+  # Bar charts keep the top categories and fold the rest into "Other" (0 disables)
+  BAR_CHART_MAX_CATEGORIES: int = 20
+  # Send bar charts as an ECharts dataset with encoded series instead of per-series data
+  BAR_CHART_DATASET_ENCODING: bool = False
+
+  # Start web research concurrently with the supervisor call for requests that look like
+  # they need it; the result is dropped if the supervisor routes elsewhere
+  SPECULATIVE_RESEARCH: bool = False
+
+  def __get_postgres_url(
+    self, scheme: str, username: str | None = None, password: SecretStr | None = None
+  ) -> MultiHostUrl:
     return MultiHostUrl.build(
       scheme=scheme,
-      username=self.PSQL_USERNAME,
-      password=self.PSQL_PASSWORD.get_secret_value(),
+      username=username or self.PSQL_USERNAME,
+      password=(password or self.PSQL_PASSWORD).get_secret_value(),
       host=self.PSQL_HOST,
       path=self.PSQL_DATABASE,
       port=self.PSQL_PORT,
@@ -40,6 +134,17 @@ class EnvConfigService(BaseSettings):
   def postgres_url(self) -> MultiHostUrl:
     return self.__get_postgres_url("postgresql")
 
+  @computed_field
+  @property
+  def readonly_postgres_url(self) -> MultiHostUrl | None:
+    if not self.PSQL_READONLY_USERNAME or not self.PSQL_READONLY_PASSWORD:
+      return None
+    if self.PSQL_READONLY_USERNAME == self.PSQL_USERNAME:
+      return None
+    return self.__get_postgres_url(
+      "postgresql", self.PSQL_READONLY_USERNAME, self.PSQL_READONLY_PASSWORD
+    )
+
 
 @lru_cache
 def get_env_configs() -> EnvConfigService:
@@ -18,6 +18,12 @@ from sqlalchemy.orm import Session
 
 from app.db.database import get_db
 from app.models.chat_session import FileRecord
+from app.services.tabular_service import (
+  ColumnarTable,
+  TabularParser,
+  deserialize_tables,
+  serialize_tables,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +31,7 @@ logger = logging.getLogger(__name__)
 class FileService:
   def __init__(self, db: Session):
     self.session = db
+    self.tabular_parser = TabularParser()
 
   async def get_files_by_session_id(self, session_id: str):
     try:
@@ -44,6 +51,16 @@ class FileService:
         status_code=500, detail=f"Failed to fetch files by session_id {session_id}: {e}"
       )
 
+  async def get_file_hashes(self, session_id: int) -> List[str]:
+    try:
+      stmt = select(FileRecord.file_hash).where(FileRecord.session_id == session_id)
+      return list(self.session.scalars(stmt).all())
+    except Exception as e:
+      logger.error(f"Failed to fetch file hashes by session_id {session_id}: {e}")
+      raise HTTPException(
+        status_code=500, detail=f"Failed to fetch file hashes by session_id {session_id}: {e}"
+      )
+
   async def save_files(self, files: List[UploadFile], session_id: int):
     try:
       for file in files:
@@ -69,6 +86,9 @@ class FileService:
           continue
 
         extracted_text = await self._extract_text(content, file.content_type, file.filename)
+        columnar_data, table_schema = self._extract_tables(
+          content, file.content_type, file.filename
+        )
 
         file_record = FileRecord(
           session_id=session_id,
@@ -76,6 +96,8 @@ class FileService:
           file_hash=file_hash,
           content_type=file.content_type or "application/octet-stream",
           content=extracted_text,
+          columnar_data=columnar_data,
+          table_schema=table_schema,
         )
 
         self.session.add(file_record)
@@ -111,6 +133,41 @@ class FileService:
         detail=f"Couldn't retrieve content from db by session_id:{session_id}, {e}",
       )
 
+  async def retrieve_tables_by_session_id(self, session_id: int) -> List[ColumnarTable]:
+    try:
+      stmt = select(FileRecord).where(
+        FileRecord.session_id == session_id, FileRecord.columnar_data.is_not(None)
+      )
+      files = self.session.scalars(stmt).all()
+
+      tables = []
+      for file in files:
+        tables.extend(deserialize_tables(file.columnar_data, file.table_schema))
+
+      return tables
+    except Exception as e:
+      logger.error(f"Couldn't retrieve tables from database by session id {session_id}: {e}")
+      raise HTTPException(
+        status_code=500,
+        detail=f"Couldn't retrieve tables from db by session_id:{session_id}, {e}",
+      )
+
+  def _extract_tables(self, content: bytes, content_type: str, filename: str):
+    """Parse tabular attachments into columnar form, returns (payload, schema) or (None, None)"""
+    if not self.tabular_parser.supports(content_type):
+      return None, None
+
+    try:
+      tables = self.tabular_parser.parse(content, content_type, filename)
+      if not tables:
+        return None, None
+
+      return serialize_tables(tables)
+    except Exception as e:
+      # Text extraction already succeeded, columnar data is an optional enrichment
+      logger.warning(f"Failed to parse {filename} into columnar tables: {e}")
+      return None, None
+
   async def _extract_text(self, content: bytes, content_type: str, filename: str = None):
     if not content_type:
       logger.error("File doesn't have content type.")
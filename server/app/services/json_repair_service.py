@@ -0,0 +1,161 @@
+import re
+from typing import Any, List
+
+from langchain_core.utils.json import parse_json_markdown
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_NUMERIC_STRING = re.compile(r"^([-+]?)\s*[$€£]?\s*(\d[\d,]*(?:\.\d+)?|\.\d+)\s*(%|[kmb])?$", re.I)
+_MULTIPLIERS = {"k": 1e3, "m": 1e6, "b": 1e9}
+# Table cells are only coerced when they are plain numbers: leading zeros (ids, zip codes),
+# percent, currency and K/M/B suffixes are formatting the table keeps
+_PLAIN_NUMBER = re.compile(r"^[-+]?(?:0|[1-9]\d{0,2}(?:,\d{3})+|[1-9]\d*)(?:\.\d+)?$")
+_CARD_NUMERIC_PROPS = ("previousValue", "delta", "progress")
+
+
+def parse_json(text: str) -> dict:
+  """Parse model output that is not strict JSON: fenced, truncated or with trailing commas.
+
+  Truncated documents are closed where they stop (open strings, arrays and objects), so a
+  response cut off by the token limit keeps everything generated before the cut.
+  """
+  # Trailing commas go first: partial parsing would otherwise drop everything after them
+  parsed = parse_json_markdown(_TRAILING_COMMA.sub(r"\1", text))
+
+  if not isinstance(parsed, dict):
+    raise ValueError(f"Expected a JSON object, got {type(parsed).__name__}.")
+  return parsed
+
+
+def to_number(value: Any) -> Any:
+  """'1,204,500' -> 1204500, '$1.2K' -> 1200, '45%' -> 45; anything else is returned as is."""
+  if not isinstance(value, str):
+    return value
+
+  match = _NUMERIC_STRING.match(value.strip())
+  if not match:
+    return value
+
+  sign, digits, suffix = match.groups()
+  number = float(digits.replace(",", "")) * _MULTIPLIERS.get((suffix or "").lower(), 1)
+  if sign == "-":
+    number = -number
+  return int(number) if number.is_integer() else number
+
+
+def _normalize_key(key: Any) -> str:
+  return re.sub(r"[^a-z0-9]", "", str(key).lower())
+
+
+def repair_chart_option(option: dict) -> dict:
+  """Fill missing chart sections with defaults, drop null series and coerce numeric strings."""
+  option.setdefault("toolbox", {"feature": {"saveAsImage": {}}})
+  # The label is required by line charts and ignored by bar charts
+  option.setdefault(
+    "tooltip", {"trigger": "axis", "axisPointer": {"label": {"backgroundColor": "#6a7985"}}}
+  )
+  option.setdefault("xAxis", {"type": "category", "data": []})
+  option.setdefault("yAxis", {"type": "value"})
+
+  series = option.get("series")
+  if isinstance(series, dict):
+    series = [series]
+  series = [item for item in series or [] if isinstance(item, dict)]
+  for item in series:
+    data = item.get("data") or []
+    item["data"] = [
+      {**point, "value": to_number(point.get("value"))}
+      if isinstance(point, dict)
+      else to_number(point)
+      for point in data
+    ]
+  option["series"] = series
+
+  title = option.get("title")
+  text = title.get("text") if isinstance(title, dict) else title
+  if not text and series:
+    text = series[0].get("name")
+  option["title"] = {**(title if isinstance(title, dict) else {}), "text": str(text or "")}
+
+  return option
+
+
+def _repair_columns(columns: List[Any], rows: List[dict]) -> List[dict]:
+  repaired = []
+  for column in columns:
+    if isinstance(column, str):
+      repaired.append({"key": re.sub(r"\W+", "_", column.lower()).strip("_"), "label": column})
+    elif isinstance(column, dict) and (column.get("key") or column.get("label")):
+      key = column.get("key") or re.sub(r"\W+", "_", str(column["label"]).lower()).strip("_")
+      repaired.append({"key": str(key), "label": str(column.get("label") or key)})
+
+  if not repaired and rows:
+    repaired = [{"key": key, "label": key.replace("_", " ").title()} for key in rows[0]]
+  return repaired
+
+
+def _repair_row(row: dict, columns: List[dict], lookup: dict) -> dict:
+  mapped = {
+    lookup[_normalize_key(key)]: value
+    for key, value in row.items()
+    if _normalize_key(key) in lookup
+  }
+  if not mapped and len(row) == len(columns):
+    # Same shape under different names: the model kept the column order
+    mapped = dict(zip([column["key"] for column in columns], row.values()))
+  return mapped or row
+
+
+def _numeric_columns(rows: List[dict]) -> set:
+  """Keys whose values are all numbers or plain numeric strings, with at least one string."""
+  numeric, has_strings = {}, set()
+  for row in rows:
+    for key, value in row.items():
+      if value is None or value == "":
+        numeric.setdefault(key, True)
+      elif isinstance(value, str):
+        has_strings.add(key)
+        numeric[key] = numeric.get(key, True) and bool(_PLAIN_NUMBER.match(value.strip()))
+      else:
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        numeric[key] = numeric.get(key, True) and is_number
+  return {key for key, is_numeric in numeric.items() if is_numeric and key in has_strings}
+
+
+def repair_descriptor(descriptor: dict) -> dict:
+  """Repair a card or table descriptor in place of a regeneration.
+
+  Table columns given as plain strings become {key, label}, row keys are matched to column
+  keys by name or label (or by position when none match), null rows are dropped and columns
+  holding only plain numbers written as strings become numeric; "007", "45%" or "$3K" stay
+  as written. Cards get their numeric props coerced.
+  """
+  props = descriptor.get("props")
+  if not isinstance(props, dict):
+    return descriptor
+
+  if descriptor.get("type") == "card":
+    for prop in _CARD_NUMERIC_PROPS:
+      if prop in props:
+        props[prop] = to_number(props[prop])
+    return descriptor
+
+  if descriptor.get("type") != "table":
+    return descriptor
+
+  rows = [row for row in props.get("rows") or [] if isinstance(row, dict)]
+  columns = _repair_columns(props.get("columns") or [], rows)
+
+  lookup = {}
+  for column in columns:
+    lookup.setdefault(_normalize_key(column["label"]), column["key"])
+  for column in columns:
+    lookup[_normalize_key(column["key"])] = column["key"]
+
+  props["columns"] = columns
+  rows = [_repair_row(row, columns, lookup) for row in rows]
+  numeric = _numeric_columns(rows)
+  props["rows"] = [
+    {key: to_number(value) if key in numeric else value for key, value in row.items()}
+    for row in rows
+  ]
+  return descriptor
@@ -0,0 +1,397 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from app.services.tabular_service import (
+  MONTH_NAMES,
+  ColumnarTable,
+  aggregate_by_code,
+  group_aggregate,
+  mentioned_names,
+  tokenize,
+)
+
+logger = logging.getLogger(__name__)
+
+KPI_FUNCTIONS = {
+  "sum": "sum",
+  "total": "sum",
+  "avg": "mean",
+  "average": "mean",
+  "mean": "mean",
+  "min": "min",
+  "minimum": "min",
+  "lowest": "min",
+  "max": "max",
+  "maximum": "max",
+  "highest": "max",
+  "peak": "max",
+  "count": "count",
+}
+AGGREGATION_LABELS = {
+  "sum": "Total",
+  "mean": "Avg",
+  "min": "Min",
+  "max": "Max",
+  "count": "Count of",
+}
+DESCRIPTION_LABELS = {
+  "sum": "Sum",
+  "mean": "Average",
+  "min": "Minimum",
+  "max": "Maximum",
+  "count": "Count",
+}
+PER_PERIOD_WORDS = {"monthly": "month", "yearly": "year", "annual": "year", "annually": "year"}
+COMPARISON_WORDS = {
+  "delta",
+  "change",
+  "growth",
+  "increase",
+  "decrease",
+  "previous",
+  "prior",
+  "vs",
+  "versus",
+  "trend",
+  "yoy",
+  "mom",
+}
+GROWTH_WORDS = {"growth", "percent", "percentage", "pct", "rate"}
+TEMPORAL_WORDS = {"date", "year", "month", "quarter", "period", "week", "day", "time"}
+STOP_WORDS = {
+  "card",
+  "create",
+  "using",
+  "from",
+  "data",
+  "dataset",
+  "research",
+  "attachment",
+  "for",
+  "the",
+  "of",
+  "in",
+  "kpi",
+  "metric",
+  "value",
+  "overall",
+  "show",
+  "showing",
+}
+
+_EXPRESSION_PATTERN = re.compile(r"\b(" + "|".join(KPI_FUNCTIONS) + r")\s*\(\s*([^)]*?)\s*\)", re.I)
+_CARD_ID_PATTERN = re.compile(r"\b(card_[a-z0-9_]+|[a-z0-9_]+_card)\b")
+# Plan step numbering and data source references, e.g. "2. ... from research_data['revenue']"
+_STEP_NUMBER_PATTERN = re.compile(r"^\s*\d+[.)]\s*")
+_SOURCE_PATTERN = re.compile(
+  r"\b(?:research_data|attachment_contents|dataset_result)\b(?:\s*\[[^\]]*\])*"
+)
+_YEAR_PATTERN = re.compile(r"(?<!\d)(19\d{2}|20\d{2})(?!\d)")
+_UNIT_PATTERN = re.compile(r"\(([^)]*)\)")
+
+
+@dataclass
+class KpiSpec:
+  """One aggregate expression from a dashboard plan step, resolved against a table."""
+
+  table: ColumnarTable
+  measure: str
+  aggregation: str = "sum"
+  year: Optional[int] = None
+  per_period: Optional[str] = None
+  compare: bool = False
+  growth: bool = False
+
+
+@dataclass
+class KpiResult:
+  value: float
+  previous_value: Optional[float] = None
+  delta: Optional[float] = None
+  growth_pct: Optional[float] = None
+  period: Optional[int] = None
+  previous_period: Optional[int] = None
+
+  @property
+  def trend(self) -> str:
+    if self.delta is None or self.delta == 0:
+      return "neutral"
+    return "up" if self.delta > 0 else "down"
+
+
+class KpiEngine:
+  """Evaluates KPI expressions named in dashboard TODO steps over columnar data with NumPy.
+
+  Supported: sum/avg/min/max/count, per-period averages ("avg monthly revenue"), year filters
+  and period-over-period delta / growth %. Every word of the step has to be accounted for:
+  ratios, rankings, category filters ("North region") and other qualifiers it cannot resolve
+  leave the card to the LLM instead of computing a plausible but wrong number.
+  """
+
+  def parse(self, description: str, tables: List[ColumnarTable]) -> Optional[KpiSpec]:
+    if not tables:
+      return None
+
+    # The card id never picks the aggregation or the measure ("card_employee_count" asks for
+    # no count), only its qualifiers (year, per-period, growth) count and must be resolved
+    lowered = description.lower()
+    card_ids = _CARD_ID_PATTERN.findall(lowered)
+    text = _CARD_ID_PATTERN.sub(" ", lowered)
+    text = _STEP_NUMBER_PATTERN.sub("", _SOURCE_PATTERN.sub(" ", text))
+    if "/" in text:
+      return None
+
+    tokens = set(tokenize(text))
+    qualifiers = tokens | set(tokenize(" ".join(card_ids)))
+    expression = _EXPRESSION_PATTERN.search(text)
+
+    if expression:
+      aggregation = KPI_FUNCTIONS[expression.group(1).lower()]
+      argument_tokens = set(tokenize(expression.group(2))) - STOP_WORDS
+    else:
+      function_word = next((word for word in tokenize(text) if word in KPI_FUNCTIONS), None)
+      aggregation = KPI_FUNCTIONS.get(function_word, "sum")
+      argument_tokens = tokens - STOP_WORDS
+
+    argument_text = expression.group(2) if expression else text
+    table, measure = self._resolve_measure(argument_text, argument_tokens or tokens, tables)
+    if measure is None:
+      return None
+
+    years = {int(match) for match in _YEAR_PATTERN.findall(" ".join([text, *card_ids]))}
+    year = max(years) if years else None
+    per_period = next(
+      (period for word, period in PER_PERIOD_WORDS.items() if word in qualifiers), None
+    )
+    compare = bool(qualifiers & COMPARISON_WORDS) or "%" in text
+    growth = bool(qualifiers & GROWTH_WORDS) or "%" in text
+
+    resolved = (
+      set(tokenize(measure))
+      | STOP_WORDS
+      | set(KPI_FUNCTIONS)
+      | set(PER_PERIOD_WORDS)
+      | COMPARISON_WORDS
+      | GROWTH_WORDS
+    )
+    if year is not None:
+      resolved |= {str(year), str(year - 1)} if compare else {str(year)}
+    unresolved = qualifiers - resolved
+    if unresolved:
+      logger.info(f"KPI step '{description}' has unresolved words {sorted(unresolved)}.")
+      return None
+
+    return KpiSpec(
+      table=table,
+      measure=measure,
+      aggregation=aggregation,
+      year=year,
+      per_period=per_period,
+      compare=compare,
+      growth=growth,
+    )
+
+  def compute(self, spec: KpiSpec) -> Optional[KpiResult]:
+    table = spec.table
+    years = self._year_keys(table)
+    everything = np.ones(table.row_count, dtype=bool)
+
+    year = spec.year if years is not None else None
+    if spec.compare and year is None and years is not None:
+      # Period-over-period without an explicit year compares the latest two years
+      year = int(years.max())
+
+    mask = everything if year is None else years == year
+    if not mask.any():
+      return None
+
+    value = self._aggregate(spec, mask)
+    if value is None or np.isnan(value):
+      return None
+
+    result = KpiResult(value=float(value), period=year)
+
+    if spec.compare and year is not None:
+      previous_mask = years == year - 1
+      previous = self._aggregate(spec, previous_mask) if previous_mask.any() else None
+      if previous is not None and not np.isnan(previous):
+        result.previous_value = float(previous)
+        result.previous_period = year - 1
+        result.delta = result.value - result.previous_value
+        if result.previous_value:
+          result.growth_pct = result.delta / abs(result.previous_value) * 100
+
+    return result
+
+  def card_for_step(self, description: str, tables: List[ColumnarTable]) -> Optional[dict]:
+    spec = self.parse(description, tables)
+    if spec is None:
+      return None
+
+    try:
+      result = self.compute(spec)
+    except Exception as e:
+      logger.error(f"KPI computation failed for step '{description}': {e}")
+      return None
+
+    if result is None:
+      return None
+
+    logger.info(f"Computed KPI {spec.aggregation}({spec.measure}) from {spec.table.name}.")
+    return self.render_card(description, spec, result)
+
+  def render_card(self, description: str, spec: KpiSpec, result: KpiResult) -> dict:
+    measure_label = re.sub(r"\s*\(.*?\)", "", spec.measure).strip() or spec.measure
+    measure_label = measure_label.replace("_", " ").title()
+    aggregation_label = AGGREGATION_LABELS[spec.aggregation]
+    if spec.per_period:
+      aggregation_label = f"{aggregation_label} {spec.per_period.title()}ly"
+
+    title = f"{aggregation_label} {measure_label}"
+    if measure_label.lower().startswith(aggregation_label.lower()):
+      title = measure_label
+    if spec.growth:
+      title = f"{measure_label} Growth"
+
+    card_id_match = _CARD_ID_PATTERN.search(description.lower())
+    card_id = card_id_match.group(1) if card_id_match else None
+    if not card_id:
+      card_id = re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_") + "_card"
+
+    unit_match = _UNIT_PATTERN.search(spec.measure)
+    unit = unit_match.group(1).strip() if unit_match else ""
+    if not unit and "usd" in tokenize(spec.measure):
+      unit = "$"
+
+    props = {
+      "title": title,
+      "loading": False,
+      "size": "md",
+      "bordered": True,
+      "shadow": True,
+      "rounded": True,
+      "className": "",
+      "children": [],
+    }
+
+    period_note = f" in {result.period}" if result.period is not None else ""
+    if spec.growth and result.growth_pct is not None:
+      props["value"] = self._format_number(result.growth_pct)
+      props["unit"] = "%"
+      props["description"] = (
+        f"{measure_label} change from {result.previous_period} to {result.period}"
+      )
+    else:
+      props["value"] = self._format_number(result.value)
+      if unit:
+        props["unit"] = unit
+      per_period_note = f" per {spec.per_period}" if spec.per_period else ""
+      props["description"] = (
+        f"{DESCRIPTION_LABELS[spec.aggregation]} of {measure_label}{per_period_note}{period_note}"
+      )
+
+    if result.previous_value is not None:
+      props["previousValue"] = self._round(result.previous_value)
+      props["delta"] = self._round(result.delta)
+      props["trend"] = result.trend
+      props["trendColor"] = {
+        "up": "text-green-500",
+        "down": "text-red-500",
+        "neutral": "text-gray-500",
+      }[result.trend]
+
+    return {"id": card_id, "type": "card", "props": props}
+
+  def _resolve_measure(self, text: str, tokens: set, tables: List[ColumnarTable]):
+    """The one column the step names: in full ("Product C") or as the single best partial
+    match. Several candidates ("Product A/B/C" for "product") leave the card to the LLM."""
+    candidates = []
+    for table in tables:
+      for column in table.columns:
+        if table.column_type(column) not in ("integer", "float"):
+          continue
+        column_tokens = set(tokenize(column))
+        if column_tokens and not column_tokens & TEMPORAL_WORDS:
+          candidates.append((table, column, column_tokens))
+
+    mentioned = mentioned_names(text, {column for _, column, _ in candidates})
+    if mentioned:
+      matches = [(table, column) for table, column, _ in candidates if column in mentioned]
+    else:
+      scored = [
+        (len(column_tokens & tokens) / len(column_tokens), table, column)
+        for table, column, column_tokens in candidates
+        if column_tokens & tokens
+      ]
+      top_score = max((score for score, _, _ in scored), default=0.0)
+      matches = [(table, column) for score, table, column in scored if score == top_score]
+
+    if len(matches) != 1:
+      if matches:
+        logger.info(f"Ambiguous KPI measure: {[column for _, column in matches]}.")
+      return None, None
+    return matches[0]
+
+  def _aggregate(self, spec: KpiSpec, mask: np.ndarray) -> Optional[float]:
+    values = spec.table.columns[spec.measure][mask]
+
+    if spec.per_period:
+      keys = self._period_keys(spec.table, spec.per_period)
+      if keys is None:
+        return None
+      # e.g. "avg monthly revenue": total per month first, then aggregate across months
+      _, per_period_totals = group_aggregate([keys[mask]], values, "sum")
+      return aggregate_by_code(
+        np.zeros(per_period_totals.size, dtype=np.intp), per_period_totals, spec.aggregation, 1
+      )[0]
+
+    return aggregate_by_code(np.zeros(values.size, dtype=np.intp), values, spec.aggregation, 1)[0]
+
+  def _year_keys(self, table: ColumnarTable) -> Optional[np.ndarray]:
+    for column, values in table.columns.items():
+      if table.column_type(column) == "datetime":
+        return values.astype("datetime64[Y]").astype(np.int64) + 1970
+
+    for column, values in table.columns.items():
+      if "year" in tokenize(column) and table.column_type(column) == "integer":
+        if values.size and 1900 <= values.min() and values.max() <= 2100:
+          return values
+
+    return None
+
+  def _period_keys(self, table: ColumnarTable, period: str) -> Optional[np.ndarray]:
+    for column, values in table.columns.items():
+      if table.column_type(column) == "datetime":
+        unit = "datetime64[M]" if period == "month" else "datetime64[Y]"
+        return values.astype(unit).astype(np.int64)
+
+    years = self._year_keys(table)
+    if period == "year":
+      return years
+
+    month_column = next((column for column in table.columns if "month" in tokenize(column)), None)
+    if month_column is None or table.column_type(month_column) != "string":
+      return None
+
+    lowered = np.char.lower(table.columns[month_column])
+    month_index = np.asarray(
+      [MONTH_NAMES.index(name) if name in MONTH_NAMES else -1 for name in lowered.tolist()]
+    )
+    if (month_index < 0).any():
+      return None
+
+    return month_index if years is None else years * 12 + month_index
+
+  def _round(self, value: Optional[float]):
+    if value is None:
+      return None
+    return int(value) if float(value).is_integer() else round(float(value), 2)
+
+  def _format_number(self, value: float) -> str:
+    if float(value).is_integer():
+      return f"{int(value):,}"
+    return f"{value:,.2f}".rstrip("0").rstrip(".")
@@ -0,0 +1,197 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from langchain_core.messages import convert_to_messages
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.database import SessionLocal
+from app.models.llm_response_cache import LlmResponseCacheEntry
+from app.services.env_config_service import EnvConfigService, get_env_configs
+from app.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(model: str, params: dict, messages) -> str:
+  rendered = [
+    {"type": message.type, "content": message.content}
+    for message in convert_to_messages(messages if isinstance(messages, list) else [messages])
+  ]
+  payload = json.dumps(
+    {"model": model, "params": params, "messages": rendered}, sort_keys=True, default=str
+  )
+  return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LlmResponseCache:
+  """Two-tier exact-match cache of structured model outputs.
+
+  An in-process LRU answers repeated calls without I/O; a Postgres table shares responses across
+  workers and restarts. Entries expire after LLM_CACHE_TTL_SECONDS and the table keeps at most
+  LLM_CACHE_MAX_ENTRIES rows. Postgres failures are logged and count as misses.
+  """
+
+  def __init__(self, env_config: EnvConfigService):
+    self.ttl_seconds = env_config.LLM_CACHE_TTL_SECONDS
+    self.memory_entries = env_config.LLM_CACHE_MEMORY_ENTRIES
+    self.max_entries = env_config.LLM_CACHE_MAX_ENTRIES
+    self.persistent = env_config.LLM_CACHE_PERSISTENT
+    # key -> (monotonic expiry, response JSON, original latency in seconds)
+    self._memory: "OrderedDict[str, Tuple[float, str, float]]" = OrderedDict()
+
+  async def get(self, key: str) -> Optional[Tuple[str, float]]:
+    cached = self._memory.get(key)
+    if cached:
+      if cached[0] > time.monotonic():
+        self._memory.move_to_end(key)
+        return cached[1], cached[2]
+      del self._memory[key]
+
+    if not self.persistent:
+      return None
+
+    try:
+      stored = await run_in_threadpool(self._get, key)
+    except Exception as e:
+      logger.warning(f"LLM cache lookup failed: {e}")
+      metrics.increment("llm.cache.errors")
+      return None
+
+    if stored:
+      metrics.increment("llm.cache.persistent_hits")
+      self._remember(key, *stored)
+    return stored
+
+  async def set(self, key: str, agent: str, model: str, response: str, latency: float) -> None:
+    self._remember(key, response, latency)
+    if not self.persistent:
+      return
+
+    try:
+      await run_in_threadpool(self._set, key, agent, model, response, latency)
+    except Exception as e:
+      logger.warning(f"LLM cache write failed: {e}")
+      metrics.increment("llm.cache.errors")
+
+  def _remember(self, key: str, response: str, latency: float) -> None:
+    self._memory[key] = (time.monotonic() + self.ttl_seconds, response, latency)
+    self._memory.move_to_end(key)
+    while len(self._memory) > self.memory_entries:
+      self._memory.popitem(last=False)
+
+  def _get(self, key: str) -> Optional[Tuple[str, float]]:
+    with SessionLocal() as db:
+      row = db.execute(
+        select(LlmResponseCacheEntry.response, LlmResponseCacheEntry.latency_seconds).where(
+          LlmResponseCacheEntry.cache_key == key,
+          LlmResponseCacheEntry.expires_at > datetime.now(timezone.utc),
+        )
+      ).first()
+      return (row.response, row.latency_seconds) if row else None
+
+  def _set(self, key: str, agent: str, model: str, response: str, latency: float) -> None:
+    now = datetime.now(timezone.utc)
+    values = {
+      "cache_key": key,
+      "agent": agent,
+      "model": model,
+      "response": response,
+      "latency_seconds": latency,
+      "created_at": now,
+      "expires_at": now + timedelta(seconds=self.ttl_seconds),
+    }
+
+    with SessionLocal() as db:
+      db.execute(
+        insert(LlmResponseCacheEntry)
+        .values(**values)
+        .on_conflict_do_update(
+          index_elements=[LlmResponseCacheEntry.cache_key],
+          set_={
+            name: values[name]
+            for name in ("response", "latency_seconds", "created_at", "expires_at")
+          },
+        )
+      )
+      db.execute(delete(LlmResponseCacheEntry).where(LlmResponseCacheEntry.expires_at <= now))
+
+      overflow = (
+        select(LlmResponseCacheEntry.cache_key)
+        .order_by(LlmResponseCacheEntry.created_at.desc())
+        .offset(self.max_entries)
+      )
+      db.execute(
+        delete(LlmResponseCacheEntry).where(
+          LlmResponseCacheEntry.cache_key.in_(overflow.scalar_subquery())
+        )
+      )
+      db.commit()
+
+
+class CachedStructuredOutput:
+  """Drop-in for a structured-output runnable that answers repeated prompts from the cache.
+
+  Only successful, non-empty dict responses are stored; hits return a fresh copy, so callers
+  may mutate the result.
+  """
+
+  def __init__(
+    self, runnable: Runnable, cache: LlmResponseCache, agent: str, model: str, params: dict
+  ):
+    self.runnable = runnable
+    self.cache = cache
+    self.agent = agent
+    self.model = model
+    self.params = params
+
+  async def ainvoke(self, messages, config=None, **kwargs):
+    key = cache_key(self.model, self.params, messages)
+    metrics.increment("llm.cache.lookups")
+
+    cached = await self.cache.get(key)
+    if cached is not None:
+      response, latency = cached
+      metrics.increment("llm.cache.hits")
+      metrics.increment(f"llm.cache.{self.agent}.hits")
+      metrics.increment("llm.cache.saved_seconds", latency)
+      return json.loads(response)
+
+    metrics.increment("llm.cache.misses")
+    metrics.increment(f"llm.cache.{self.agent}.misses")
+
+    started_at = time.monotonic()
+    response = await self.runnable.ainvoke(messages, config, **kwargs)
+    latency = time.monotonic() - started_at
+
+    if isinstance(response, dict) and response:
+      await self.cache.set(key, self.agent, self.model, json.dumps(response), latency)
+    return response
+
+
+_llm_response_cache: Optional[LlmResponseCache] = None
+
+
+def get_llm_response_cache() -> LlmResponseCache:
+  global _llm_response_cache
+  if _llm_response_cache is None:
+    _llm_response_cache = LlmResponseCache(get_env_configs())
+  return _llm_response_cache
+
+
+def structured_output(llm: ChatOpenAI, agent: str, env_config: EnvConfigService):
+  """`llm.with_structured_output(method="json_mode")`, cached when enabled for `agent`."""
+  runnable = llm.with_structured_output(method="json_mode")
+  if agent not in env_config.LLM_CACHE_AGENTS or env_config.LLM_CACHE_TTL_SECONDS <= 0:
+    return runnable
+
+  params = {"method": "json_mode", "temperature": llm.temperature, "seed": llm.seed}
+  return CachedStructuredOutput(runnable, get_llm_response_cache(), agent, llm.model_name, params)
@@ -0,0 +1,83 @@
+import importlib.util
+import logging
+from typing import Optional
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from app.services.env_config_service import EnvConfigService, get_env_configs
+from app.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+
+async def _trace(event_name: str, info: dict) -> None:
+  # httpcore reports connection setup only when no pooled connection could be reused
+  if event_name == "connection.connect_tcp.complete":
+    metrics.increment("llm.http.connections_opened")
+  elif event_name == "connection.start_tls.complete":
+    metrics.increment("llm.http.tls_handshakes")
+
+
+async def _on_request(request: httpx.Request) -> None:
+  metrics.increment("llm.http.requests")
+  request.extensions["trace"] = _trace
+
+
+def _http2_available(env_config: EnvConfigService) -> bool:
+  if not env_config.LLM_HTTP2:
+    return False
+  if importlib.util.find_spec("h2") is None:
+    logger.info("HTTP/2 requested for the model API but 'h2' is not installed, using HTTP/1.1.")
+    return False
+  return True
+
+
+def _timeout(env_config: EnvConfigService) -> httpx.Timeout:
+  return httpx.Timeout(
+    env_config.LLM_TIMEOUT_SECONDS, connect=env_config.LLM_CONNECT_TIMEOUT_SECONDS
+  )
+
+
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_llm_http_client() -> httpx.AsyncClient:
+  """Process-wide keep-alive pool shared by every model client.
+
+  Agents are rebuilt per request, their model clients are not given their own pools: after the
+  first call, hops reuse warm connections instead of paying TCP and TLS setup again.
+  """
+  global _http_client
+  if _http_client is None:
+    env_config = get_env_configs()
+    _http_client = httpx.AsyncClient(
+      http2=_http2_available(env_config),
+      timeout=_timeout(env_config),
+      limits=httpx.Limits(
+        max_connections=env_config.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=env_config.LLM_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=env_config.LLM_KEEPALIVE_EXPIRY_SECONDS,
+      ),
+      event_hooks={"request": [_on_request]},
+    )
+  return _http_client
+
+
+async def close_llm_http_client() -> None:
+  global _http_client
+  if _http_client is not None:
+    await _http_client.aclose()
+    _http_client = None
+
+
+def chat_model(env_config: EnvConfigService, model: str, **kwargs) -> ChatOpenAI:
+  """ChatOpenAI bound to the shared HTTP pool and the configured base URL."""
+  return ChatOpenAI(
+    model=model,
+    api_key=env_config.OPENAI_API_KEY,
+    base_url=env_config.OPENAI_BASE_URL,
+    timeout=_timeout(env_config),
+    http_async_client=get_llm_http_client(),
+    **kwargs,
+  )
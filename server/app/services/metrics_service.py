@@ -0,0 +1,35 @@
+import threading
+from collections import defaultdict
+from typing import Dict
+
+
+class MetricsService:
+  """Process-wide counters for optimizations whose payoff should be observable.
+
+  Counters are plain numbers keyed by dotted names (e.g. "research.speculation.hits"); the
+  /metrics endpoint exposes a snapshot. Kept in memory on purpose: values reset on restart.
+  """
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._counters: Dict[str, float] = defaultdict(float)
+
+  def increment(self, name: str, amount: float = 1) -> None:
+    with self._lock:
+      self._counters[name] += amount
+
+  def snapshot(self) -> Dict[str, float]:
+    with self._lock:
+      return dict(sorted(self._counters.items()))
+
+  def ratio(self, numerator: str, denominator: str) -> float | None:
+    with self._lock:
+      total = self._counters.get(denominator, 0)
+      return self._counters.get(numerator, 0) / total if total else None
+
+
+metrics = MetricsService()
+
+
+def get_metrics_service() -> MetricsService:
+  return metrics
@@ -0,0 +1,152 @@
+import copy
+import json
+import logging
+from typing import Any, Callable, List, Optional, Tuple, Type
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.messages import HumanMessage, SystemMessage
+from pydantic import BaseModel
+
+from app.services.env_config_service import EnvConfigService
+from app.services.json_repair_service import parse_json
+from app.services.llm_cache_service import structured_output
+from app.services.llm_client_service import chat_model
+from app.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+Validator = Callable[[Any], Any]
+Repairer = Callable[[dict], dict]
+
+FIX_PROMPT = """
+You fix JSON documents that failed validation.
+Return ONLY the corrected JSON object: keep every value that is already valid, change only what
+the error points at and do not invent data. NO markdown, NO commentary.
+"""
+
+
+class ModelCascade:
+  """Structured-output calls that try the cheapest model first and escalate on failure.
+
+  Each tier's response goes through the caller's validator. A rejected response is first
+  repaired locally and then sent back once with the error for a targeted fix; only when both
+  fail does the call move to the next, larger model. Without a validator only model and
+  parsing errors escalate. Counts calls, repairs, fix calls, escalations and the tier that
+  resolved each call per agent.
+  """
+
+  def __init__(self, agent: str, tiers: List[Tuple[str, Any]]):
+    self.agent = agent
+    self.tiers = tiers
+
+  async def ainvoke(
+    self, messages, validate: Optional[Validator] = None, repair: Optional[Repairer] = None
+  ):
+    metrics.increment(f"cascade.{self.agent}.calls")
+
+    for index, (model, runnable) in enumerate(self.tiers):
+      try:
+        result = await self._attempt(runnable, messages, validate, repair)
+        metrics.increment(f"cascade.{self.agent}.resolved.{model}")
+        return result
+      except Exception as e:
+        if index == len(self.tiers) - 1:
+          metrics.increment(f"cascade.{self.agent}.failures")
+          raise
+        logger.info(f"{self.agent}: {model} result rejected ({e}), escalating.")
+        metrics.increment(f"cascade.{self.agent}.escalations")
+
+  async def _attempt(self, runnable, messages, validate, repair):
+    """One tier: generate, then repair locally, then ask for a targeted fix before giving up."""
+    try:
+      response = await runnable.ainvoke(messages)
+    except OutputParserException as e:
+      if not e.llm_output:
+        raise
+      response = e.llm_output
+
+    try:
+      return self._accept(response, validate, repair)
+    except Exception as e:
+      error = e
+
+    # Sending back the broken document is far cheaper than regenerating it from the prompt
+    metrics.increment(f"cascade.{self.agent}.fix_calls")
+    document = response if isinstance(response, str) else json.dumps(response)
+    fix_messages = [
+      SystemMessage(content=FIX_PROMPT),
+      HumanMessage(content=f"Validation error: {str(error)[:1000]}\n\nJSON:\n{document}"),
+    ]
+    try:
+      fixed = await runnable.ainvoke(fix_messages)
+    except OutputParserException as e:
+      if not e.llm_output:
+        raise
+      fixed = e.llm_output
+
+    result = self._accept(fixed, validate, repair)
+    metrics.increment(f"cascade.{self.agent}.fixed")
+    return result
+
+  def _accept(self, response, validate, repair):
+    if isinstance(response, str):
+      response = parse_json(response)
+    if validate is None:
+      return response
+
+    try:
+      return validate(response)
+    except Exception:
+      if repair is None or not isinstance(response, dict):
+        raise
+
+    result = validate(repair(copy.deepcopy(response)))
+    metrics.increment(f"cascade.{self.agent}.repaired")
+    return result
+
+
+def model_cascade(env_config: EnvConfigService, agent: str, default_model: str) -> ModelCascade:
+  """Cascade configured for `agent` in MODEL_CASCADE, or just `default_model` when disabled."""
+  models = [default_model]
+  if env_config.MODEL_CASCADE_ENABLED and env_config.MODEL_CASCADE.get(agent):
+    models = env_config.MODEL_CASCADE[agent]
+
+  tiers = [
+    (model, structured_output(chat_model(env_config, model), agent, env_config)) for model in models
+  ]
+  return ModelCascade(agent, tiers)
+
+
+def descriptor_validator(descriptor: Type[BaseModel]) -> Validator:
+  """Accept {} ("nothing to build") or a dict matching the component descriptor schema."""
+
+  def validate(response):
+    if response == {}:
+      return response
+    parsed = descriptor.model_validate(response)
+
+    rows = getattr(parsed.props, "rows", None)
+    if rows is not None:
+      if not rows:
+        raise ValueError("Table has no rows.")
+      column_keys = {column.key for column in parsed.props.columns}
+      if not column_keys or not any(column_keys & row.keys() for row in rows):
+        raise ValueError("Table rows do not match its columns.")
+
+    return response
+
+  return validate
+
+
+def chart_validator(chart_config: Type[BaseModel]) -> Validator:
+  """Validate a chart option, rejecting text data points the schema would silently zero."""
+
+  def validate(response):
+    for item in response.get("series") or []:
+      points = (item or {}).get("data") or []
+      values = [point.get("value") if isinstance(point, dict) else point for point in points]
+      if any(isinstance(value, str) for value in values):
+        raise ValueError(f"Series '{item.get('name')}' has non-numeric data points.")
+    return chart_config.model_validate(response).model_dump()
+
+  return validate
@@ -1,10 +1,10 @@
-import json
 import logging
 import os
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import Depends, Request
-from langchain_core.messages import AIMessageChunk, HumanMessage
+from fastapi.concurrency import run_in_threadpool
+from langchain_core.messages import HumanMessage
 from langgraph.checkpoint.base import BaseCheckpointSaver, RunnableConfig
 from langgraph.graph import END, StateGraph
 from requests import Session
@@ -12,10 +12,12 @@ from requests import Session
 from app.agents.bar_chart_agent import BarChartAgent
 from app.agents.card_agent import CardAgent
 from app.agents.chat_agent import ChatAgent
+from app.agents.component_executor_agent import ComponentExecutorAgent
 from app.agents.component_supervisor_agent import ComponentSupervisorAgent
 from app.agents.line_chart_agent import LineChartAgent
 from app.agents.research_agent import ResearchAgent
 from app.agents.section_agent import SectionAgent
+from app.agents.sql_agent import SqlAgent
 from app.agents.summary_agent import SummaryAgent
 from app.agents.supervisor_agent import SupervisorAgent
 from app.agents.table_agent import TableAgent
@@ -23,8 +25,18 @@ from app.agents.ui_builder_agent import UiBuilderAgent
 from app.db.database import get_db
 from app.models.state_model import MultiAgentRequest, MultiAgentState
 from app.services.chat_session_service import ChatSessionService
+from app.services.data_source_service import DataSourceService, get_data_source_service
 from app.services.env_config_service import EnvConfigService, get_env_configs
 from app.services.file_service import FileService, get_file_service_db_session
+from app.services.replay_cache_service import (
+  ReplayCacheService,
+  get_replay_cache_service,
+  replay_cache_key,
+  replay_history,
+)
+from app.services.sql_query_service import SqlQueryService, get_sql_query_service
+from app.services.sse_translator_service import SseTranslator
+from app.services.trace_service import TraceRecorder
 
 logger = logging.getLogger(__name__)
 
@@ -48,23 +60,32 @@ class MultiAgentOrchestratorService:
     checkpointer: Annotated[BaseCheckpointSaver, Depends(get_checkpointer)],
     cs_service: Annotated[ChatSessionService, Depends(get_db_session)],
     file_service: Annotated[FileService, Depends(get_file_service_db_session)],
+    data_source: Annotated[DataSourceService, Depends(get_data_source_service)],
+    sql_query: Annotated[Optional[SqlQueryService], Depends(get_sql_query_service)],
+    replay_cache: Annotated[ReplayCacheService, Depends(get_replay_cache_service)],
   ):
     self.env_config = env_config
     self.checkpointer = checkpointer
     self.cs_service = cs_service
     self.file_service = file_service
+    self.data_source = data_source
+    self.replay_cache = replay_cache
 
-    self.supervisor_agent = SupervisorAgent(env_config=env_config)
     self.research_agent = ResearchAgent(env_config=env_config)
+    self.supervisor_agent = SupervisorAgent(
+      env_config=env_config, research_agent=self.research_agent
+    )
     self.summary_agent = SummaryAgent(env_config=env_config)
     self.chat_agent = ChatAgent(env_config=env_config)
-    self.line_chart_agent = LineChartAgent(env_config=env_config)
-    self.bar_chart_agent = BarChartAgent(env_config=env_config)
+    self.line_chart_agent = LineChartAgent(env_config=env_config, data_source=data_source)
+    self.bar_chart_agent = BarChartAgent(env_config=env_config, data_source=data_source)
     self.component_supervisor_agent = ComponentSupervisorAgent(env_config=env_config)
+    self.component_executor_agent = ComponentExecutorAgent(env_config=env_config)
     self.section_agent = SectionAgent(env_config=env_config)
-    self.card_agent = CardAgent(env_config=env_config)
-    self.table_agent = TableAgent(env_config=env_config)
+    self.card_agent = CardAgent(env_config=env_config, data_source=data_source)
+    self.table_agent = TableAgent(env_config=env_config, data_source=data_source)
     self.ui_builder_agent = UiBuilderAgent(env_config=env_config)
+    self.sql_agent = SqlAgent(env_config=env_config, sql_query=sql_query)
 
     self.graph = self._build_multi_agent_graph()
 
@@ -79,10 +100,12 @@ class MultiAgentOrchestratorService:
     graph.add_node("line_chart_agent", self.line_chart_agent.chart)
     graph.add_node("bar_chart_agent", self.bar_chart_agent.chart)
     graph.add_node("component_supervisor_agent", self.component_supervisor_agent.supervise)
+    graph.add_node("component_executor_agent", self.component_executor_agent.execute)
     graph.add_node("section_agent", self.section_agent.generate)
     graph.add_node("card_agent", self.card_agent.generate)
     graph.add_node("table_agent", self.table_agent.generate)
     graph.add_node("ui_builder_agent", self.ui_builder_agent.generate)
+    graph.add_node("sql_agent", self.sql_agent.query)
 
     available_agents = [
       "supervisor_agent",
@@ -92,10 +115,12 @@ class MultiAgentOrchestratorService:
       "line_chart_agent",
       "bar_chart_agent",
       "component_supervisor_agent",
+      "component_executor_agent",
       "section_agent",
       "card_agent",
       "table_agent",
       "ui_builder_agent",
+      "sql_agent",
     ]
 
     def route_to_agent(state: MultiAgentState):
@@ -103,6 +128,9 @@ class MultiAgentOrchestratorService:
 
       if current_agent == "END":
         return END
+      elif current_agent == "component_supervisor":
+        # Component workers report back to whichever node drives the dashboard plan
+        return state.get("component_dispatcher") or "component_supervisor"
       elif current_agent in [
         "supervisor",
         "researcher",
@@ -110,11 +138,12 @@ class MultiAgentOrchestratorService:
         "chat",
         "line_chart",
         "bar_chart",
-        "component_supervisor",
+        "component_executor",
         "section",
         "card",
         "table",
         "ui_builder",
+        "sql",
       ]:
         return current_agent
       else:
@@ -134,32 +163,65 @@ class MultiAgentOrchestratorService:
           "line_chart": "line_chart_agent",
           "bar_chart": "bar_chart_agent",
           "component_supervisor": "component_supervisor_agent",
+          "component_executor": "component_executor_agent",
           "section": "section_agent",
           "card": "card_agent",
           "table": "table_agent",
           "ui_builder": "ui_builder_agent",
+          "sql": "sql_agent",
           END: END,
         },
       )
 
     return graph.compile(checkpointer=self.checkpointer)
 
-  def serialise_ai_message_chunk(self, chunk):
-    if isinstance(chunk, AIMessageChunk):
-      return chunk.content
-    else:
-      logger.error(
-        f"Object of type {type(chunk).__name__} is not correctly formatted for serialisation"
-      )
-      raise TypeError(
-        f"Object of type {type(chunk).__name__} is not correctly formatted for serialisation"
-      )
-
   def draw_graph(self) -> None:
     os.makedirs("images", exist_ok=True)
     self.graph.get_graph().draw_mermaid_png(output_file_path="images/graph.png")
 
   async def generate(self, req: MultiAgentRequest):
+    replay_key = None
+    if self.replay_cache.enabled and not req.no_cache:
+      file_hashes = await self.file_service.get_file_hashes(int(req.session_id))
+      thread = await self.graph.aget_state(
+        RunnableConfig(configurable={"thread_id": req.session_id})
+      )
+      history = replay_history(thread.values.get("messages") or [], req.input)
+      replay_key = replay_cache_key(req.session_id, history, req.input, file_hashes)
+
+      recorded = await self.replay_cache.get(replay_key)
+      if recorded:
+        logger.info(f"Replaying recorded response for session {req.session_id}.")
+        async for frame in self.replay_cache.replay(recorded["frames"]):
+          yield frame
+        await self.cs_service.add_assistant_message(
+          session_id=req.session_id, **recorded["message"]
+        )
+        yield 'data: {"type": "end"}\n\n'
+        return
+
+    run = {}
+    frames = []
+    async for frame in self._run_graph(req, run):
+      frames.append(frame)
+      yield frame
+
+    # Text answers depend on the conversation, research on the web and dataset queries on live
+    # rows: only record the rest
+    message = run["message"]
+    if (
+      replay_key
+      and not run["used_research"]
+      and not run["used_dataset"]
+      and (message["component"] or message["option"])
+    ):
+      await self.replay_cache.set(replay_key, req.input, frames, message)
+
+    yield 'data: {"type": "end"}\n\n'
+
+  async def _run_graph(self, req: MultiAgentRequest, run: dict):
+    """Stream one graph run as SSE frames; `run` receives the persisted message and whether
+    web research (fresh or remembered) or a dataset query fed into it."""
     # self.draw_graph()
 
     config = RunnableConfig(configurable={"thread_id": req.session_id})
@@ -171,14 +233,18 @@ class MultiAgentOrchestratorService:
       content = None
 
     initial_state = {
+      "session_id": req.session_id,
       "research_data": "",
       "iteration_count": 0,
       "attachment_contents": content,
+      "dataset_result": {},
+      "used_dataset": False,
       "dashboard_plan": {},
       "section_component": {},
       "card_component": [],
       "table_component": [],
       "is_initial_planning": True,
+      "component_dispatcher": "component_supervisor",
       "ui_descriptor": {},
       "ui_descriptor_target": None,
       "section_ready": False,
@@ -189,265 +255,27 @@ class MultiAgentOrchestratorService:
 
     events = self.graph.astream_events(initial_state, version="v2", config=config)
 
-    # Component counters for unique IDs
-    component_counters = {"section": 0, "card": 0, "table": 0}
-
-    # Track components for database saving
-    collected_components = []
-
-    final_response: str | dict = ""
-    async for event in events:
-      event_type = event["event"]
-      event_name = event["name"]
-      event_metadata_node = event.get("metadata", {}).get("langgraph_node")
-
-      # Handle progress events when agents start
-      if event_type == "on_chain_start":
-        if event_name == "research_agent":
-          yield 'data: {"type": "progress", "content": "Researching information", "icon": "text_search"}\n\n'
-        elif event_name == "summary_agent":
-          yield 'data: {"type": "progress", "content": "Summarizing findings", "icon": "pencil"}\n\n'
-        elif event_name == "chat_agent":
-          yield 'data: {"type": "progress", "content": "Generating response", "icon": "pencil"}\n\n'
-        elif event_name == "supervisor_agent":
-          yield 'data: {"type": "progress", "content": "Planning next step", "icon": "brain"}\n\n'
-        elif event_name == "line_chart_agent":
-          yield 'data: {"type": "progress", "content": "Generating line chart", "icon": "line_chart"}\n\n'
-        elif event_name == "bar_chart_agent":
-          yield 'data: {"type": "progress", "content": "Generating bar chart", "icon": "bar_chart"}\n\n'
-        elif event_name == "section_agent":
-          yield 'data: {"type": "progress", "content": "Building Section UI component", "icon": "blocks"}\n\n'
-          component_counters["section"] += 1
-          unique_target = f"section_component_{component_counters['section']}"
-          ui_data = {
-            "type": "ui_event",
-            "target": unique_target,
-            "component": {
-              "id": unique_target,
-              "type": "section",
-              "props": {
-                "title": "",
-                "subtitle": "",
-                "loading": True,
-                "children": [],
-              },
-            },
-          }
-          payload = {"type": "content", "component": [ui_data]}
-          yield f"data: {json.dumps(payload)}\n\n"
-        elif event_name == "table_agent":
-          yield 'data: {"type": "progress", "content": "Building Table UI component", "icon": "blocks"}\n\n'
-          # Send skeleton loader for table with unique ID
-          component_counters["table"] += 1
-          unique_target = f"table_component_{component_counters['table']}"
-          ui_data = {
-            "type": "ui_event",
-            "target": unique_target,
-            "component": {
-              "id": unique_target,
-              "type": "table",
-              "props": {
-                "title": "",
-                "loading": True,
-                "columns": [],
-                "rows": [],
-              },
-            },
-          }
-          payload = {"type": "content", "component": [ui_data]}
-          yield f"data: {json.dumps(payload)}\n\n"
-        elif event_name == "card_agent":
-          yield 'data: {"type": "progress", "content": "Building Card UI component", "icon": "blocks"}\n\n'
-          # Send skeleton loader for card with unique ID
-          component_counters["card"] += 1
-          unique_target = f"card_component_{component_counters['card']}"
-          ui_data = {
-            "type": "ui_event",
-            "target": unique_target,
-            "component": {
-              "id": unique_target,
-              "type": "card",
-              "props": {
-                "title": "",
-                "value": "",
-                "loading": True,
-                "size": "md",
-                "bordered": True,
-                "shadow": True,
-                "rounded": True,
-                "children": [],
-              },
-            },
-          }
-          payload = {"type": "content", "component": [ui_data]}
-          yield f"data: {json.dumps(payload)}\n\n"
-
-      # Handle agent completion events
-      if event_type == "on_chain_end":
-        if event_name == "research_agent":
-          yield 'data: {"type": "progress", "content": "Research completed", "icon": "check"}\n\n'
-        elif event_name == "summary_agent":
-          yield 'data: {"type": "progress", "content": "Summary completed", "icon": "check"}\n\n'
-        elif event_name == "chat_agent":
-          yield 'data: {"type": "progress", "content": "Response completed", "icon": "check"}\n\n'
-        elif event_name == "component_supervisor_agent":
-          pass
-        elif event_name == "section_agent":
-          event_data = event.get("data", {})
-          output = event_data.get("output", {})
-
-          if output.get("section_ready") and output.get("messages"):
-            section_ui_event = json.loads(output["messages"][-1].content)
-            target_id = f"section_component_{component_counters['section']}"
-            section_ui_event["target"] = target_id
-            payload = {"type": "content", "component": [section_ui_event]}
-            yield f"data: {json.dumps(payload)}\n\n"
-
-            # Collect component for database saving
-            collected_components.append(section_ui_event)
-
-          yield 'data: {"type": "progress", "content": "Section UI component crafted", "icon": "check"}\n\n'
-        elif event_name == "table_agent":
-          event_data = event.get("data", {})
-          output = event_data.get("output", {})
-
-          # Handle progressive component delivery - replace skeleton loader
-          if output.get("table_ready") and output.get("messages"):
-            # Send the actual table descriptor with target matching current table counter
-            table_ui_event = json.loads(output["messages"][-1].content)
-            # Use the current table counter to determine target
-            target_id = f"table_component_{component_counters['table']}"
-            table_ui_event["target"] = target_id
-            payload = {"type": "content", "component": [table_ui_event]}
-            yield f"data: {json.dumps(payload)}\n\n"
-
-            # Collect component for database saving
-            collected_components.append(table_ui_event)
-
-          yield 'data: {"type": "progress", "content": "Table UI component crafted", "icon": "check"}\n\n'
-        elif event_name == "card_agent":
-          event_data = event.get("data", {})
-          output = event_data.get("output", {})
-
-          # Handle progressive component delivery - replace skeleton loader
-          if output.get("card_ready") and output.get("messages"):
-            # Send the actual card descriptor with target matching current card counter
-            card_ui_event = json.loads(output["messages"][-1].content)
-            # Use the current card counter to determine target
-            target_id = f"card_component_{component_counters['card']}"
-            card_ui_event["target"] = target_id
-            payload = {"type": "content", "component": [card_ui_event]}
-            yield f"data: {json.dumps(payload)}\n\n"
-
-            # Collect component for database saving
-            collected_components.append(card_ui_event)
-
-          yield 'data: {"type": "progress", "content": "Card UI component crafted", "icon": "check"}\n\n'
-        elif event_name == "ui_builder_agent":
-          # UI builder is no longer needed since components are sent progressively
-          # But we can still use it to mark completion of the component assembly process
-          event_data = event.get("data", {})
-          output = event_data.get("output", {})
-          if output and "messages" in output and output["messages"] and not collected_components:
-            # Fallback: if no progressive components were collected, use UI builder result
-            ui_data = json.loads(output["messages"][0].content)
-            collected_components.append(ui_data)
-          yield 'data: {"type": "progress", "content": "Component(s) crafted, dashboard assembled", "icon": "check"}\n\n'
-        # Line Chart final response
-        elif event_name == "line_chart_agent":
-          event_data = event.get("data", {})
-          output = event_data.get("output", {})
-          if output and "messages" in output and output["messages"]:
-            chart_data = json.loads(output["messages"][0].content)
-            final_response = chart_data
-            payload = {"type": "content", "option": chart_data}
-            yield f"data: {json.dumps(payload)}\n\n"
-          yield 'data: {"type": "progress", "content": "Line chart generation completed", "icon": "check"}\n\n'
-        # Bar Chart final response
-        elif event_name == "bar_chart_agent":
-          event_data = event.get("data", {})
-          output = event_data.get("output", {})
-          if output and "messages" in output and output["messages"]:
-            chart_data = json.loads(output["messages"][0].content)
-            final_response = chart_data
-            payload = {"type": "content", "option": chart_data}
-            yield f"data: {json.dumps(payload)}\n\n"
-          yield 'data: {"type": "progress", "content": "Bar chart generation completed", "icon": "check"}\n\n'
-
-      if event_type == "on_tool_start":
-        tool_name = event["name"]
-
-        if tool_name == "tavily_search_tool":
-          tool_input = event.get("data", {}).get("input", {})
-          search_query = tool_input.get("input", "") if isinstance(tool_input, dict) else ""
-          payload = {
-            "type": "progress",
-            "content": "Searching on the web",
-            "search_query": search_query,
-            "icon": "search",
-          }
-          yield f"data: {json.dumps(payload)}\n\n"
-
-      if event_type == "on_tool_end":
-        tool_name = event["name"]
-        if tool_name == "tavily_search_tool":
-          payload = {
-            "type": "progress",
-            "content": "Web search completed",
-            "icon": "check",
-          }
-          yield f"data: {json.dumps(payload)}\n\n"
-
-      # Handle streaming content
-      if event_type == "on_chat_model_stream":
-        if event_metadata_node == "supervisor_agent":
-          continue
-        elif event_metadata_node == "research_agent":
-          continue
-        elif event_metadata_node == "line_chart_agent":
-          continue
-        elif event_metadata_node == "bar_chart_agent":
-          continue
-        elif event_metadata_node == "component_supervisor_agent":
-          continue
-        elif event_metadata_node == "section_agent":
-          continue
-        elif event_metadata_node == "card_agent":
-          continue
-        elif event_metadata_node == "table_agent":
-          continue
-        elif event_metadata_node == "ui_builder_agent":
-          continue
-        else:
-          chunk_content = self.serialise_ai_message_chunk(event["data"]["chunk"])
-          final_response += chunk_content
-          payload = {"type": "content", "content": chunk_content}
-          yield f"data: {json.dumps(payload)}\n\n"
-
-    # Store agent response to db
-    if collected_components:
-      # progressive components
-      await self.cs_service.add_assistant_message(
-        session_id=req.session_id, component=collected_components, content=None, option=None
-      )
-    elif isinstance(final_response, str) and final_response.strip():
-      # text basde
-      await self.cs_service.add_assistant_message(
-        session_id=req.session_id, content=final_response, option=None, component=None
-      )
-    elif isinstance(final_response, list):
-      # If we have a list response (shouldn't happen with new flow)
-      await self.cs_service.add_assistant_message(
-        session_id=req.session_id, component=final_response, content=None, option=None
-      )
-    elif final_response and not isinstance(final_response, str):
-      # chart
-      await self.cs_service.add_assistant_message(
-        session_id=req.session_id, content=None, option=final_response, component=None
-      )
-    else:
-      await self.cs_service.add_assistant_message(
-        session_id=req.session_id, content="", option=None, component=None
-      )
+    recorder = None
+    if self.env_config.TRACE_RECORDING_DIR:
+      recorder = TraceRecorder(self.env_config.TRACE_RECORDING_DIR, req.session_id, req.input)
 
-    yield 'data: {"type": "end"}\n\n'
+    translator = SseTranslator()
+    try:
+      async for event in events:
+        if recorder:
+          recorder.record(event)
+        for frame in translator.translate(event):
+          yield frame
+    finally:
+      # Written even when the run fails, so broken runs can be replayed too
+      if recorder:
+        try:
+          await run_in_threadpool(recorder.write)
+        except Exception as e:
+          logger.warning(f"Couldn't write the trace of session {req.session_id}: {e}")
+
+    message = translator.message()
+    await self.cs_service.add_assistant_message(session_id=req.session_id, **message)
+    run["message"] = message
+    run["used_research"] = translator.used_research
+    run["used_dataset"] = translator.used_dataset
@@ -0,0 +1,130 @@
+import re
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+COMPONENT_TYPES = ["section", "card", "table"]
+UI_BUILDER = "ui_builder"
+
+_COMPONENT_ID_PATTERN = re.compile(
+  r"\b((?:section|card|table)_[a-z0-9_]+|[a-z0-9_]+_(?:section|card|table))\b"
+)
+_DATA_REF_PATTERN = re.compile(
+  r"\b(research_data|attachment_contents|attachment|dataset_result|dataset)\b(\[[^\]]*\])?"
+)
+_UI_BUILDER_PATTERN = re.compile(r"\b(assemble|ui builder|ui_builder)\b")
+
+
+@dataclass
+class PlanStep:
+  """One TODO entry of a dashboard plan, parsed once into the fields routing needs."""
+
+  key: str
+  description: str
+  type: Optional[str] = None
+  component_id: Optional[str] = None
+  data_ref: Optional[str] = None
+  fulfilled: bool = False
+
+  def to_dict(self) -> dict:
+    return asdict(self)
+
+
+def parse_step(key: str, description: str, fulfilled: bool = False) -> PlanStep:
+  lowered = description.lower()
+
+  component_id = None
+  id_match = _COMPONENT_ID_PATTERN.search(lowered)
+  if id_match:
+    component_id = id_match.group(1)
+
+  if _UI_BUILDER_PATTERN.search(lowered):
+    step_type = UI_BUILDER
+  elif component_id:
+    step_type = next(kind for kind in COMPONENT_TYPES if kind in component_id.split("_"))
+  else:
+    # Earliest component keyword wins: "section holding a card" is a section step
+    positions = {kind: lowered.find(kind) for kind in COMPONENT_TYPES if kind in lowered}
+    step_type = min(positions, key=positions.get) if positions else None
+
+  data_match = _DATA_REF_PATTERN.search(description)
+  return PlanStep(
+    key=key,
+    description=description,
+    type=step_type,
+    component_id=component_id,
+    data_ref=data_match.group(0) if data_match else None,
+    fulfilled=fulfilled,
+  )
+
+
+def parse_todo(todo: dict) -> List[PlanStep]:
+  steps = []
+  for key, step in (todo or {}).items():
+    if isinstance(step, dict):
+      steps.append(parse_step(key, str(step.get("description", "")), bool(step.get("fulfilled"))))
+  return steps
+
+
+def steps_from_state(dashboard_plan: dict) -> List[PlanStep]:
+  stored = dashboard_plan.get("steps")
+  if stored:
+    return [PlanStep(**step) for step in stored]
+  return parse_todo(dashboard_plan.get("todo", {}))
+
+
+def to_todo(steps: List[PlanStep]) -> dict:
+  return {
+    step.key: {"description": step.description, "fulfilled": step.fulfilled} for step in steps
+  }
+
+
+def mark_fulfilled(
+  steps: List[PlanStep], produced: Dict[str, List[dict]], dispatched: Dict[str, int]
+) -> List[PlanStep]:
+  """Recompute fulfilled flags from the components produced so far.
+
+  Steps naming a component id are matched to produced ids first. Every other run of a worker
+  agent (including runs that returned nothing) then consumes the earliest open step of its
+  type, so each dispatch makes progress even when the agent picks its own id. Produced
+  components and dispatch counts only grow, so a fulfilled step stays fulfilled.
+  """
+  for kind in COMPONENT_TYPES:
+    kind_steps = [step for step in steps if step.type == kind]
+    for step in kind_steps:
+      step.fulfilled = False
+
+    produced_ids = {
+      str(component.get("id", "")).lower()
+      for component in produced.get(kind, [])
+      if isinstance(component, dict)
+    }
+
+    matched = 0
+    for step in kind_steps:
+      if step.component_id and step.component_id in produced_ids:
+        step.fulfilled = True
+        matched += 1
+
+    unmatched_runs = max(dispatched.get(kind, 0) - matched, 0)
+    for step in kind_steps:
+      if unmatched_runs <= 0:
+        break
+      if not step.fulfilled:
+        step.fulfilled = True
+        unmatched_runs -= 1
+
+  return steps
+
+
+def next_agent(steps: List[PlanStep]) -> str:
+  for step in steps:
+    if step.type in COMPONENT_TYPES and not step.fulfilled:
+      return step.type
+  return UI_BUILDER
+
+
+def execution_order(steps: List[PlanStep]) -> List[str]:
+  """Step keys in dispatch order: sections first since they wrap the other components."""
+  sections = [step.key for step in steps if step.type == "section"]
+  others = [step.key for step in steps if step.type in ("card", "table")]
+  return sections + others
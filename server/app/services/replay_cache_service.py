@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.database import SessionLocal
+from app.models.response_replay_cache import ResponseReplayEntry
+from app.services.env_config_service import EnvConfigService, get_env_configs
+from app.services.metrics_service import metrics
+from app.services.research_cache_service import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever agents, prompts or the SSE frame format change: old recordings stop matching
+GRAPH_VERSION = "2"
+
+
+def replay_history(messages: List[Any], user_input: str) -> List[str]:
+  """Thread messages a request is keyed on: the conversation before the request's own turn.
+
+  A refresh of the latest request finds that turn (its message and the answers to it) already
+  in the thread; it is left out so the refresh reproduces the key the turn was recorded under.
+  """
+  human_turns = [index for index, message in enumerate(messages) if message.type == "human"]
+  if human_turns:
+    last_turn = human_turns[-1]
+    if normalize_query(str(messages[last_turn].content)) == normalize_query(user_input):
+      messages = messages[:last_turn]
+  return [str(message.content) for message in messages]
+
+
+def replay_cache_key(
+  session_id: str, history: List[str], user_input: str, file_hashes: List[str]
+) -> str:
+  """Recordings are scoped to one session and the conversation before the request (see
+  replay_history): follow-ups such as "now show it as a table" only replay in the thread they
+  were recorded in, and refreshing the latest request replays it."""
+  payload = json.dumps(
+    [
+      GRAPH_VERSION,
+      str(session_id),
+      history,
+      normalize_query(user_input),
+      sorted(file_hashes),
+    ],
+    default=str,
+  )
+  return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ReplayCacheService:
+  """Recorded SSE frame sequences of whole graph runs, replayed for identical requests.
+
+  Only runs whose output is fully determined by the thread, the input and the attachments are
+  recorded (dashboards and charts that used no web research and no dataset query); entries
+  expire after
+  REPLAY_CACHE_TTL_SECONDS. Postgres failures are logged and treated as misses.
+  """
+
+  def __init__(self, env_config: EnvConfigService):
+    self.ttl_seconds = env_config.REPLAY_CACHE_TTL_SECONDS
+    self.max_entries = env_config.REPLAY_CACHE_MAX_ENTRIES
+    self.pace_seconds = env_config.REPLAY_PACE_SECONDS
+
+  @property
+  def enabled(self) -> bool:
+    return self.ttl_seconds > 0 and self.max_entries > 0
+
+  async def get(self, key: str) -> Optional[dict]:
+    try:
+      entry = await run_in_threadpool(self._get, key)
+    except Exception as e:
+      logger.warning(f"Replay cache lookup failed: {e}")
+      metrics.increment("replay.errors")
+      return None
+
+    metrics.increment("replay.hits" if entry else "replay.misses")
+    return entry
+
+  async def set(self, key: str, user_input: str, frames: List[str], message: dict) -> None:
+    try:
+      await run_in_threadpool(self._set, key, user_input, frames, message)
+      metrics.increment("replay.stored")
+    except Exception as e:
+      logger.warning(f"Replay cache write failed: {e}")
+      metrics.increment("replay.errors")
+
+  async def invalidate(self) -> int:
+    return await run_in_threadpool(self._invalidate)
+
+  async def replay(self, frames: List[str]) -> AsyncIterator[str]:
+    """Yield recorded frames, pausing before progress frames when pacing is enabled."""
+    for frame in frames:
+      if self.pace_seconds > 0 and '"type": "progress"' in frame:
+        await asyncio.sleep(self.pace_seconds)
+      yield frame
+
+  def _get(self, key: str) -> Optional[dict]:
+    with SessionLocal() as db:
+      entry = db.scalar(
+        select(ResponseReplayEntry).where(
+          ResponseReplayEntry.cache_key == key,
+          ResponseReplayEntry.expires_at > datetime.now(timezone.utc),
+        )
+      )
+      return {"frames": entry.frames, "message": entry.message} if entry else None
+
+  def _set(self, key: str, user_input: str, frames: List[str], message: dict) -> None:
+    now = datetime.now(timezone.utc)
+    values = {
+      "cache_key": key,
+      "input": user_input,
+      "frames": frames,
+      "message": message,
+      "created_at": now,
+      "expires_at": now + timedelta(seconds=self.ttl_seconds),
+    }
+
+    with SessionLocal() as db:
+      db.execute(
+        insert(ResponseReplayEntry)
+        .values(**values)
+        .on_conflict_do_update(
+          index_elements=[ResponseReplayEntry.cache_key],
+          set_={name: values[name] for name in ("frames", "message", "created_at", "expires_at")},
+        )
+      )
+      db.execute(delete(ResponseReplayEntry).where(ResponseReplayEntry.expires_at <= now))
+
+      overflow = (
+        select(ResponseReplayEntry.cache_key)
+        .order_by(ResponseReplayEntry.created_at.desc())
+        .offset(self.max_entries)
+      )
+      db.execute(
+        delete(ResponseReplayEntry).where(
+          ResponseReplayEntry.cache_key.in_(overflow.scalar_subquery())
+        )
+      )
+      db.commit()
+
+  def _invalidate(self) -> int:
+    with SessionLocal() as db:
+      deleted = db.execute(delete(ResponseReplayEntry)).rowcount
+      db.commit()
+      return deleted
+
+
+def get_replay_cache_service() -> ReplayCacheService:
+  return ReplayCacheService(get_env_configs())
@@ -0,0 +1,126 @@
+import hashlib
+import logging
+import re
+import unicodedata
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.db.database import SessionLocal
+from app.models.research_cache import ResearchCacheEntry
+from app.services.env_config_service import EnvConfigService, get_env_configs
+from app.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+SEARCH = "search"
+RESEARCH = "research"
+
+
+def normalize_query(query: str) -> str:
+  """Case, punctuation and whitespace-insensitive form of a query, used as the cache key."""
+  normalized = unicodedata.normalize("NFKC", query).lower()
+  normalized = re.sub(r"[^\w\s]", " ", normalized)
+  return re.sub(r"\s+", " ", normalized).strip()
+
+
+def cache_key(kind: str, query: str, scope: Optional[str] = None) -> str:
+  return hashlib.sha256(f"{kind}\x00{scope or ''}\x00{normalize_query(query)}".encode()).hexdigest()
+
+
+class ResearchCacheService:
+  """Web search and research results stored in Postgres so every worker shares them.
+
+  Entries expire after RESEARCH_CACHE_TTL_SECONDS; each write also drops expired entries and
+  the oldest ones beyond RESEARCH_CACHE_MAX_ENTRIES. A failing cache is logged and treated as
+  a miss, it never fails the research itself.
+  """
+
+  def __init__(self, env_config: EnvConfigService):
+    self.ttl_seconds = env_config.RESEARCH_CACHE_TTL_SECONDS
+    self.max_entries = env_config.RESEARCH_CACHE_MAX_ENTRIES
+
+  @property
+  def enabled(self) -> bool:
+    return self.ttl_seconds > 0 and self.max_entries > 0
+
+  async def get(self, kind: str, query: str, scope: Optional[str] = None) -> Optional[str]:
+    if not self.enabled:
+      return None
+
+    try:
+      payload = await run_in_threadpool(self._get, cache_key(kind, query, scope))
+    except Exception as e:
+      logger.warning(f"Research cache lookup failed: {e}")
+      metrics.increment("research.cache.errors")
+      return None
+
+    metrics.increment(f"research.cache.{kind}.{'hits' if payload is not None else 'misses'}")
+    return payload
+
+  async def set(self, kind: str, query: str, payload: str, scope: Optional[str] = None) -> None:
+    if not self.enabled:
+      return
+
+    try:
+      await run_in_threadpool(self._set, kind, query, payload, scope)
+    except Exception as e:
+      logger.warning(f"Research cache write failed: {e}")
+      metrics.increment("research.cache.errors")
+
+  def _get(self, key: str) -> Optional[str]:
+    with SessionLocal() as db:
+      return db.scalar(
+        select(ResearchCacheEntry.payload).where(
+          ResearchCacheEntry.cache_key == key,
+          ResearchCacheEntry.expires_at > datetime.now(timezone.utc),
+        )
+      )
+
+  def _set(self, kind: str, query: str, payload: str, scope: Optional[str]) -> None:
+    now = datetime.now(timezone.utc)
+    values = {
+      "cache_key": cache_key(kind, query, scope),
+      "kind": kind,
+      "query": normalize_query(query),
+      "payload": payload,
+      "created_at": now,
+      "expires_at": now + timedelta(seconds=self.ttl_seconds),
+    }
+
+    with SessionLocal() as db:
+      # Concurrent workers may research the same query: last write wins
+      db.execute(
+        insert(ResearchCacheEntry)
+        .values(**values)
+        .on_conflict_do_update(
+          index_elements=[ResearchCacheEntry.cache_key],
+          set_={name: values[name] for name in ("payload", "created_at", "expires_at")},
+        )
+      )
+      db.execute(delete(ResearchCacheEntry).where(ResearchCacheEntry.expires_at <= now))
+
+      overflow = (
+        select(ResearchCacheEntry.cache_key)
+        .order_by(ResearchCacheEntry.created_at.desc())
+        .offset(self.max_entries)
+      )
+      db.execute(
+        delete(ResearchCacheEntry).where(
+          ResearchCacheEntry.cache_key.in_(overflow.scalar_subquery())
+        )
+      )
+      db.commit()
+
+
+_research_cache: Optional[ResearchCacheService] = None
+
+
+def get_research_cache() -> ResearchCacheService:
+  global _research_cache
+  if _research_cache is None:
+    _research_cache = ResearchCacheService(get_env_configs())
+  return _research_cache
@@ -0,0 +1,81 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Set
+
+# Words that say what to do with the findings rather than what they are about
+_NON_TOPIC_WORDS = set(
+  """
+  about also and any are bar but can card cards chart charts compare could create dashboard data
+  does draw for from generate give graph have how instead into it its just line list make more
+  now please plot put research search section show some summarize summary table tables than that
+  the them then these this those turn using visualize want was were what when where which who why
+  will with would you your
+  """.split()
+)
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Share of the request's topic words an earlier research topic has to cover to be reused
+ON_TOPIC_OVERLAP = 0.5
+
+
+def topic_keywords(text: str) -> Set[str]:
+  return {
+    word
+    for word in _WORD.findall(text.lower())
+    if (len(word) > 2 or word.isdigit()) and word not in _NON_TOPIC_WORDS
+  }
+
+
+def topic_key(text: str) -> str:
+  return "-".join(sorted(topic_keywords(text))) or "general"
+
+
+def remember(
+  memory: Optional[dict], request: str, findings: str, max_topics: int, now: datetime | None = None
+) -> dict:
+  """Return the session's research memory with `findings` stored under the request's topic.
+
+  Entries are keyed by topic and carry their keywords and an ISO timestamp; only the
+  `max_topics` most recently updated topics are kept.
+  """
+  now = now or datetime.now(timezone.utc)
+  updated = dict(memory or {})
+  updated[topic_key(request)] = {
+    "request": request,
+    "keywords": sorted(topic_keywords(request)),
+    "findings": findings,
+    "updated_at": now.isoformat(),
+  }
+
+  newest = sorted(updated.items(), key=lambda item: item[1]["updated_at"], reverse=True)
+  return dict(newest[:max_topics])
+
+
+def recall(
+  memory: Optional[dict], request: str, ttl_seconds: int, now: datetime | None = None
+) -> Optional[dict]:
+  """Earlier research the request is a follow-up on, or None when it needs fresh research.
+
+  A request without topic words of its own ("now chart it") continues the latest topic;
+  otherwise the freshest topic covering enough of the request's topic words wins.
+  """
+  now = now or datetime.now(timezone.utc)
+  cutoff = now - timedelta(seconds=ttl_seconds)
+  entries = [
+    entry
+    for entry in (memory or {}).values()
+    if datetime.fromisoformat(entry["updated_at"]) >= cutoff
+  ]
+  if not entries:
+    return None
+  entries.sort(key=lambda entry: entry["updated_at"], reverse=True)
+
+  keywords = topic_keywords(request)
+  if not keywords:
+    return entries[0]
+
+  for entry in entries:
+    overlap = len(keywords & set(entry["keywords"])) / len(keywords)
+    if overlap >= ON_TOPIC_OVERLAP:
+      return entry
+  return None
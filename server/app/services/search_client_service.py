@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import random
+import re
+from typing import List, Optional
+
+import httpx
+
+from app.services.env_config_service import EnvConfigService, get_env_configs
+from app.services.metrics_service import metrics
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class SearchError(Exception):
+  pass
+
+
+class TavilySearchClient:
+  """Async Tavily search over one pooled HTTP client shared by every request.
+
+  Keeps TLS connections alive between searches, bounds concurrent searches with a semaphore,
+  applies a per-call timeout and retries transient failures (429/5xx/transport errors) with
+  exponential backoff plus jitter. Never blocks the event loop.
+  """
+
+  def __init__(
+    self, env_config: EnvConfigService, transport: Optional[httpx.AsyncBaseTransport] = None
+  ):
+    self.env_config = env_config
+    self.client = httpx.AsyncClient(
+      base_url=env_config.TAVILY_BASE_URL,
+      headers={"Authorization": f"Bearer {env_config.TAVILY_API_KEY.get_secret_value()}"},
+      timeout=httpx.Timeout(env_config.SEARCH_TIMEOUT_SECONDS),
+      limits=httpx.Limits(
+        max_connections=env_config.SEARCH_MAX_CONCURRENCY,
+        max_keepalive_connections=env_config.SEARCH_MAX_CONCURRENCY,
+      ),
+      transport=transport,
+    )
+    self.semaphore = asyncio.Semaphore(env_config.SEARCH_MAX_CONCURRENCY)
+    self.max_retries = env_config.SEARCH_MAX_RETRIES
+
+  async def search(self, query: str, max_results: int = 1) -> List[dict]:
+    payload = {"query": query, "max_results": max_results}
+
+    async with self.semaphore:
+      for attempt in range(self.max_retries + 1):
+        try:
+          response = await self.client.post("/search", json=payload)
+          if response.status_code not in RETRY_STATUS_CODES:
+            response.raise_for_status()
+            metrics.increment("search.requests")
+            return response.json().get("results", [])
+          error: Exception = SearchError(f"Tavily responded with {response.status_code}")
+        except (httpx.TransportError, httpx.TimeoutException) as e:
+          error = e
+        except httpx.HTTPStatusError as e:
+          metrics.increment("search.errors")
+          raise SearchError(f"Tavily search failed: {e}") from e
+
+        if attempt == self.max_retries:
+          break
+
+        metrics.increment("search.retries")
+        # Full jitter keeps concurrent retries from hammering the API in lockstep
+        delay = random.uniform(0, 0.25 * 2**attempt)
+        logger.warning(f"Search attempt {attempt + 1} failed ({error}), retrying in {delay:.2f}s.")
+        await asyncio.sleep(delay)
+
+    metrics.increment("search.errors")
+    raise SearchError(f"Tavily search failed after {self.max_retries + 1} attempts: {error}")
+
+  async def aclose(self) -> None:
+    await self.client.aclose()
+
+
+def compact_results(batches: List[List[dict]], max_chars: int) -> List[List[dict]]:
+  """Drop results repeated across searches (same URL or same opening text) and trim content.
+
+  Batches keep their order so each tool call still gets its own (possibly empty) result list;
+  a duplicate is kept only in the first batch that returned it.
+  """
+  seen_urls, seen_texts = set(), set()
+  compacted = []
+
+  for batch in batches:
+    kept = []
+    for result in sorted(batch, key=lambda item: item.get("score") or 0, reverse=True):
+      url = (result.get("url") or "").rstrip("/").lower()
+      content = re.sub(r"\s+", " ", result.get("content") or "").strip()
+      fingerprint = content[:200].lower()
+      if (url and url in seen_urls) or (fingerprint and fingerprint in seen_texts):
+        continue
+      seen_urls.add(url)
+      seen_texts.add(fingerprint)
+
+      if len(content) > max_chars:
+        content = content[:max_chars].rsplit(" ", 1)[0] + " …"
+      kept.append(
+        {"title": result.get("title", ""), "url": result.get("url", ""), "content": content}
+      )
+    compacted.append(kept)
+
+  return compacted
+
+
+_search_client: Optional[TavilySearchClient] = None
+
+
+def get_search_client() -> TavilySearchClient:
+  global _search_client
+  if _search_client is None:
+    _search_client = TavilySearchClient(get_env_configs())
+  return _search_client
+
+
+async def close_search_client() -> None:
+  global _search_client
+  if _search_client is not None:
+    await _search_client.aclose()
+    _search_client = None
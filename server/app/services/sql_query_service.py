@@ -0,0 +1,172 @@
+import json
+import logging
+import re
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import sqlglot
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlglot import exp
+
+from app.db.database import get_readonly_db
+from app.services.env_config_service import get_env_configs
+
+logger = logging.getLogger(__name__)
+
+# Tables (and their columns) generated SQL may reference
+ALLOWED_TABLES: Dict[str, Dict[str, str]] = {
+  "dataset": {
+    "product_name": "text",
+    "year": "text, e.g. '2024' (prefer period for filtering)",
+    "month": "text month name, e.g. 'January'",
+    "period": "date, first day of the month",
+    "revenue": "integer",
+    "expenses": "integer",
+    "current_employees": "integer",
+  }
+}
+
+_FORBIDDEN_KEYWORDS = re.compile(
+  r"\b(insert|update|delete|merge|upsert|drop|alter|create|truncate|grant|revoke|copy|vacuum|"
+  r"reindex|cluster|comment|call|do|execute|prepare|deallocate|listen|notify|lock|set|reset|"
+  r"into|returning)\b",
+  re.I,
+)
+_FORBIDDEN_PREFIXES = re.compile(
+  r"\b(pg_\w*|information_schema|current_setting|set_config)\b", re.I
+)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+
+
+class UnsafeQueryError(ValueError):
+  pass
+
+
+class SqlQueryService:
+  """Validates and runs single read-only SELECT statements against whitelisted tables.
+
+  Queries run on the read-only pool (read-only transactions with a statement timeout) and are
+  wrapped in an outer LIMIT so at most `row_cap` rows ever leave the database.
+  """
+
+  def __init__(self, db: Session, row_cap: int):
+    self.session = db
+    self.row_cap = row_cap
+
+  def describe_schema(self) -> str:
+    lines = []
+    for table, columns in ALLOWED_TABLES.items():
+      column_lines = ", ".join(f"{column} ({kind})" for column, kind in columns.items())
+      lines.append(f"{table}: {column_lines}")
+    return "\n".join(lines)
+
+  def validate(self, sql: str) -> str:
+    statement = sql.strip().rstrip(";").strip()
+    if not statement:
+      raise UnsafeQueryError("Empty query.")
+
+    # Inspect the query with string literals blanked so values cannot trip (or hide) keywords
+    code = _STRING_LITERAL.sub("''", statement)
+
+    if ";" in code:
+      raise UnsafeQueryError("Only a single statement is allowed.")
+    if "--" in code or "/*" in code:
+      raise UnsafeQueryError("Comments are not allowed.")
+    if not re.match(r"^\s*(select|with)\b", code, re.I):
+      raise UnsafeQueryError("Only SELECT queries are allowed.")
+
+    forbidden = _FORBIDDEN_KEYWORDS.search(code) or _FORBIDDEN_PREFIXES.search(code)
+    if forbidden:
+      raise UnsafeQueryError(f"'{forbidden.group(0)}' is not allowed.")
+
+    try:
+      tree = sqlglot.parse_one(statement, read="postgres")
+    except sqlglot.errors.ParseError as e:
+      raise UnsafeQueryError(f"Query could not be parsed: {e}")
+    if not isinstance(tree, exp.Query):
+      raise UnsafeQueryError("Only SELECT queries are allowed.")
+
+    # Every table reference counts: comma joins, JOINs, subqueries, LATERAL, set operations
+    cte_names = {cte.alias_or_name.lower() for cte in tree.find_all(exp.CTE)}
+    for table in tree.find_all(exp.Table):
+      if not isinstance(table.this, exp.Identifier):
+        raise UnsafeQueryError(f"Table function '{table.sql('postgres')}' is not allowed.")
+      if table.db or table.catalog:
+        raise UnsafeQueryError(f"Schema-qualified table '{table.sql('postgres')}' is not allowed.")
+
+      # Postgres folds unquoted names to lower case, quoted names must match exactly
+      name = table.name if table.this.quoted else table.name.lower()
+      if name not in ALLOWED_TABLES and name not in cte_names:
+        raise UnsafeQueryError(f"Table '{table.name}' is not allowed.")
+
+    return statement
+
+  async def run(self, sql: str) -> dict:
+    statement = self.validate(sql)
+    columns, rows = await run_in_threadpool(self._execute, statement)
+
+    truncated = len(rows) > self.row_cap
+    rows = rows[: self.row_cap]
+    logger.info(f"Dataset query returned {len(rows)} row(s){' (truncated)' if truncated else ''}.")
+
+    return {
+      "sql": statement,
+      "columns": columns,
+      "rows": rows,
+      "row_count": len(rows),
+      "truncated": truncated,
+    }
+
+  def _execute(self, statement: str):
+    try:
+      result = self.session.execute(
+        text(f"SELECT * FROM ({statement}) AS agent_query LIMIT :row_limit"),
+        {"row_limit": self.row_cap + 1},
+      )
+      columns = list(result.keys())
+      rows = [[self._to_json(value) for value in row] for row in result]
+    finally:
+      # Nothing to persist: end the read-only transaction and return the connection
+      self.session.rollback()
+    return columns, rows
+
+  def _to_json(self, value):
+    if isinstance(value, Decimal):
+      return int(value) if value == value.to_integral_value() else round(float(value), 2)
+    if isinstance(value, float):
+      return round(value, 2)
+    if isinstance(value, (date, datetime)):
+      return value.isoformat()
+    return value
+
+
+def compact_result(result: dict) -> str:
+  """Prompt-friendly rendering of a query result: header line plus one JSON array per row."""
+  if not result:
+    return ""
+  if result.get("error"):
+    return result["error"]
+
+  lines = [f"SQL: {result['sql']}", f"columns: {json.dumps(result['columns'])}"]
+  lines.extend(json.dumps(row) for row in result["rows"])
+  if result.get("truncated"):
+    lines.append(f"(truncated to {result['row_count']} rows)")
+  return "\n".join(lines)
+
+
+def rows_as_records(result: dict) -> List[dict]:
+  columns = result.get("columns") or []
+  return [dict(zip(columns, row)) for row in result.get("rows") or []]
+
+
+def get_sql_query_service(
+  db: Optional[Session] = Depends(get_readonly_db),
+) -> Optional[SqlQueryService]:
+  """None when no dedicated read-only role is configured, which disables the SQL agent."""
+  if db is None:
+    return None
+  return SqlQueryService(db, row_cap=get_env_configs().SQL_ROW_CAP)
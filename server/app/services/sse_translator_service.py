@@ -0,0 +1,326 @@
+import json
+import logging
+from typing import Iterator
+
+from langchain_core.messages import AIMessageChunk
+
+from app.services.chart_stream_service import ChartStreamer
+
+logger = logging.getLogger(__name__)
+
+
+class SseTranslator:
+  """Turns the astream_events of one graph run into the SSE frames the client renders.
+
+  One instance per run: it numbers skeleton components, collects finished components for
+  persistence and accumulates the final text or chart response. Works the same on live events
+  and on recorded traces (see trace_service).
+  """
+
+  def __init__(self):
+    # Component counters for unique IDs
+    self.component_counters = {"section": 0, "card": 0, "table": 0}
+
+    # Track components for database saving
+    self.collected_components = []
+
+    self.final_response: str | dict = ""
+    # Full-resolution chart when the sent one was downsampled
+    self.full_option: dict | None = None
+    # Whether web research (fresh or remembered) fed into the run
+    self.used_research = False
+    # Whether dataset rows fed into the run, through the SQL agent or an engine reading the
+    # dataset table (the rows can change between runs)
+    self.used_dataset = False
+
+    # Progressive chart frames of the chart model call currently streaming
+    self.chart_stream: ChartStreamer | None = None
+
+  def serialise_ai_message_chunk(self, chunk):
+    if isinstance(chunk, AIMessageChunk):
+      return chunk.content
+    else:
+      logger.error(
+        f"Object of type {type(chunk).__name__} is not correctly formatted for serialisation"
+      )
+      raise TypeError(
+        f"Object of type {type(chunk).__name__} is not correctly formatted for serialisation"
+      )
+
+  def translate(self, event: dict) -> Iterator[str]:
+    event_type = event["event"]
+    event_name = event["name"]
+    event_metadata_node = event.get("metadata", {}).get("langgraph_node")
+
+    # Handle progress events when agents start
+    if event_type == "on_chain_start":
+      if event_name == "research_agent":
+        self.used_research = True
+        yield 'data: {"type": "progress", "content": "Researching information", "icon": "text_search"}\n\n'
+      elif event_name == "summary_agent":
+        yield 'data: {"type": "progress", "content": "Summarizing findings", "icon": "pencil"}\n\n'
+      elif event_name == "chat_agent":
+        yield 'data: {"type": "progress", "content": "Generating response", "icon": "pencil"}\n\n'
+      elif event_name == "supervisor_agent":
+        yield 'data: {"type": "progress", "content": "Planning next step", "icon": "brain"}\n\n'
+      elif event_name == "line_chart_agent":
+        yield 'data: {"type": "progress", "content": "Generating line chart", "icon": "line_chart"}\n\n'
+      elif event_name == "bar_chart_agent":
+        yield 'data: {"type": "progress", "content": "Generating bar chart", "icon": "bar_chart"}\n\n'
+      elif event_name == "sql_agent":
+        self.used_dataset = True
+      elif event_name == "section_agent":
+        yield 'data: {"type": "progress", "content": "Building Section UI component", "icon": "blocks"}\n\n'
+        self.component_counters["section"] += 1
+        unique_target = f"section_component_{self.component_counters['section']}"
+        ui_data = {
+          "type": "ui_event",
+          "target": unique_target,
+          "component": {
+            "id": unique_target,
+            "type": "section",
+            "props": {
+              "title": "",
+              "subtitle": "",
+              "loading": True,
+              "children": [],
+            },
+          },
+        }
+        payload = {"type": "content", "component": [ui_data]}
+        yield f"data: {json.dumps(payload)}\n\n"
+      elif event_name == "table_agent":
+        yield 'data: {"type": "progress", "content": "Building Table UI component", "icon": "blocks"}\n\n'
+        # Send skeleton loader for table with unique ID
+        self.component_counters["table"] += 1
+        unique_target = f"table_component_{self.component_counters['table']}"
+        ui_data = {
+          "type": "ui_event",
+          "target": unique_target,
+          "component": {
+            "id": unique_target,
+            "type": "table",
+            "props": {
+              "title": "",
+              "loading": True,
+              "columns": [],
+              "rows": [],
+            },
+          },
+        }
+        payload = {"type": "content", "component": [ui_data]}
+        yield f"data: {json.dumps(payload)}\n\n"
+      elif event_name == "card_agent":
+        yield 'data: {"type": "progress", "content": "Building Card UI component", "icon": "blocks"}\n\n'
+        # Send skeleton loader for card with unique ID
+        self.component_counters["card"] += 1
+        unique_target = f"card_component_{self.component_counters['card']}"
+        ui_data = {
+          "type": "ui_event",
+          "target": unique_target,
+          "component": {
+            "id": unique_target,
+            "type": "card",
+            "props": {
+              "title": "",
+              "value": "",
+              "loading": True,
+              "size": "md",
+              "bordered": True,
+              "shadow": True,
+              "rounded": True,
+              "children": [],
+            },
+          },
+        }
+        payload = {"type": "content", "component": [ui_data]}
+        yield f"data: {json.dumps(payload)}\n\n"
+
+    # Handle agent completion events
+    if event_type == "on_chain_end":
+      output = event.get("data", {}).get("output")
+      if isinstance(output, dict) and output.get("used_dataset"):
+        # Charts, cards and tables computed straight from the live dataset table
+        self.used_dataset = True
+
+      if event_name == "research_agent":
+        yield 'data: {"type": "progress", "content": "Research completed", "icon": "check"}\n\n'
+      elif event_name == "summary_agent":
+        yield 'data: {"type": "progress", "content": "Summary completed", "icon": "check"}\n\n'
+      elif event_name == "chat_agent":
+        yield 'data: {"type": "progress", "content": "Response completed", "icon": "check"}\n\n'
+      elif event_name == "component_supervisor_agent":
+        pass
+      elif event_name == "supervisor_agent":
+        # The supervisor hands over research remembered from an earlier turn
+        output = event.get("data", {}).get("output") or {}
+        if output.get("research_data"):
+          self.used_research = True
+        if output.get("dataset_result"):
+          self.used_dataset = True
+      elif event_name == "section_agent":
+        event_data = event.get("data", {})
+        output = event_data.get("output", {})
+
+        if output.get("section_ready") and output.get("messages"):
+          section_ui_event = json.loads(output["messages"][-1].content)
+          target_id = f"section_component_{self.component_counters['section']}"
+          section_ui_event["target"] = target_id
+          payload = {"type": "content", "component": [section_ui_event]}
+          yield f"data: {json.dumps(payload)}\n\n"
+
+          # Collect component for database saving
+          self.collected_components.append(section_ui_event)
+
+        yield 'data: {"type": "progress", "content": "Section UI component crafted", "icon": "check"}\n\n'
+      elif event_name == "table_agent":
+        event_data = event.get("data", {})
+        output = event_data.get("output", {})
+
+        # Handle progressive component delivery - replace skeleton loader
+        if output.get("table_ready") and output.get("messages"):
+          # Send the actual table descriptor with target matching current table counter
+          table_ui_event = json.loads(output["messages"][-1].content)
+          # Use the current table counter to determine target
+          target_id = f"table_component_{self.component_counters['table']}"
+          table_ui_event["target"] = target_id
+          payload = {"type": "content", "component": [table_ui_event]}
+          yield f"data: {json.dumps(payload)}\n\n"
+
+          # Collect component for database saving
+          self.collected_components.append(table_ui_event)
+
+        yield 'data: {"type": "progress", "content": "Table UI component crafted", "icon": "check"}\n\n'
+      elif event_name == "card_agent":
+        event_data = event.get("data", {})
+        output = event_data.get("output", {})
+
+        # Handle progressive component delivery - replace skeleton loader
+        if output.get("card_ready") and output.get("messages"):
+          # Send the actual card descriptor with target matching current card counter
+          card_ui_event = json.loads(output["messages"][-1].content)
+          # Use the current card counter to determine target
+          target_id = f"card_component_{self.component_counters['card']}"
+          card_ui_event["target"] = target_id
+          payload = {"type": "content", "component": [card_ui_event]}
+          yield f"data: {json.dumps(payload)}\n\n"
+
+          # Collect component for database saving
+          self.collected_components.append(card_ui_event)
+
+        yield 'data: {"type": "progress", "content": "Card UI component crafted", "icon": "check"}\n\n'
+      elif event_name == "ui_builder_agent":
+        # UI builder is no longer needed since components are sent progressively
+        # But we can still use it to mark completion of the component assembly process
+        event_data = event.get("data", {})
+        output = event_data.get("output", {})
+        if output and "messages" in output and output["messages"] and not self.collected_components:
+          # Fallback: if no progressive components were collected, use UI builder result
+          ui_data = json.loads(output["messages"][0].content)
+          self.collected_components.append(ui_data)
+        yield 'data: {"type": "progress", "content": "Component(s) crafted, dashboard assembled", "icon": "check"}\n\n'
+      # Line Chart final response
+      elif event_name == "line_chart_agent":
+        event_data = event.get("data", {})
+        output = event_data.get("output", {})
+        if output and "messages" in output and output["messages"]:
+          self.final_response = json.loads(output["messages"][0].content)
+          self.full_option = output.get("full_chart_option")
+          yield self._option_frame(output["messages"][0].content)
+        yield 'data: {"type": "progress", "content": "Line chart generation completed", "icon": "check"}\n\n'
+      # Bar Chart final response
+      elif event_name == "bar_chart_agent":
+        event_data = event.get("data", {})
+        output = event_data.get("output", {})
+        if output and "messages" in output and output["messages"]:
+          self.final_response = json.loads(output["messages"][0].content)
+          yield self._option_frame(output["messages"][0].content)
+        yield 'data: {"type": "progress", "content": "Bar chart generation completed", "icon": "check"}\n\n'
+
+    if event_type == "on_tool_start":
+      tool_name = event["name"]
+
+      if tool_name == "tavily_search_tool":
+        tool_input = event.get("data", {}).get("input", {})
+        search_query = tool_input.get("input", "") if isinstance(tool_input, dict) else ""
+        payload = {
+          "type": "progress",
+          "content": "Searching on the web",
+          "search_query": search_query,
+          "icon": "search",
+        }
+        yield f"data: {json.dumps(payload)}\n\n"
+
+    if event_type == "on_tool_end":
+      tool_name = event["name"]
+      if tool_name == "tavily_search_tool":
+        payload = {
+          "type": "progress",
+          "content": "Web search completed",
+          "icon": "check",
+        }
+        yield f"data: {json.dumps(payload)}\n\n"
+
+    # Handle streaming content
+    if event_type == "on_chat_model_stream":
+      if event_metadata_node == "supervisor_agent":
+        return
+      elif event_metadata_node == "research_agent":
+        return
+      elif event_metadata_node in ("line_chart_agent", "bar_chart_agent"):
+        yield from self._stream_chart(event)
+      elif event_metadata_node == "component_supervisor_agent":
+        return
+      elif event_metadata_node == "section_agent":
+        return
+      elif event_metadata_node == "card_agent":
+        return
+      elif event_metadata_node == "table_agent":
+        return
+      elif event_metadata_node == "ui_builder_agent":
+        return
+      elif event_metadata_node == "sql_agent":
+        return
+      else:
+        chunk_content = self.serialise_ai_message_chunk(event["data"]["chunk"])
+        self.final_response += chunk_content
+        payload = {"type": "content", "content": chunk_content}
+        yield f"data: {json.dumps(payload)}\n\n"
+
+  def _option_frame(self, option_json: str) -> str:
+    # The agent's message already holds the option as JSON, re-encoding it would only cost time
+    return f'data: {{"type": "content", "option": {option_json}}}\n\n'
+
+  def _stream_chart(self, event: dict) -> Iterator[str]:
+    # A repair or escalation call starts over with a fresh skeleton, replacing the old chart
+    run_id = event.get("run_id")
+    if self.chart_stream is None or self.chart_stream.run_id != run_id:
+      self.chart_stream = ChartStreamer(run_id)
+
+    chunk_content = self.serialise_ai_message_chunk(event["data"]["chunk"])
+    if not isinstance(chunk_content, str):
+      return
+    for payload in self.chart_stream.feed(chunk_content):
+      yield f"data: {json.dumps(payload)}\n\n"
+
+  def message(self) -> dict:
+    """Assistant message to persist for the run."""
+    if self.collected_components:
+      # progressive components
+      return {"component": self.collected_components, "content": None, "option": None}
+    elif isinstance(self.final_response, str) and self.final_response.strip():
+      # text basde
+      return {"content": self.final_response, "option": None, "component": None}
+    elif isinstance(self.final_response, list):
+      # If we have a list response (shouldn't happen with new flow)
+      return {"component": self.final_response, "content": None, "option": None}
+    elif self.final_response and not isinstance(self.final_response, str):
+      # chart
+      return {
+        "content": None,
+        "option": self.final_response,
+        "component": None,
+        "full_option": self.full_option,
+      }
+    else:
+      return {"content": "", "option": None, "component": None}
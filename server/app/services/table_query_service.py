@@ -0,0 +1,207 @@
+import logging
+import math
+from typing import List
+
+import numpy as np
+from fastapi import Depends, HTTPException
+
+from app.models.table_query_model import (
+  TableFilter,
+  TableQuery,
+  TableRowsRequest,
+  TableRowsResponse,
+  TableSort,
+)
+from app.services.data_source_service import (
+  DATASET_QUERY_TABLE_NAME,
+  DataSourceService,
+  get_data_source_service,
+)
+from app.services.tabular_service import ColumnarTable, null_mask
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 25
+
+
+def to_python(values: np.ndarray) -> list:
+  """Convert a column slice to JSON-safe Python values (NaN/NaT become None)."""
+  nulls = null_mask(values)
+
+  if np.issubdtype(values.dtype, np.datetime64):
+    converted = np.datetime_as_string(values).tolist()
+  elif np.issubdtype(values.dtype, np.floating):
+    converted = [int(value) if value.is_integer() else value for value in values.tolist()]
+  else:
+    converted = values.tolist()
+
+  if nulls.any():
+    converted = [None if is_null else value for value, is_null in zip(converted, nulls)]
+  return converted
+
+
+class TableQueryService:
+  """Evaluates TableQuery descriptors (projection, filters, sort, paging) over columnar tables."""
+
+  def __init__(self, data_source: DataSourceService):
+    self.data_source = data_source
+
+  async def get_rows(self, req: TableRowsRequest) -> TableRowsResponse:
+    table = await self.data_source.get_table(req.query.session_id, req.query.table)
+    if table is None:
+      logger.error(f"Table {req.query.table} not found for session {req.query.session_id}.")
+      raise HTTPException(status_code=404, detail=f"Table {req.query.table} not found.")
+
+    try:
+      query = req.query.model_copy(
+        update={
+          "filters": req.query.filters + req.filters,
+          "sort": req.sort if req.sort is not None else req.query.sort,
+        }
+      )
+      return self.run(table, query, req.page, req.page_size)
+    except ValueError as e:
+      raise HTTPException(status_code=400, detail=f"Invalid table query: {e}")
+
+  def run(
+    self, table: ColumnarTable, query: TableQuery, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE
+  ) -> TableRowsResponse:
+    columns = query.columns or list(table.columns)
+    unknown = [column for column in columns if column not in table.columns]
+    if unknown:
+      raise ValueError(f"Unknown column(s): {unknown}")
+
+    mask = np.ones(table.row_count, dtype=bool)
+    for table_filter in query.filters:
+      mask &= self._filter_mask(table, table_filter)
+
+    indexes = np.flatnonzero(mask)
+    indexes = indexes[self._sort_order(table, query.sort, indexes)]
+
+    start = (page - 1) * page_size
+    page_indexes = indexes[start : start + page_size]
+
+    column_values = {column: to_python(table.columns[column][page_indexes]) for column in columns}
+    rows = [
+      {column: column_values[column][index] for column in columns}
+      for index in range(len(page_indexes))
+    ]
+
+    return TableRowsResponse(
+      columns=[{"key": column, "label": column} for column in columns],
+      rows=rows,
+      total_rows=int(indexes.size),
+      page=page,
+      page_size=page_size,
+    )
+
+  def build_component(
+    self,
+    component_id: str,
+    title: str,
+    table: ColumnarTable,
+    query: TableQuery,
+    page_size: int = DEFAULT_PAGE_SIZE,
+  ) -> dict:
+    """Table descriptor carrying the first page inline plus the query to fetch the rest."""
+    if table.name == DATASET_QUERY_TABLE_NAME:
+      # SQL agent results only live in the graph state, /tables/rows cannot serve more pages
+      # of them: their rows (already capped at SQL_ROW_CAP) are sent inline, without a query
+      result = self.run(table, query, page=1, page_size=max(1, table.row_count))
+      return {
+        "id": component_id,
+        "type": "table",
+        "props": {
+          "title": title,
+          "loading": False,
+          "columns": result.columns,
+          "rows": result.rows,
+        },
+      }
+
+    first_page = self.run(table, query, page=1, page_size=page_size)
+
+    return {
+      "id": component_id,
+      "type": "table",
+      "props": {
+        "title": title,
+        "loading": False,
+        "columns": first_page.columns,
+        "rows": first_page.rows,
+        "query": query.model_dump(),
+        "totalRows": first_page.total_rows,
+        "pageSize": page_size,
+        "pageCount": max(1, math.ceil(first_page.total_rows / page_size)),
+      },
+    }
+
+  def _filter_mask(self, table: ColumnarTable, table_filter: TableFilter) -> np.ndarray:
+    if table_filter.column not in table.columns:
+      raise ValueError(f"Unknown filter column: {table_filter.column}")
+
+    values = table.columns[table_filter.column]
+    operator = table_filter.op
+
+    if operator == "contains":
+      needle = str(table_filter.value).lower()
+      return np.char.find(np.char.lower(values.astype(str)), needle) >= 0
+
+    if operator == "in":
+      candidates = (
+        table_filter.value if isinstance(table_filter.value, list) else [table_filter.value]
+      )
+      return np.isin(values, [self._coerce(values, candidate) for candidate in candidates])
+
+    target = self._coerce(values, table_filter.value)
+    comparisons = {
+      "eq": np.equal,
+      "ne": np.not_equal,
+      "gt": np.greater,
+      "gte": np.greater_equal,
+      "lt": np.less,
+      "lte": np.less_equal,
+    }
+    return comparisons[operator](values, target)
+
+  def _coerce(self, values: np.ndarray, value):
+    try:
+      if np.issubdtype(values.dtype, np.datetime64):
+        return np.datetime64(str(value)).astype(values.dtype)
+      if values.dtype == np.bool_:
+        return str(value).lower() in ("true", "1", "yes")
+      if np.issubdtype(values.dtype, np.number):
+        return float(value)
+    except (TypeError, ValueError):
+      raise ValueError(f"Value {value!r} does not match column type {values.dtype}")
+    return str(value)
+
+  def _sort_order(
+    self, table: ColumnarTable, sort: List[TableSort], indexes: np.ndarray
+  ) -> np.ndarray:
+    if not sort:
+      return np.arange(indexes.size)
+
+    keys = []
+    # np.lexsort sorts by the last key first, so feed the sort spec in reverse
+    for table_sort in reversed(sort):
+      if table_sort.column not in table.columns:
+        raise ValueError(f"Unknown sort column: {table_sort.column}")
+
+      values = table.columns[table_sort.column][indexes]
+      if values.dtype.kind == "U":
+        # Rank strings so descending order can be expressed as a negated numeric key
+        _, values = np.unique(values, return_inverse=True)
+      elif np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype(np.int64)
+      values = values.astype(np.float64)
+
+      keys.append(-values if table_sort.direction == "desc" else values)
+
+    return np.lexsort(keys)
+
+
+def get_table_query_service(
+  data_source: DataSourceService = Depends(get_data_source_service),
+) -> TableQueryService:
+  return TableQueryService(data_source)
@@ -0,0 +1,463 @@
+import csv
+import io
+import logging
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CSV_CONTENT_TYPES = ["text/csv"]
+EXCEL_CONTENT_TYPES = ["application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"]
+
+_NULL_TOKENS = ["", "na", "n/a", "nan", "null", "none", "-"]
+_TRUE_TOKENS = ["true", "yes", "y"]
+_FALSE_TOKENS = ["false", "no", "n"]
+# Characters stripped before numeric coercion ("$1,200", "12%", "€ 300")
+_NUMERIC_NOISE = [",", "$", "€", "£", "%", " "]
+_MAX_SAMPLE_VALUES = 5
+
+MONTH_NAMES = [
+  "january",
+  "february",
+  "march",
+  "april",
+  "may",
+  "june",
+  "july",
+  "august",
+  "september",
+  "october",
+  "november",
+  "december",
+]
+AGGREGATIONS = ["sum", "mean", "min", "max", "count"]
+
+# Period labels: "May 2023", "2023-05", "Q1 2019", "2019 Q1", "2019"
+_MONTH_YEAR_LABEL = re.compile(r"^([a-z]+)\.?[\s\-/]+(\d{4})$")
+_YEAR_MONTH_LABEL = re.compile(r"^(\d{4})-(\d{1,2})$")
+_QUARTER_LABEL = re.compile(r"^q([1-4])[\s\-/]*(\d{4})$|^(\d{4})[\s\-/]*q([1-4])$")
+_YEAR_LABEL = re.compile(r"^(?:19|20)\d{2}$")
+
+
+@dataclass
+class ColumnarTable:
+  """Typed, column-oriented view of one tabular attachment (CSV file or Excel sheet)."""
+
+  name: str
+  columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+  @property
+  def row_count(self) -> int:
+    if not self.columns:
+      return 0
+    return len(next(iter(self.columns.values())))
+
+  def column_type(self, column: str) -> str:
+    return logical_type(self.columns[column])
+
+  def schema(self) -> dict:
+    return {
+      "name": self.name,
+      "row_count": self.row_count,
+      "columns": [
+        {"name": name, "type": logical_type(values), "stats": column_stats(values)}
+        for name, values in self.columns.items()
+      ],
+    }
+
+
+def logical_type(values: np.ndarray) -> str:
+  if values.dtype == np.bool_:
+    return "boolean"
+  if np.issubdtype(values.dtype, np.integer):
+    return "integer"
+  if np.issubdtype(values.dtype, np.floating):
+    return "float"
+  if np.issubdtype(values.dtype, np.datetime64):
+    return "datetime"
+  return "string"
+
+
+def null_mask(values: np.ndarray) -> np.ndarray:
+  if np.issubdtype(values.dtype, np.floating):
+    return np.isnan(values)
+  if np.issubdtype(values.dtype, np.datetime64):
+    return np.isnat(values)
+  if values.dtype.kind == "U":
+    return values == ""
+  return np.zeros(len(values), dtype=bool)
+
+
+def column_stats(values: np.ndarray) -> dict:
+  nulls = null_mask(values)
+  present = values[~nulls]
+  stats: Dict[str, Any] = {"null_count": int(nulls.sum())}
+  kind = logical_type(values)
+
+  if kind in ("integer", "float"):
+    if present.size:
+      stats.update(
+        {
+          "min": present.min().item(),
+          "max": present.max().item(),
+          "sum": present.sum().item(),
+          "mean": float(present.mean()),
+          "std": float(present.std()),
+        }
+      )
+  elif kind == "boolean":
+    stats["true_count"] = int(present.sum())
+  elif kind == "datetime":
+    if present.size:
+      stats["min"] = str(present.min())
+      stats["max"] = str(present.max())
+  else:
+    distinct = np.unique(present)
+    stats["distinct_count"] = int(distinct.size)
+    stats["sample_values"] = distinct[:_MAX_SAMPLE_VALUES].tolist()
+
+  return stats
+
+
+def infer_column(raw_values: List[str]) -> np.ndarray:
+  """Coerce raw cell strings into the narrowest fitting NumPy dtype.
+
+  Order of preference: boolean, integer, float, datetime, string. Missing cells become
+  NaN (float), NaT (datetime) or "" (string); integer columns with gaps widen to float.
+  """
+  values = np.char.strip(np.asarray(raw_values, dtype=str))
+  if values.size == 0:
+    return values
+
+  lowered = np.char.lower(values)
+  nulls = np.isin(lowered, _NULL_TOKENS)
+  present = values[~nulls]
+
+  if present.size == 0:
+    return np.full(values.shape, "", dtype=str)
+
+  present_lowered = lowered[~nulls]
+  if not nulls.any() and np.isin(present_lowered, _TRUE_TOKENS + _FALSE_TOKENS).all():
+    return np.isin(lowered, _TRUE_TOKENS)
+
+  numeric = _coerce_numeric(present)
+  if numeric is not None:
+    is_integral = np.all(np.char.find(present, ".") < 0) and np.all(np.isfinite(numeric))
+    if is_integral and not nulls.any() and np.all(np.abs(numeric) < 2**53):
+      return numeric.astype(np.int64)
+
+    column = np.full(values.shape, np.nan, dtype=np.float64)
+    column[~nulls] = numeric
+    return column
+
+  timestamps = _coerce_datetime(present)
+  if timestamps is not None:
+    column = np.full(values.shape, np.datetime64("NaT"), dtype=timestamps.dtype)
+    column[~nulls] = timestamps
+    return column
+
+  return np.where(nulls, "", values)
+
+
+def _coerce_numeric(values: np.ndarray) -> Optional[np.ndarray]:
+  cleaned = values
+  for noise in _NUMERIC_NOISE:
+    cleaned = np.char.replace(cleaned, noise, "")
+
+  try:
+    return cleaned.astype(np.float64)
+  except ValueError:
+    return None
+
+
+def _coerce_datetime(values: np.ndarray) -> Optional[np.ndarray]:
+  try:
+    timestamps = np.char.replace(values, " ", "T").astype("datetime64[s]")
+  except ValueError:
+    return None
+
+  # Keep day resolution when no value carries a time component
+  days = timestamps.astype("datetime64[D]")
+  if np.all(days == timestamps):
+    return days
+  return timestamps
+
+
+def _unique_headers(header: List[Any]) -> List[str]:
+  names: List[str] = []
+  for index, raw_name in enumerate(header):
+    name = str(raw_name).strip() if raw_name is not None else ""
+    name = name or f"column_{index + 1}"
+
+    candidate, suffix = name, 2
+    while candidate in names:
+      candidate = f"{name}_{suffix}"
+      suffix += 1
+    names.append(candidate)
+
+  return names
+
+
+def _cell_to_text(value: Any) -> str:
+  if value is None:
+    return ""
+  if isinstance(value, bool):
+    return "true" if value else "false"
+  if isinstance(value, (datetime, date)):
+    return value.isoformat()
+  return str(value)
+
+
+def build_table(name: str, rows: List[List[Any]]) -> Optional[ColumnarTable]:
+  """Build a table from raw rows where the first non-empty row holds the headers."""
+  rows = [row for row in rows if any(_cell_to_text(cell).strip() for cell in row)]
+  if len(rows) < 2:
+    return None
+
+  headers = _unique_headers(rows[0])
+  width = len(headers)
+
+  columns: Dict[str, np.ndarray] = {}
+  for index, header in enumerate(headers):
+    raw = [_cell_to_text(row[index]) if index < len(row) else "" for row in rows[1:]]
+    columns[header] = infer_column(raw)
+
+  logger.debug(f"Parsed table {name} with {len(rows) - 1} rows and {width} columns.")
+  return ColumnarTable(name=name, columns=columns)
+
+
+class TabularParser:
+  """Parses CSV and Excel attachments into typed columnar tables."""
+
+  def supports(self, content_type: Optional[str]) -> bool:
+    return content_type in CSV_CONTENT_TYPES + EXCEL_CONTENT_TYPES
+
+  def parse(self, content: bytes, content_type: str, filename: str) -> List[ColumnarTable]:
+    if content_type in CSV_CONTENT_TYPES:
+      return self._parse_csv(content, filename)
+    if content_type in EXCEL_CONTENT_TYPES:
+      return self._parse_excel(content, filename)
+    return []
+
+  def _parse_csv(self, content: bytes, filename: str) -> List[ColumnarTable]:
+    text = content.decode("utf-8-sig", errors="replace")
+
+    try:
+      dialect = csv.Sniffer().sniff(text[:4096], delimiters=",;\t|")
+    except csv.Error:
+      dialect = csv.excel
+
+    rows = list(csv.reader(io.StringIO(text), dialect))
+    table = build_table(filename, rows)
+    return [table] if table else []
+
+  def _parse_excel(self, content: bytes, filename: str) -> List[ColumnarTable]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    tables = []
+
+    try:
+      for sheet in workbook.worksheets:
+        rows = [list(row) for row in sheet.iter_rows(values_only=True)]
+        table = build_table(f"{filename}:{sheet.title}", rows)
+        if table:
+          tables.append(table)
+    finally:
+      workbook.close()
+
+    return tables
+
+
+def _singular(word: str) -> str:
+  if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+    return word[:-1]
+  return word
+
+
+def tokenize(text: str) -> List[str]:
+  """Lowercase, singularized word tokens used to match requests against column names."""
+  return [_singular(word) for word in re.findall(r"[a-z0-9]+", text.lower()) if len(word) > 1]
+
+
+def name_words(text: str) -> List[str]:
+  """Singularized words of a column name or request with one-letter words kept ("Product A")
+  and parenthesized units ("($)") dropped, for matching whole column names."""
+  text = re.sub(r"\([^)]*\)", " ", text.lower())
+  return [_singular(word) for word in re.findall(r"[a-z0-9]+", text)]
+
+
+def mentioned_names(text: str, names: Iterable[str]) -> List[str]:
+  """Names whose full word sequence appears in `text`, in `names` order.
+
+  A name only mentioned as part of a longer mentioned name ("revenue" in "total revenue") is
+  dropped, so "Product C" matches that column alone and never "Product A" or "Product B".
+  """
+  phrase = f" {' '.join(name_words(text))} "
+  phrases = {name: f" {' '.join(name_words(name))} " for name in names}
+  mentioned = [name for name, words in phrases.items() if words.strip() and words in phrase]
+  return [
+    name
+    for name in mentioned
+    if not any(
+      other != name and phrases[name] in phrases[other] and phrases[name] != phrases[other]
+      for other in mentioned
+    )
+  ]
+
+
+def aggregate_by_code(codes: np.ndarray, values: np.ndarray, how: str, size: int) -> np.ndarray:
+  """Vectorized grouped aggregation, codes are dense group indexes in [0, size)."""
+  if how not in AGGREGATIONS:
+    raise ValueError(f"Unsupported aggregation: {how}")
+
+  valid = ~null_mask(values)
+  codes = codes[valid]
+  counts = np.bincount(codes, minlength=size).astype(np.float64)
+
+  if how == "count":
+    return counts
+
+  numbers = values[valid].astype(np.float64)
+
+  if how in ("sum", "mean"):
+    result = np.bincount(codes, weights=numbers, minlength=size)
+    if how == "mean":
+      with np.errstate(invalid="ignore", divide="ignore"):
+        result = result / counts
+  else:
+    result = np.full(size, np.inf if how == "min" else -np.inf)
+    ufunc = np.minimum if how == "min" else np.maximum
+    ufunc.at(result, codes, numbers)
+
+  result[counts == 0] = np.nan
+  return result
+
+
+def group_aggregate(group_columns: List[np.ndarray], values: np.ndarray, how: str):
+  """Aggregate values over the cartesian product of the distinct group keys.
+
+  Returns (uniques, result) where uniques holds the sorted distinct keys per group column and
+  result has shape (len(uniques[0]), len(uniques[1]), ...), NaN marking empty groups.
+  """
+  uniques, codes = [], []
+  for column in group_columns:
+    distinct, inverse = np.unique(column, return_inverse=True)
+    uniques.append(distinct)
+    codes.append(inverse.reshape(-1))
+
+  shape = tuple(len(distinct) for distinct in uniques)
+  if codes:
+    flat_codes = np.ravel_multi_index(codes, shape)
+  else:
+    flat_codes = np.zeros(len(values), dtype=np.intp)
+
+  size = int(np.prod(shape)) if shape else 1
+  result = aggregate_by_code(flat_codes, values, how, size)
+  return uniques, result.reshape(shape)
+
+
+def _month_index(name: str) -> int:
+  for index, month in enumerate(MONTH_NAMES):
+    if name == month or name == month[:3]:
+      return index
+  return -1
+
+
+def _calendar_key(label: str) -> Optional[tuple]:
+  """(kind, position) of a period label, None for anything that is not a period."""
+  label = label.strip().lower()
+
+  month = _month_index(label)
+  if month >= 0:
+    return "month", month
+
+  match = _MONTH_YEAR_LABEL.match(label)
+  if match and _month_index(match.group(1)) >= 0:
+    return "month_year", int(match.group(2)) * 12 + _month_index(match.group(1))
+
+  match = _YEAR_MONTH_LABEL.match(label)
+  if match and 1 <= int(match.group(2)) <= 12:
+    return "month_year", int(match.group(1)) * 12 + int(match.group(2)) - 1
+
+  match = _QUARTER_LABEL.match(label)
+  if match:
+    quarter, year = (match.group(1), match.group(2)) if match.group(1) else match.group(4, 3)
+    return "quarter", int(year) * 4 + int(quarter) - 1
+
+  if _YEAR_LABEL.match(label):
+    return "year", int(label)
+
+  return None
+
+
+def calendar_keys(categories: np.ndarray) -> Optional[np.ndarray]:
+  """Sort keys of labels that are all periods of one kind (months, "May 2023", "Q1 2019",
+  years), None when any label is not."""
+  if categories.dtype.kind != "U" or not categories.size:
+    return None
+
+  keys = []
+  kinds = set()
+  for label in categories.tolist():
+    key = _calendar_key(label)
+    if key is None:
+      return None
+    kinds.add(key[0])
+    keys.append(key[1])
+
+  return np.asarray(keys) if len(kinds) == 1 else None
+
+
+def category_order(categories: np.ndarray) -> np.ndarray:
+  """Permutation that puts period labels in calendar order, identity for anything else."""
+  keys = calendar_keys(categories)
+  if keys is None:
+    return np.arange(categories.size)
+  return np.argsort(keys, kind="stable")
+
+
+def format_labels(values: np.ndarray) -> List[str]:
+  if np.issubdtype(values.dtype, np.datetime64):
+    days = values.astype("datetime64[D]")
+    months = values.astype("datetime64[M]")
+    if np.all(months.astype("datetime64[D]") == values):
+      return [str(month) for month in months]
+    if np.all(days == values):
+      return [str(day) for day in days]
+    return [str(value) for value in values]
+  if np.issubdtype(values.dtype, np.floating):
+    return [str(int(value)) if float(value).is_integer() else str(value) for value in values]
+  return [str(value) for value in values.tolist()]
+
+
+def serialize_tables(tables: List[ColumnarTable]) -> tuple[bytes, dict]:
+  """Pack tables into a compressed .npz payload plus the JSON schema describing it."""
+  arrays = {}
+  for table_index, table in enumerate(tables):
+    for column_index, values in enumerate(table.columns.values()):
+      arrays[f"t{table_index}_c{column_index}"] = values
+
+  buffer = io.BytesIO()
+  np.savez_compressed(buffer, **arrays)
+
+  schema = {"tables": [table.schema() for table in tables]}
+  return buffer.getvalue(), schema
+
+
+def deserialize_tables(payload: bytes, schema: dict) -> List[ColumnarTable]:
+  tables = []
+
+  with np.load(io.BytesIO(payload), allow_pickle=False) as archive:
+    for table_index, table_schema in enumerate(schema.get("tables", [])):
+      columns = {
+        column["name"]: archive[f"t{table_index}_c{column_index}"]
+        for column_index, column in enumerate(table_schema["columns"])
+      }
+      tables.append(ColumnarTable(name=table_schema["name"], columns=columns))
+
+  return tables
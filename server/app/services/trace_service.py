@@ -0,0 +1,100 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Tuple
+
+from langchain_core.load import dumpd, load
+
+logger = logging.getLogger(__name__)
+
+# Event kinds whose `data.input` is the whole graph state or prompt: dropped to keep traces small
+_DROPPED_INPUTS = {"on_chain_start", "on_chain_end", "on_chat_model_start", "on_chat_model_end"}
+
+
+def compact_event(event: dict, offset: float) -> dict:
+  """The parts of an astream_events event the SSE translation reads, JSON-serializable."""
+  data = dict(event.get("data") or {})
+  if event["event"] in _DROPPED_INPUTS:
+    data.pop("input", None)
+
+  return {
+    "t": round(offset, 4),
+    "event": event["event"],
+    "name": event["name"],
+    "run_id": event.get("run_id"),
+    "metadata": {"langgraph_node": (event.get("metadata") or {}).get("langgraph_node")},
+    "data": dumpd(data),
+  }
+
+
+def _revive(value):
+  """Inverse of dumpd for trace data: messages come back as objects, other values as-is."""
+  if isinstance(value, list):
+    return [_revive(item) for item in value]
+  if not isinstance(value, dict):
+    return value
+  if value.get("lc") == 1 and value.get("type") == "constructor":
+    return load(value, allowed_objects="messages")
+  if value.get("lc") == 1 and value.get("type") == "not_implemented":
+    return value.get("repr")
+  return {key: _revive(item) for key, item in value.items()}
+
+
+class TraceRecorder:
+  """Collects the raw event stream of one graph run and writes it as gzip JSON lines.
+
+  The first line is a header (session, input, start time), every other line one event with
+  its offset in seconds from the start of the run.
+  """
+
+  def __init__(self, directory: str, session_id: str, user_input: str):
+    started = datetime.now(timezone.utc)
+    self.path = os.path.join(
+      directory, f"{started.strftime('%Y%m%dT%H%M%S%f')}-session-{session_id}.jsonl.gz"
+    )
+    self.header = {"session_id": session_id, "input": user_input, "started_at": started.isoformat()}
+    self.started_at = time.monotonic()
+    self.events: List[dict] = []
+
+  def record(self, event: dict) -> None:
+    try:
+      self.events.append(compact_event(event, time.monotonic() - self.started_at))
+    except Exception as e:
+      logger.warning(f"Couldn't record {event.get('event')} event of {event.get('name')}: {e}")
+
+  def write(self) -> str:
+    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+    with gzip.open(self.path, "wt", encoding="utf-8") as trace_file:
+      trace_file.write(json.dumps(self.header) + "\n")
+      for event in self.events:
+        trace_file.write(json.dumps(event, default=str) + "\n")
+    logger.info(f"Recorded {len(self.events)} events to {self.path}.")
+    return self.path
+
+
+def read_trace(path: str) -> Tuple[dict, List[Tuple[float, dict]]]:
+  """Header and (offset, event) pairs of a recorded trace, events in astream_events shape."""
+  with gzip.open(path, "rt", encoding="utf-8") as trace_file:
+    header = json.loads(trace_file.readline())
+    events = []
+    for line in trace_file:
+      event = json.loads(line)
+      offset = event.pop("t")
+      event["data"] = _revive(event["data"])
+      events.append((offset, event))
+  return header, events
+
+
+async def replay(events: List[Tuple[float, dict]], realtime: bool = True) -> AsyncIterator[dict]:
+  """Yield recorded events, at their original pace when `realtime`, otherwise back to back."""
+  started_at = time.monotonic()
+  for offset, event in events:
+    if realtime:
+      delay = offset - (time.monotonic() - started_at)
+      if delay > 0:
+        await asyncio.sleep(delay)
+    yield event
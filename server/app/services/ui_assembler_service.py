@@ -0,0 +1,96 @@
+import copy
+import logging
+from typing import List, Optional
+
+from app.models.ui_descriptor_model import UiEvent
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET = "assembled_dashboard_section"
+SYNTHETIC_SECTION_ID = "assembled_dashboard_section"
+SYNTHETIC_SECTION_TITLE = "Dashboard Overview"
+EMPTY_SECTION_ID = "empty_dashboard_section"
+
+
+def _is_component(component) -> bool:
+  return isinstance(component, dict) and bool(component.get("id")) and bool(component.get("type"))
+
+
+def _section(section_id: str, title: str = "", children: Optional[list] = None) -> dict:
+  return {
+    "id": section_id,
+    "type": "section",
+    "props": {"title": title, "subtitle": "", "loading": False, "children": children or []},
+  }
+
+
+class UiAssembler:
+  """Nests finished section/card/table descriptors into one ui_event, without an LLM.
+
+  Rules (same as the UI builder prompt):
+  - an existing section is the root and receives the cards and tables as children, replacing
+    any {"id", "type"} placeholders it already lists;
+  - without a section a single component is returned as-is, several are wrapped in a
+    synthetic `assembled_dashboard_section`;
+  - with no components at all an empty section is returned.
+  Component ids and props are never changed and duplicates (by id) are dropped.
+  """
+
+  def assemble(
+    self,
+    section: Optional[dict],
+    cards: List[dict],
+    tables: List[dict],
+    target: Optional[str] = None,
+  ) -> dict:
+    components = []
+    seen_ids = set()
+    for component in [*cards, *tables]:
+      if _is_component(component) and component["id"] not in seen_ids:
+        seen_ids.add(component["id"])
+        components.append(copy.deepcopy(component))
+
+    if _is_component(section):
+      root = self._fill_section(copy.deepcopy(section), components)
+    elif len(components) == 1:
+      root = components[0]
+    elif components:
+      root = _section(SYNTHETIC_SECTION_ID, SYNTHETIC_SECTION_TITLE, components)
+    else:
+      root = _section(EMPTY_SECTION_ID)
+
+    ui_event = {"type": "ui_event", "target": target or DEFAULT_TARGET, "component": root}
+
+    # Raises pydantic.ValidationError on malformed descriptors
+    UiEvent.model_validate(ui_event)
+    return ui_event
+
+  def _fill_section(self, section: dict, components: List[dict]) -> dict:
+    props = section.setdefault("props", {})
+    props.setdefault("title", "")
+    props.setdefault("subtitle", "")
+    props["loading"] = bool(props.get("loading", False))
+
+    by_id = {component["id"]: component for component in components}
+    placed = set()
+
+    def resolve(children: list) -> list:
+      resolved = []
+      for child in children or []:
+        if not _is_component(child):
+          continue
+        if child["type"] == "section":
+          child.setdefault("props", {})["children"] = resolve(child["props"].get("children"))
+          resolved.append(child)
+        elif child["id"] in by_id and child["id"] not in placed:
+          # Placeholder (or stale copy) of a finished component: use the finished descriptor
+          placed.add(child["id"])
+          resolved.append(by_id[child["id"]])
+        elif child["id"] not in by_id and child.get("props"):
+          resolved.append(child)
+      return resolved
+
+    children = resolve(props.get("children"))
+    children.extend(component for component in components if component["id"] not in placed)
+    props["children"] = children
+    return section